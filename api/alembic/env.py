@@ -24,6 +24,9 @@ entities_directory = os.path.join(os.path.dirname(__file__), '../entities')
 for (_, name, _) in pkgutil.iter_modules([entities_directory]):
     __import__('entities.' + name)
 
+# El índice parcial de vehículos elegibles se define junto a las reglas que fija su predicado.
+import services.eligibility_rules  # noqa: E402,F401
+
 # Alembic configuration object is obtained from the Alembic context
 config = context.config
 
@@ -0,0 +1,41 @@
+"""add idempotency keys created_at index
+
+Revision ID: 3a9d5e2b7c14
+Revises: e91b4d6a0c53
+Create Date: 2026-10-19 17:02:18.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a9d5e2b7c14'
+down_revision: Union[str, None] = 'e91b4d6a0c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # La purga periódica borra por `created_at`; sin índice recorrería toda la tabla.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_idempotency_keys_created_at',
+            'idempotency_keys',
+            ['created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_idempotency_keys_created_at',
+            table_name='idempotency_keys',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
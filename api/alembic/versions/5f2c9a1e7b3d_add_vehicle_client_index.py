@@ -0,0 +1,43 @@
+"""add vehicle client index
+
+Revision ID: 5f2c9a1e7b3d
+Revises: db388addbe7c
+Create Date: 2026-10-19 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c9a1e7b3d'
+down_revision: Union[str, None] = 'db388addbe7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    # El índice (client_id, created_at) cubre la clave foránea: lo usan la carga de vehículos
+    # de cada cliente (selectinload), get_vehicles_for_client y el borrado en cascada.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_vehicles_client_id_created_at',
+            'vehicles',
+            ['client_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_vehicles_client_id_created_at',
+            table_name='vehicles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,67 @@
+"""normalize license plates
+
+Revision ID: 8c41d7e2a9f0
+Revises: 5f2c9a1e7b3d
+Create Date: 2026-10-19 11:03:47.518264
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d7e2a9f0'
+down_revision: Union[str, None] = '5f2c9a1e7b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# Cada vehículo con su patente normalizada y su orden entre los que normalizan igual: primero el
+# que ya está normalizado, si existe, y si no el más antiguo.
+RANKED_PLATES = """
+    WITH normalized AS (
+        SELECT id, license_plate, created_at,
+               upper(regexp_replace(license_plate, '[[:space:]-]', '', 'g')) AS plate
+        FROM vehicles
+    )
+    SELECT id, license_plate, plate,
+           row_number() OVER (
+               PARTITION BY plate ORDER BY (license_plate = plate) DESC, created_at, id
+           ) AS plate_rank
+    FROM normalized
+"""
+
+
+def upgrade() -> None:
+    # Las patentes se buscan ya normalizadas (mayúsculas, sin espacios ni guiones), así que las
+    # existentes se llevan al mismo formato. Si varias normalizan a la misma patente solo se
+    # normaliza la primera; las demás quedan como están y se informan para revisarlas a mano.
+    skipped = op.get_bind().execute(sa.text(
+        f"SELECT id, license_plate, plate FROM ({RANKED_PLATES}) AS ranked "
+        "WHERE plate_rank > 1 AND license_plate <> plate ORDER BY plate"
+    )).all()
+    for row in skipped:
+        logger.warning(
+            f"Patente '{row.license_plate}' (vehículo {row.id}) sin normalizar: '{row.plate}' ya corresponde a otro vehículo."
+        )
+
+    op.execute(
+        f"""
+        UPDATE vehicles AS v
+        SET license_plate = ranked.plate
+        FROM ({RANKED_PLATES}) AS ranked
+        WHERE v.id = ranked.id
+          AND ranked.plate_rank = 1
+          AND ranked.license_plate <> ranked.plate
+        """
+    )
+
+
+def downgrade() -> None:
+    # El formato original de las patentes no se conserva.
+    pass
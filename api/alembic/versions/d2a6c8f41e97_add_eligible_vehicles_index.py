@@ -0,0 +1,45 @@
+"""add eligible vehicles index
+
+Revision ID: d2a6c8f41e97
+Revises: b7e3f05c2d18
+Create Date: 2026-10-19 14:02:18.230671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6c8f41e97'
+down_revision: Union[str, None] = 'b7e3f05c2d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índice parcial sobre `id` con los umbrales de vehículo de `services/eligibility_rules.py`
+    # (MIN_VEHICLE_YEAR, MAX_VEHICLE_MILEAGE): el listado de elegibles pagina por `vehicles.id`,
+    # así que lo recorre en orden y solo visita vehículos que ya cumplen las reglas.
+    # Los valores quedan fijos en esta migración: si cambian las reglas, una nueva lo recrea.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_vehicles_eligible_id',
+            'vehicles',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text('year >= 2015 AND mileage < 100000'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_vehicles_eligible_id',
+            table_name='vehicles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
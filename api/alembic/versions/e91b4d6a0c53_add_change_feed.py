@@ -0,0 +1,49 @@
+"""add change feed
+
+Revision ID: e91b4d6a0c53
+Revises: d2a6c8f41e97
+Create Date: 2026-10-19 15:11:42.906114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b4d6a0c53'
+down_revision: Union[str, None] = 'd2a6c8f41e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tombstones',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('entity_type', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_updated_at_id', 'tombstones', ['updated_at', 'id'], unique=False)
+
+    # Índices del feed de cambios sobre tablas ya pobladas: sin bloquear escrituras.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_clients_updated_at_id', 'clients', ['updated_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_vehicles_updated_at_id', 'vehicles', ['updated_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_vehicles_updated_at_id', table_name='vehicles', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_clients_updated_at_id', table_name='clients', postgresql_concurrently=True, if_exists=True)
+    op.drop_index('ix_tombstones_updated_at_id', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -0,0 +1,249 @@
+"""
+Verifica que cada método de servicio y cada endpoint se mantenga dentro de su presupuesto de
+sentencias SQL, para que una carga perezosa o un viaje de ida y vuelta extra no pase inadvertido.
+
+Todo se ejecuta dentro de una transacción que se revierte al final. Contra Postgres la base debe
+estar migrada; con SQLite se crean las tablas en la misma transacción y se omiten los casos que
+dependen de funciones propias de Postgres. Termina con código 1 si algún caso excede su presupuesto.
+
+Uso (desde /api):
+    python -m checks.query_budgets
+    python -m checks.query_budgets --url sqlite+aiosqlite:///:memory:
+"""
+import argparse
+import asyncio
+import datetime
+import sys
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from checks.query_counter import count_queries
+from database import DATABASE_URL, get_db
+from entities.base_entity import BaseEntity
+from entities.client_entity import Client, IdentificationType
+from entities.tombstone_entity import Tombstone
+from entities.vehicle_entity import Vehicle
+from requests.client_request import ClientPatchRequest, ClientRequest
+from requests.intake_request import IntakeRequest
+from requests.vehicle_request import VehicleDataRequest, VehiclePatchRequest, VehicleRequest
+from services.change_service import ChangeService
+from services.client_service import ClientService
+from services.eligibility_service import EligibilityService
+from services.intake_service import IntakeService
+from services.vehicle_service import VehicleService
+from services.write_batcher import write_batcher
+
+# Sentencias máximas por método de servicio.
+SERVICE_BUDGETS: Dict[str, int] = {
+    "ClientService.create_client": 2,
+    "ClientService.upsert_client": 2,
+    "ClientService.get_client_by_id": 2,
+    "ClientService.get_client_by_id (sin vehículos)": 1,
+    "ClientService.get_client_by_documento": 2,
+    "ClientService.get_all_clients": 2,
+    "ClientService.update_client": 2,
+    "ClientService.patch_client": 2,
+    "VehicleService.create_vehicle": 2,
+    "VehicleService.upsert_vehicle": 1,
+    "VehicleService.get_vehicle_by_id": 1,
+    "VehicleService.get_vehicle_by_license_plate": 1,
+    "VehicleService.get_vehicles_by_license_plates": 1,
+    "VehicleService.get_vehicles_for_client": 1,
+    "VehicleService.patch_vehicle": 1,
+    "EligibilityService.check_eligibility": 2,
+    "EligibilityService.get_eligible_pairs": 1,
+    "IntakeService.intake": 2,
+    "ChangeService.get_changes": 4,
+    # Al final: borra el cliente sembrado.
+    "ClientService.delete_client": 5,
+}
+
+# Sentencias máximas por endpoint (método y ruta).
+ENDPOINT_BUDGETS: Dict[Tuple[str, str], int] = {
+    ("GET", "/api/clients/{client_id}"): 2,
+    ("GET", "/api/clients/by-documento/{documento}"): 2,
+    # Revalidación con `If-None-Match`: solo la consulta de la versión.
+    ("GET", "/api/clients/{client_id} (304)"): 1,
+    ("GET", "/api/vehicles/{vehicle_id} (304)"): 1,
+    ("PUT", "/api/clients/{client_id}"): 2,
+    ("PATCH", "/api/clients/{client_id}"): 2,
+    ("GET", "/api/vehicles/{vehicle_id}"): 1,
+    ("GET", "/api/vehicles/by-plate/{license_plate}"): 1,
+    ("GET", "/api/vehicles/client/{client_id}"): 1,
+    ("POST", "/api/eligibility/check"): 2,
+    ("POST", "/api/intake"): 2,
+}
+
+# Casos que usan SQL propio de Postgres (make_interval, pg_stat_activity).
+POSTGRES_ONLY = {"EligibilityService.get_eligible_pairs", "ChangeService.get_changes"}
+
+Case = Callable[[], Awaitable[Any]]
+
+
+def client_request(documento: str) -> ClientRequest:
+    return ClientRequest(
+        name="Presupuesto",
+        last_name="Consultas",
+        birth_date=datetime.date(1990, 5, 15),
+        documento=documento,
+        documento_type=IdentificationType.DNI,
+        email=f"budget{documento}@example.com",
+        phone_number="1100000000",
+    )
+
+
+async def seed(session: AsyncSession, documento: str, plates: Tuple[str, str]) -> Tuple[Client, Vehicle]:
+    """Un cliente con dos vehículos, creados sin pasar por los servicios."""
+    client = Client(**client_request(documento).model_dump())
+    session.add(client)
+    await session.flush()
+    vehicles = [
+        Vehicle(license_plate=plate, brand="Toyota", model="Corolla", year=2019, mileage=45000, client_id=client.id)
+        for plate in plates
+    ]
+    session.add_all(vehicles)
+    await session.commit()
+    return client, vehicles[0]
+
+
+def service_cases(session: AsyncSession, client: Client, vehicle: Vehicle) -> Dict[str, Case]:
+    client_service = ClientService(session)
+    vehicle_service = VehicleService(session)
+    vehicle_data = VehicleDataRequest(license_plate="QB003AA", brand="Fiat", model="Cronos", year=2021, mileage=1000)
+    return {
+        "ClientService.create_client": lambda: client_service.create_client(client_request("99000002")),
+        "ClientService.upsert_client": lambda: client_service.upsert_client(client_request("99000001")),
+        "ClientService.get_client_by_id": lambda: client_service.get_client_by_id(client.id),
+        "ClientService.get_client_by_id (sin vehículos)": lambda: client_service.get_client_by_id(
+            client.id, fields=["name"], include_vehicles=False
+        ),
+        "ClientService.get_client_by_documento": lambda: client_service.get_client_by_documento(client.documento),
+        "ClientService.get_all_clients": lambda: client_service.get_all_clients(),
+        "ClientService.update_client": lambda: client_service.update_client(client.id, client_request("99000001")),
+        "ClientService.patch_client": lambda: client_service.patch_client(
+            client.id, ClientPatchRequest(phone_number="1122223333")
+        ),
+        "VehicleService.create_vehicle": lambda: vehicle_service.create_vehicle(
+            VehicleRequest(**vehicle_data.model_dump(), client_id=client.id)
+        ),
+        "VehicleService.upsert_vehicle": lambda: vehicle_service.upsert_vehicle(
+            VehicleRequest(**vehicle_data.model_dump(), client_id=client.id)
+        ),
+        "VehicleService.get_vehicle_by_id": lambda: vehicle_service.get_vehicle_by_id(vehicle.id),
+        "VehicleService.get_vehicle_by_license_plate": lambda: vehicle_service.get_vehicle_by_license_plate(
+            vehicle.license_plate
+        ),
+        "VehicleService.get_vehicles_by_license_plates": lambda: vehicle_service.get_vehicles_by_license_plates(
+            ["QB001AA", "QB002AA"]
+        ),
+        "VehicleService.get_vehicles_for_client": lambda: vehicle_service.get_vehicles_for_client(client.id),
+        "VehicleService.patch_vehicle": lambda: vehicle_service.patch_vehicle(vehicle.id, VehiclePatchRequest(mileage=46000)),
+        "EligibilityService.check_eligibility": lambda: EligibilityService(session).check_eligibility(client.id, vehicle.id),
+        "EligibilityService.get_eligible_pairs": lambda: EligibilityService(session).get_eligible_pairs(limit=100),
+        "IntakeService.intake": lambda: IntakeService(session).intake(
+            # Patente propia: un upsert no puede pasar a otro cliente el vehículo ya creado con `vehicle_data`.
+            IntakeRequest(client=client_request("99000003"), vehicle=vehicle_data.model_copy(update={"license_plate": "QB007AA"}))
+        ),
+        "ChangeService.get_changes": lambda: ChangeService(session).get_changes(limit=100),
+        "ClientService.delete_client": lambda: client_service.delete_client(client.id),
+    }
+
+
+def endpoint_cases(http: httpx.AsyncClient, client: Client, vehicle: Vehicle) -> Dict[Tuple[str, str], Case]:
+    intake = IntakeRequest(
+        client=client_request("99000004"),
+        vehicle=VehicleDataRequest(license_plate="QB004AA", brand="Ford", model="Ka", year=2018, mileage=80000),
+    )
+    return {
+        ("GET", "/api/clients/{client_id}"): lambda: http.get(f"/api/clients/{client.id}"),
+        ("GET", "/api/clients/by-documento/{documento}"): lambda: http.get(f"/api/clients/by-documento/{client.documento}"),
+        ("GET", "/api/clients/{client_id} (304)"): lambda: http.get(f"/api/clients/{client.id}", headers={"If-None-Match": "*"}),
+        ("GET", "/api/vehicles/{vehicle_id} (304)"): lambda: http.get(f"/api/vehicles/{vehicle.id}", headers={"If-None-Match": "*"}),
+        ("PUT", "/api/clients/{client_id}"): lambda: http.put(
+            f"/api/clients/{client.id}", json=client_request(client.documento).model_dump(mode="json")
+        ),
+        ("PATCH", "/api/clients/{client_id}"): lambda: http.patch(f"/api/clients/{client.id}", json={"phone_number": "1144445555"}),
+        ("GET", "/api/vehicles/{vehicle_id}"): lambda: http.get(f"/api/vehicles/{vehicle.id}"),
+        ("GET", "/api/vehicles/by-plate/{license_plate}"): lambda: http.get(f"/api/vehicles/by-plate/{vehicle.license_plate}"),
+        ("GET", "/api/vehicles/client/{client_id}"): lambda: http.get(f"/api/vehicles/client/{client.id}"),
+        ("POST", "/api/eligibility/check"): lambda: http.post(
+            "/api/eligibility/check", json={"client_id": str(client.id), "vehicle_id": str(vehicle.id)}
+        ),
+        ("POST", "/api/intake"): lambda: http.post("/api/intake", json=intake.model_dump(mode="json")),
+    }
+
+
+async def run_case(engine, name: str, budget: int, case: Case) -> bool:
+    with count_queries(engine) as counter:
+        result = await case()
+    if isinstance(result, httpx.Response) and (result.status_code >= 400 or (name.endswith("(304)") and result.status_code != 304)):
+        print(f"[ERROR] {name}: respuesta {result.status_code} {result.text[:200]}")
+        return False
+    ok = counter.count <= budget
+    print(f"[{'ok' if ok else 'FALLA'}] {name}: {counter.count}/{budget} sentencias")
+    if not ok:
+        print(counter.report())
+    return ok
+
+
+async def check(url: str) -> bool:
+    from main import app
+
+    # Las escrituras agrupadas usan sus propias sesiones: se desactivan para medir cada llamada.
+    write_batcher.enabled = False
+    engine = create_async_engine(url)
+    is_postgres = engine.dialect.name == "postgresql"
+    failed = False
+    session: Optional[AsyncSession] = None
+
+    async def override_get_db():
+        yield session
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        try:
+            if not is_postgres:
+                await conn.run_sync(lambda sync_conn: BaseEntity.metadata.create_all(
+                    sync_conn, tables=[Client.__table__, Vehicle.__table__, Tombstone.__table__]
+                ))
+
+            def new_session() -> AsyncSession:
+                # Los commits de los servicios solo liberan savepoints; todo se revierte al final.
+                return AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+            client, vehicle = await seed(new_session(), "99000001", ("QB001AA", "QB002AA"))
+            for name, budget in SERVICE_BUDGETS.items():
+                if name in POSTGRES_ONLY and not is_postgres:
+                    print(f"[omitido] {name}: requiere Postgres")
+                    continue
+                # Sesión nueva por caso: el mapa de identidades de uno no debe ahorrarle consultas a otro.
+                cases = service_cases(new_session(), client, vehicle)
+                failed |= not await run_case(engine, name, budget, cases[name])
+
+            app.dependency_overrides[get_db] = override_get_db
+            client, vehicle = await seed(new_session(), "99000005", ("QB005AA", "QB006AA"))
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://budget") as http:
+                cases = endpoint_cases(http, client, vehicle)
+                for (method, path), budget in ENDPOINT_BUDGETS.items():
+                    session = new_session()
+                    failed |= not await run_case(engine, f"{method} {path}", budget, cases[(method, path)])
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await conn.rollback()
+    await engine.dispose()
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica los presupuestos de sentencias SQL de servicios y endpoints.")
+    parser.add_argument("--url", default=DATABASE_URL, help="URL de la base (por defecto, DATABASE_URL o la de las variables DB_POSTGRES_*).")
+    args = parser.parse_args()
+
+    ok = asyncio.run(check(args.url))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
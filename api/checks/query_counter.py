@@ -0,0 +1,82 @@
+"""
+Cuenta las sentencias SQL que emite un bloque de código, para detectar cargas perezosas (N+1)
+o viajes de ida y vuelta de más.
+
+    with count_queries(engine) as counter:
+        await service.get_client_by_id(client_id)
+    assert counter.count <= 2, counter.report()
+
+    with query_budget(engine, 2, "ClientService.get_client_by_id"):
+        await service.get_client_by_id(client_id)
+
+Con pytest instalado, el módulo también define el fixture `query_counter` sobre el engine de
+`database` (registrar con `pytest_plugins = ["checks.query_counter"]`).
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Solo se cuentan las sentencias que van a la base por los datos; no los SAVEPOINT ni RELEASE.
+COUNTED_VERBS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, name: str, budget: int, counter: "QueryCounter"):
+        self.name = name
+        self.budget = budget
+        self.counter = counter
+        super().__init__(f"{name} ejecutó {counter.count} sentencias (presupuesto: {budget}):\n{counter.report()}")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"  {i}. {' '.join(statement.split())[:160]}" for i, statement in enumerate(self.statements, 1))
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in COUNTED_VERBS:
+            self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Union[Engine, AsyncEngine]) -> Iterator[QueryCounter]:
+    """Registra las sentencias ejecutadas sobre `engine` mientras dura el bloque."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    counter = QueryCounter()
+    event.listen(sync_engine, "before_cursor_execute", counter._before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", counter._before_cursor_execute)
+
+
+@contextmanager
+def query_budget(engine: Union[Engine, AsyncEngine], budget: int, name: str = "El bloque") -> Iterator[QueryCounter]:
+    """Como `count_queries`, pero lanza `QueryBudgetExceeded` si el bloque supera `budget` sentencias."""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > budget:
+        raise QueryBudgetExceeded(name, budget, counter)
+
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+if pytest is not None:
+    @pytest.fixture
+    def query_counter() -> Iterator[QueryCounter]:
+        from database import async_engine
+
+        with count_queries(async_engine) as counter:
+            yield counter
@@ -0,0 +1,153 @@
+"""
+Verifica los planes de ejecución de las consultas de los servicios contra una base Postgres local.
+
+Ejecuta cada método de servicio dentro de una transacción que se revierte al final, captura las
+sentencias SQL que emite, obtiene su plan con `EXPLAIN (FORMAT JSON)` y falla (código de salida 1)
+si alguna recorre secuencialmente una tabla con más filas que el umbral.
+
+Uso (desde /api, con la base migrada):
+    python -m checks.query_plans --seed 20000 --threshold 1000
+"""
+import argparse
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from database import async_engine
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+from requests.client_request import ClientRequest
+from services.client_service import ClientService
+from services.eligibility_service import EligibilityService
+from services.vehicle_service import VehicleService
+
+# Consultas que recorren la tabla completa por diseño.
+FULL_SCAN_ALLOWED = {"ClientService.get_all_clients"}
+
+SEED_CLIENTS_SQL = """
+INSERT INTO clients (id, name, last_name, birth_date, documento, documento_type, email, phone_number, created_at, updated_at)
+SELECT gen_random_uuid(), 'Seed', 'Cliente ' || n, DATE '1960-01-01' + (n % 15000),
+       '9' || lpad(n::text, 7, '0'), 'DNI', 'seed' || n || '@example.com', '11' || lpad(n::text, 8, '0'), now(), now()
+FROM generate_series(1, :count) AS n
+ON CONFLICT DO NOTHING
+"""
+
+SEED_VEHICLES_SQL = """
+INSERT INTO vehicles (id, license_plate, brand, model, year, mileage, client_id, created_at, updated_at)
+SELECT gen_random_uuid(), 'SD' || lpad(row_number() OVER ()::text, 6, '0') || suffix, 'Toyota', 'Corolla',
+       2005 + (random() * 20)::int, (random() * 200000)::int, c.id, now(), now()
+FROM clients c CROSS JOIN (VALUES ('A'), ('B')) AS v(suffix)
+WHERE c.email LIKE 'seed%@example.com'
+ON CONFLICT DO NOTHING
+"""
+
+
+async def seed(conn: AsyncConnection, count: int):
+    """Carga `count` clientes sintéticos con dos vehículos cada uno y actualiza las estadísticas."""
+    await conn.execute(text(SEED_CLIENTS_SQL), {"count": count})
+    await conn.execute(text(SEED_VEHICLES_SQL))
+    await conn.commit()
+    await conn.execute(text("ANALYZE clients"))
+    await conn.execute(text("ANALYZE vehicles"))
+    await conn.commit()
+
+
+def build_cases(session: AsyncSession, client: Client, vehicle: Vehicle) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    """Métodos de servicio a verificar, con argumentos tomados de la base sembrada."""
+    client_service = ClientService(session)
+    vehicle_service = VehicleService(session)
+    eligibility_service = EligibilityService(session)
+    return {
+        "ClientService.get_client_by_id": lambda: client_service.get_client_by_id(client.id),
+        "ClientService.get_client_by_documento": lambda: client_service.get_client_by_documento(client.documento),
+        "ClientService.get_all_clients": lambda: client_service.get_all_clients(),
+        "ClientService.update_client": lambda: client_service.update_client(
+            client.id, ClientRequest.model_construct(phone_number="1100000000")
+        ),
+        "VehicleService.get_vehicle_by_id": lambda: vehicle_service.get_vehicle_by_id(vehicle.id),
+        "VehicleService.get_vehicles_for_client": lambda: vehicle_service.get_vehicles_for_client(client.id),
+        "EligibilityService.check_eligibility": lambda: eligibility_service.check_eligibility(client.id, vehicle.id),
+        "EligibilityService.get_eligible_pairs": lambda: eligibility_service.get_eligible_pairs(limit=100),
+        "ClientService.delete_client": lambda: client_service.delete_client(client.id),
+    }
+
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Tablas recorridas con Seq Scan en el plan y sus subplanes."""
+    found = [plan["Relation Name"]] if plan.get("Node Type") == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def check(threshold: int, seed_count: int) -> bool:
+    # Solo interesa el reporte de planes, no el eco de cada sentencia.
+    async_engine.echo = False
+    async with async_engine.connect() as conn:
+        if seed_count:
+            await seed(conn, seed_count)
+
+        row_counts = dict((await conn.execute(text(
+            "SELECT relname, reltuples::bigint FROM pg_class WHERE relname IN ('clients', 'vehicles')"
+        ))).all())
+
+        statements: List[Tuple[str, Any]] = []
+        capturing = False
+
+        def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+            if capturing and statement.lstrip().split(" ", 1)[0].upper() in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+                statements.append((statement, parameters))
+
+        await conn.begin()
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        failed = False
+        try:
+            # Los commits de los servicios solo liberan savepoints; todo se revierte al final.
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+            vehicle = (await session.execute(
+                Vehicle.__table__.select().where(Vehicle.license_plate.like("SD%")).limit(1)
+            )).first()
+            if vehicle is None:
+                print("No hay datos sembrados: ejecuta con --seed N.", file=sys.stderr)
+                return False
+            client = await session.get(Client, vehicle.client_id)
+
+            for name, case in build_cases(session, client, vehicle).items():
+                statements.clear()
+                capturing = True
+                await case()
+                capturing = False
+
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    plan = result.scalar()[0]["Plan"]
+                    offending = [
+                        table for table in seq_scans(plan)
+                        if row_counts.get(table, 0) > threshold and name not in FULL_SCAN_ALLOWED
+                    ]
+                    status = "FALLA" if offending else "ok"
+                    failed |= bool(offending)
+                    detail = f" (Seq Scan en {', '.join(offending)})" if offending else ""
+                    print(f"[{status}] {name}: {' '.join(statement.split())[:100]}{detail}")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+            await conn.rollback()
+
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica que las consultas de los servicios usen índices.")
+    parser.add_argument("--seed", type=int, default=0, help="Clientes sintéticos a cargar antes de verificar.")
+    parser.add_argument("--threshold", type=int, default=1000, help="Filas a partir de las cuales un Seq Scan falla.")
+    args = parser.parse_args()
+
+    ok = asyncio.run(check(args.threshold, args.seed))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
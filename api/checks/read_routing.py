@@ -0,0 +1,100 @@
+"""
+Verifica que una sesión lea sus propias escrituras con la réplica de lectura configurada: después
+de una escritura, las consultas de los métodos `@read_only` deben ir al primario.
+
+Cada caso escribe sin confirmar, lee con un método de solo lectura y revierte la sesión, así que
+no deja datos. Requiere DATABASE_REPLICA_URL; para probarlo localmente alcanza con apuntarla a la
+misma base que el primario. Termina con código 1 si alguna lectura posterior a una escritura va a
+la réplica.
+
+Uso (desde /api):
+    DATABASE_REPLICA_URL=$DATABASE_URL python -m checks.read_routing
+"""
+import asyncio
+import datetime
+import sys
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from checks.query_counter import count_queries
+from database import AsyncSessionLocal, async_engine, replica_engine
+from entities.base_entity import BaseEntity
+from entities.client_entity import Client, IdentificationType
+from entities.tombstone_entity import Tombstone
+from entities.vehicle_entity import Vehicle
+from requests.client_request import ClientRequest
+from services.client_service import ClientService
+from services.write_batcher import UPSERT_CLIENT, write_batcher
+
+DOCUMENTO = "99000101"
+
+Write = Callable[[AsyncSession], Awaitable[Any]]
+
+
+def client_request() -> ClientRequest:
+    return ClientRequest(
+        name="Ruteo",
+        last_name="Lecturas",
+        birth_date=datetime.date(1990, 5, 15),
+        documento=DOCUMENTO,
+        documento_type=IdentificationType.DNI,
+        email=f"routing{DOCUMENTO}@example.com",
+        phone_number="1100000101",
+    )
+
+
+def write_cases() -> Dict[str, Write]:
+    """Escrituras que no pasan por el flush de la sesión: sentencias INSERT ... RETURNING explícitas."""
+    return {
+        "ClientService.upsert_client": lambda session: ClientService(session).upsert_client(client_request(), commit=False),
+        "write_batcher UPSERT_CLIENT": lambda session: session.execute(
+            UPSERT_CLIENT.statement([client_request().model_dump()]), execution_options={"populate_existing": True}
+        ),
+    }
+
+
+async def run_case(name: str, write: Write) -> bool:
+    async with AsyncSessionLocal() as session:
+        try:
+            await write(session)
+            with count_queries(replica_engine) as replica, count_queries(async_engine) as primary:
+                client = await ClientService(session).get_client_by_documento(DOCUMENTO)
+        finally:
+            await session.rollback()
+    ok = client is not None and replica.count == 0 and primary.count > 0
+    print(f"[{'ok' if ok else 'FALLA'}] {name}: lectura posterior con {primary.count} sentencias al primario y {replica.count} a la réplica")
+    if replica.count:
+        print(replica.report())
+    return ok
+
+
+async def check() -> bool:
+    if replica_engine is None:
+        print("DATABASE_REPLICA_URL no está definida: no hay réplica a la que rutear.")
+        return False
+    # Las escrituras agrupadas usan sus propias sesiones: se desactivan para escribir en la del caso.
+    write_batcher.enabled = False
+    try:
+        if async_engine.dialect.name != "postgresql":
+            for engine in {async_engine, replica_engine}:
+                async with engine.begin() as conn:
+                    await conn.run_sync(lambda sync_conn: BaseEntity.metadata.create_all(
+                        sync_conn, tables=[Client.__table__, Vehicle.__table__, Tombstone.__table__]
+                    ))
+        failed = False
+        for name, write in write_cases().items():
+            failed |= not await run_case(name, write)
+        return not failed
+    finally:
+        await async_engine.dispose()
+        await replica_engine.dispose()
+
+
+def main():
+    ok = asyncio.run(check())
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
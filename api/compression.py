@@ -0,0 +1,180 @@
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Sin brotli se negocia solo gzip.
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+# Calidad baja de brotli: comprime mejor que gzip y sigue siendo barato en CPU para respuestas dinámicas.
+BROTLI_QUALITY = 4
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """`br;q=1.0, gzip;q=0.5, *;q=0` -> {"br": 1.0, "gzip": 0.5, "*": 0.0}."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def negotiate_encoding(header: str) -> Optional[str]:
+    """Codificación a usar según `Accept-Encoding`: `br` si está disponible y es aceptada, si no `gzip`."""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    accepted = [(codings.get(coding, wildcard), coding) for coding in candidates]
+    accepted = [(q, coding) for q, coding in accepted if q > 0]
+    if not accepted:
+        return None
+    # Ante igual preferencia gana el orden de `candidates`.
+    return max(accepted, key=lambda item: (item[0], -candidates.index(item[1])))[1]
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._gzip = None
+        else:
+            self._br = None
+            self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(data)
+        return self._gzip.compress(data)
+
+    def finish(self) -> bytes:
+        if self._br is not None:
+            return self._br.finish()
+        return self._gzip.flush()
+
+
+def _with_coding_suffix(etag: str, encoding: str) -> str:
+    """
+    Una ETag fuerte identifica bytes exactos: la representación comprimida lleva su propia etiqueta
+    (`"abc"` -> `"abc-br"`). `etag.etag_matches` acepta ambas al comparar `If-None-Match`.
+    """
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime con brotli o gzip, según `Accept-Encoding`, las respuestas de al
+    menos `min_bytes`. Las respuestas ya codificadas, sin cuerpo o por debajo del umbral pasan tal cual.
+    """
+    def __init__(self, app, min_bytes: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.min_bytes = min_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"accept-encoding"), "")
+        encoding = negotiate_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"if-none-match"), "")
+        start_message: Optional[dict] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = {name.lower() for name, _ in message.get("headers", [])}
+                passthrough = b"content-encoding" in headers or message["status"] in (204, 304)
+                if message["status"] == 304:
+                    message = {**message, "headers": self._not_modified_headers(message.get("headers", []), encoding, if_none_match)}
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.min_bytes:
+                    # Respuesta completa y chica: no vale la pena comprimir.
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                compressed = compressor.process(body) + (b"" if more_body else compressor.finish())
+                headers = self._compressed_headers(start_message.get("headers", []), encoding, None if more_body else len(compressed))
+                await send({**start_message, "headers": headers})
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+                return
+
+            compressed = compressor.process(body) + (b"" if more_body else compressor.finish())
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _not_modified_headers(
+        headers: List[Tuple[bytes, bytes]], encoding: str, if_none_match: str
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Un 304 repite la ETag de la representación que el cliente tiene: si la que envió en
+        `If-None-Match` es la comprimida (`"abc-br"`), se responde con esa y no con la original.
+        """
+        result = []
+        for name, value in headers:
+            if name.lower() == b"etag":
+                suffixed = _with_coding_suffix(value.decode("latin-1"), encoding)
+                if suffixed in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+                    value = suffixed.encode("latin-1")
+            result.append((name, value))
+        return result
+
+    @staticmethod
+    def _compressed_headers(
+        headers: List[Tuple[bytes, bytes]], encoding: str, content_length: Optional[int]
+    ) -> List[Tuple[bytes, bytes]]:
+        result = []
+        vary = None
+        for name, value in headers:
+            lower = name.lower()
+            if lower == b"content-length":
+                continue
+            if lower == b"etag":
+                value = _with_coding_suffix(value.decode("latin-1"), encoding).encode("latin-1")
+            if lower == b"vary":
+                vary = value
+                continue
+            result.append((name, value))
+        if vary is None:
+            result.append((b"vary", b"Accept-Encoding"))
+        elif b"accept-encoding" not in vary.lower():
+            result.append((b"vary", vary + b", Accept-Encoding"))
+        else:
+            result.append((b"vary", vary))
+        result.append((b"content-encoding", encoding.encode("latin-1")))
+        if content_length is not None:
+            result.append((b"content-length", str(content_length).encode("latin-1")))
+        return result
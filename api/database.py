@@ -1,8 +1,14 @@
+import asyncio
+import functools
+import logging
 import os
+import time
+from typing import Optional
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy import Select, create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 load_dotenv()
@@ -14,12 +20,138 @@ DB_USER = os.getenv("DB_POSTGRES_USER")
 DB_PASSWORD = os.getenv("DB_POSTGRES_PASSWORD")
 DB_NAME = os.getenv("DB_POSTGRES_DB")
 
-DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL reemplaza a las variables anteriores, por ejemplo para apuntar a una base local
+# (`sqlite+aiosqlite:///./vic_local.db`) en las pruebas de carga.
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+DB_ECHO = os.getenv("DB_ECHO", "true").lower() == "true"
+
+async_engine = create_async_engine(DATABASE_URL, echo=DB_ECHO)
+
+# --- Réplica de lectura (opcional) ---
+# Con DATABASE_REPLICA_URL, los métodos de servicio marcados con `@read_only` leen de la réplica.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+
+replica_engine: Optional[AsyncEngine] = (
+    create_async_engine(DATABASE_REPLICA_URL, echo=DB_ECHO, pool_pre_ping=True) if DATABASE_REPLICA_URL else None
+)
+
+# Segundos de retraso de la réplica. Si recibió todo lo que le mandó el primario, el retraso es 0
+# aunque la última transacción reproducida sea vieja (primario sin escrituras).
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+logger = logging.getLogger('vic-api')
+
+
+class ReplicaHealth:
+    """
+    Estado de la réplica según el último chequeo: se usa solo si responde y su retraso no supera
+    `REPLICA_MAX_LAG_SECONDS`. Si una conexión a la réplica falla se marca caída hasta el próximo chequeo.
+    """
+    def __init__(self, max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS):
+        self.max_lag_seconds = max_lag_seconds
+        self.up = replica_engine is not None
+        self.lag_seconds = 0.0
+        self.checked_at = 0.0
+        self.fallbacks = 0
+
+    @property
+    def available(self) -> bool:
+        return self.up and self.lag_seconds <= self.max_lag_seconds
+
+    def mark_down(self, error: Exception):
+        if self.up:
+            logger.warning(f"Réplica de lectura no disponible, se lee del primario: {error}")
+        self.up = False
+
+    async def check(self):
+        try:
+            async with replica_engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    self.lag_seconds = float(await conn.scalar(REPLICA_LAG_SQL))
+                else:
+                    await conn.execute(text("SELECT 1"))
+                    self.lag_seconds = 0.0
+            if not self.up:
+                logger.info("Réplica de lectura disponible de nuevo.")
+            self.up = True
+        except (DBAPIError, OSError) as e:
+            self.mark_down(e)
+        self.checked_at = time.monotonic()
+        if self.up and not self.available:
+            logger.warning(f"Réplica de lectura atrasada {self.lag_seconds:.1f}s: se lee del primario.")
+
+    async def monitor(self, interval: float = REPLICA_CHECK_INTERVAL_SECONDS):
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+
+replica_health = ReplicaHealth()
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía a la réplica los SELECT de los métodos `@read_only` y todo lo demás al primario.
+
+    Lee sus propias escrituras: desde que la sesión escribe (flush o INSERT/UPDATE/DELETE, también
+    envueltos en `select(...).from_statement(...)`), todas sus consultas van al primario, aunque
+    vengan de un método de solo lectura.
+    """
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_engine is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        # `is_dml` también es verdadero para un FromStatement que envuelve un INSERT/UPDATE ... RETURNING.
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+        elif (
+            self.info.get("read_only")
+            and not self.info.get("wrote")
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and replica_health.available
+        ):
+            return replica_engine.sync_engine
+        return async_engine.sync_engine
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        if replica_engine is not None and engine is replica_engine.sync_engine:
+            try:
+                return super()._connection_for_bind(engine, execution_options, **kw)
+            except (DBAPIError, OSError) as e:
+                # La réplica no acepta conexiones: esta consulta y las siguientes van al primario.
+                replica_health.mark_down(e)
+                replica_health.fallbacks += 1
+                return super()._connection_for_bind(async_engine.sync_engine, execution_options, **kw)
+        return super()._connection_for_bind(engine, execution_options, **kw)
+
+
+def read_only(method):
+    """
+    Marca un método de servicio asíncrono como de solo lectura: sus SELECT pueden ir a la réplica.
+    Requiere que el servicio guarde la sesión en `self.db_session`.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        info = self.db_session.info
+        info["read_only"] = info.get("read_only", 0) + 1
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info["read_only"] -= 1
+    return wrapper
 
-async_engine = create_async_engine(DATABASE_URL, echo=True)
 
 # Se usa async_sessionmaker para sesiones asíncronas
-AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
 
 # Dependency to get a DB session
 async def get_db():
@@ -29,7 +161,7 @@ async def get_db():
 # --- Alembic support ---
 def get_database_url() -> str:
     """Returns the synchronous database URL for Alembic."""
-    return DATABASE_URL.replace("+asyncpg", "")
+    return DATABASE_URL.replace("+asyncpg", "").replace("+aiosqlite", "")
 
 def get_engine():
     """Returns a synchronous engine for Alembic."""
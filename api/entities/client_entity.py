@@ -2,7 +2,7 @@ import uuid
 import enum
 from datetime import date
 from typing import List, TYPE_CHECKING
-from sqlalchemy import Date, String, Enum as SQLAlchemyEnum
+from sqlalchemy import Date, Index, String, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.types import UUID
 
@@ -18,6 +18,9 @@ class IdentificationType(enum.Enum):
 
 class Client(BaseEntity):
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("ix_clients_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String, nullable=True)
@@ -28,4 +31,6 @@ class Client(BaseEntity):
     email: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
     phone_number: Mapped[str] = mapped_column(String, nullable=True)
 
-    vehicles: Mapped[List["Vehicle"]] = relationship("Vehicle", back_populates="client", cascade="all, delete-orphan")
\ No newline at end of file
+    vehicles: Mapped[List["Vehicle"]] = relationship(
+        "Vehicle", back_populates="client", cascade="all, delete-orphan", order_by="Vehicle.created_at"
+    )
\ No newline at end of file
@@ -0,0 +1,20 @@
+import uuid
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import UUID
+
+from .base_entity import BaseEntity
+
+class Tombstone(BaseEntity):
+    """
+    Registro de un cliente o vehículo eliminado, para que el feed de cambios informe los borrados.
+    `updated_at` es el momento del borrado.
+    """
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_updated_at_id", "updated_at", "id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity_type: Mapped[str] = mapped_column(String, nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
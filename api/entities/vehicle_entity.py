@@ -1,6 +1,6 @@
 import uuid
 from typing import TYPE_CHECKING
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.types import UUID
 
@@ -11,6 +11,10 @@ if TYPE_CHECKING:
 
 class Vehicle(BaseEntity):
     __tablename__ = "vehicles"
+    __table_args__ = (
+        Index("ix_vehicles_client_id_created_at", "client_id", "created_at"),
+        Index("ix_vehicles_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     license_plate: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
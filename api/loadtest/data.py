@@ -0,0 +1,220 @@
+"""
+Generador reproducible de clientes y vehículos argentinos para las pruebas de carga.
+
+Con la misma semilla genera siempre los mismos datos:
+- DNI de 8 dígitos y CUIT/CUIL con su dígito verificador real.
+- Patentes Mercosur (AB123CD) para vehículos desde 2016 y del formato anterior (ABC123) para los más viejos.
+
+Los clientes sembrados usan correos `@loadtest.example`, lo que permite borrarlos sin tocar el resto.
+
+Uso (desde /api):
+    python -m loadtest.data --clients 5000
+    python -m loadtest.data --reset
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import string
+import uuid
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from entities.base_entity import BaseEntity
+from entities.client_entity import Client, IdentificationType
+from entities.tombstone_entity import Tombstone
+from entities.vehicle_entity import Vehicle
+
+EMAIL_DOMAIN = "loadtest.example"
+
+FIRST_NAMES = (
+    "Juan", "María", "Santiago", "Sofía", "Mateo", "Valentina", "Benjamín", "Martina", "Lucas", "Catalina",
+    "Joaquín", "Camila", "Tomás", "Lucía", "Facundo", "Florencia", "Agustín", "Micaela", "Nicolás", "Julieta",
+)
+LAST_NAMES = (
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez", "García", "Sánchez",
+    "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Acosta", "Benítez", "Medina",
+)
+VEHICLES = (
+    ("Toyota", "Corolla"), ("Toyota", "Hilux"), ("Volkswagen", "Gol"), ("Volkswagen", "Amarok"),
+    ("Ford", "Ranger"), ("Ford", "Ka"), ("Fiat", "Cronos"), ("Fiat", "Palio"), ("Chevrolet", "Onix"),
+    ("Renault", "Sandero"), ("Peugeot", "208"), ("Peugeot", "2008"),
+)
+CUIT_WEIGHTS = (5, 4, 3, 2, 7, 6, 5, 4, 3, 2)
+BATCH_SIZE = 1000
+
+
+def cuit_check_digit(prefix: str, dni: str) -> int:
+    """Dígito verificador (módulo 11) de un CUIT/CUIL."""
+    total = sum(int(digit) * weight for digit, weight in zip(prefix + dni, CUIT_WEIGHTS))
+    return (11 - total % 11) % 11
+
+
+def make_cuit(prefix: str, dni: str) -> str:
+    digit = cuit_check_digit(prefix, dni)
+    if digit == 10:
+        # Combinación sin dígito válido: AFIP asigna el prefijo 23.
+        prefix = "23"
+        digit = cuit_check_digit(prefix, dni)
+    return f"{prefix}{dni}{digit}"
+
+
+class DataGenerator:
+    """
+    Genera el cliente `n` y sus vehículos de forma determinista a partir de `seed` y `n`:
+    los datos no dependen del orden en que se pidan, y dos ejecuciones con la misma semilla coinciden.
+    """
+    def __init__(self, seed: int = 42, today: datetime.date = datetime.date(2025, 1, 1)):
+        self.seed = seed
+        self.today = today
+
+    def _rng(self, n: int, salt: str) -> random.Random:
+        return random.Random(f"{self.seed}:{salt}:{n}")
+
+    def documento(self, n: int) -> Tuple[str, IdentificationType]:
+        rng = self._rng(n, "documento")
+        # El número de cliente garantiza la unicidad; el resto del DNI es aleatorio pero estable.
+        dni = f"{10_000_000 + n * 7919 % 35_000_000:08d}"
+        kind = rng.choices((IdentificationType.DNI, IdentificationType.CUIL, IdentificationType.CUIT), (70, 20, 10))[0]
+        if kind is IdentificationType.DNI:
+            return dni, kind
+        return make_cuit(rng.choice(("20", "27")), dni), kind
+
+    def client(self, n: int) -> Dict[str, Any]:
+        rng = self._rng(n, "client")
+        name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        documento, documento_type = self.documento(n)
+        # Entre 16 y 80 años: algunos clientes quedan fuera de la regla de edad mínima.
+        birth_date = self.today - datetime.timedelta(days=rng.randint(16 * 365, 80 * 365))
+        return {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "name": name,
+            "last_name": last_name,
+            "birth_date": birth_date,
+            "documento": documento,
+            "documento_type": documento_type,
+            "email": f"cliente{n}@{EMAIL_DOMAIN}",
+            "phone_number": f"11{rng.randint(10_000_000, 69_999_999)}",
+        }
+
+    def license_plate(self, n: int, index: int, year: int) -> str:
+        """Patente única por (cliente, índice): las letras codifican el número de vehículo."""
+        serial = n * 4 + index
+        letters = string.ascii_uppercase
+        if year >= 2016:
+            # Mercosur: AB 123 CD. Las dos letras finales y el número salen del serial.
+            return f"A{letters[serial // 26_000 % 26]}{serial % 1000:03d}{letters[serial // 1000 % 26]}{letters[serial // 676_000 % 26]}"
+        # Formato anterior: ABC 123. La primera letra "Z" las separa de los prefijos reales más comunes.
+        return f"Z{letters[serial // 26_000 % 26]}{letters[serial // 1000 % 26]}{serial % 1000:03d}"
+
+    def vehicles(self, n: int, client_id: uuid.UUID) -> List[Dict[str, Any]]:
+        rng = self._rng(n, "vehicles")
+        vehicles = []
+        for index in range(rng.choices((1, 2, 3), (60, 30, 10))[0]):
+            brand, model = rng.choice(VEHICLES)
+            year = rng.randint(2005, self.today.year)
+            vehicles.append({
+                "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                "license_plate": self.license_plate(n, index, year),
+                "brand": brand,
+                "model": model,
+                "year": year,
+                "mileage": rng.randint(0, (self.today.year - year + 1) * 20_000),
+                "client_id": client_id,
+            })
+        return vehicles
+
+    def rows(self, start: int, count: int) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        for n in range(start, start + count):
+            client = self.client(n)
+            yield client, self.vehicles(n, client["id"])
+
+
+async def create_schema(engine: AsyncEngine):
+    """Crea las tablas en una base local (SQLite). En Postgres se usan las migraciones de Alembic."""
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: BaseEntity.metadata.create_all(
+            sync_conn, tables=[Client.__table__, Vehicle.__table__, Tombstone.__table__]
+        ))
+
+
+async def seed(engine: AsyncEngine, generator: DataGenerator, clients: int) -> int:
+    """Inserta `clients` clientes con sus vehículos en lotes de INSERT de múltiples filas."""
+    async with engine.connect() as conn:
+        existing = await conn.scalar(
+            select(Client.id).where(Client.email == f"cliente0@{EMAIL_DOMAIN}")
+        )
+        if existing is not None:
+            raise RuntimeError("Ya hay datos sembrados: ejecuta primero con --reset.")
+
+    vehicles_count = 0
+    for start in range(0, clients, BATCH_SIZE):
+        client_rows, vehicle_rows = [], []
+        for client, vehicles in generator.rows(start, min(BATCH_SIZE, clients - start)):
+            client_rows.append(client)
+            vehicle_rows.extend(vehicles)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Client), client_rows)
+            await conn.execute(insert(Vehicle), vehicle_rows)
+        vehicles_count += len(vehicle_rows)
+    return vehicles_count
+
+
+async def reset(engine: AsyncEngine) -> int:
+    """Borra los clientes sembrados (y sus vehículos)."""
+    seeded = select(Client.id).where(Client.email.like(f"%@{EMAIL_DOMAIN}"))
+    async with engine.begin() as conn:
+        await conn.execute(delete(Vehicle).where(Vehicle.client_id.in_(seeded)))
+        result = await conn.execute(delete(Client).where(Client.email.like(f"%@{EMAIL_DOMAIN}")))
+    return result.rowcount
+
+
+async def sample(engine: AsyncEngine, limit: int = 5000) -> Dict[str, List[Any]]:
+    """Ids, documentos y patentes sembrados, para armar las peticiones de los escenarios."""
+    async with engine.connect() as conn:
+        clients = (await conn.execute(
+            select(Client.id, Client.documento).where(Client.email.like(f"%@{EMAIL_DOMAIN}")).limit(limit)
+        )).all()
+        vehicles = (await conn.execute(
+            select(Vehicle.id, Vehicle.license_plate, Vehicle.client_id)
+            .join(Client, Client.id == Vehicle.client_id)
+            .where(Client.email.like(f"%@{EMAIL_DOMAIN}"))
+            .limit(limit)
+        )).all()
+    return {
+        "client_ids": [row.id for row in clients],
+        "documentos": [row.documento for row in clients],
+        "vehicle_ids": [row.id for row in vehicles],
+        "license_plates": [row.license_plate for row in vehicles],
+        "pairs": [(row.client_id, row.id) for row in vehicles],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Siembra clientes y vehículos sintéticos para las pruebas de carga.")
+    parser.add_argument("--clients", type=int, default=5000, help="Clientes a generar.")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador.")
+    parser.add_argument("--reset", action="store_true", help="Borrar los datos sembrados antes (o en lugar) de sembrar.")
+    args = parser.parse_args()
+
+    from database import async_engine
+
+    async def run():
+        async_engine.echo = False
+        if async_engine.dialect.name == "sqlite":
+            await create_schema(async_engine)
+        if args.reset:
+            print(f"Borrados {await reset(async_engine)} clientes sembrados.")
+        if args.clients:
+            vehicles = await seed(async_engine, DataGenerator(args.seed), args.clients)
+            print(f"Sembrados {args.clients} clientes y {vehicles} vehículos.")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
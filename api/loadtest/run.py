@@ -0,0 +1,158 @@
+"""
+Ejecuta un escenario de carga contra la API y reporta, por endpoint, RPS, latencias p50/p95/p99 y errores.
+
+Por defecto la API corre en el mismo proceso (transporte ASGI de httpx, sin red); con `--base-url`
+se apunta a una instancia levantada con uvicorn. La base es la de `DATABASE_URL`, o la de `--database-url`,
+así que con SQLite la prueba no necesita ningún servicio externo.
+
+Uso (desde /api):
+    python -m loadtest.run --database-url sqlite+aiosqlite:///./loadtest.db --seed-clients 5000 --scenario lookup
+    python -m loadtest.run --scenario write --concurrency 32 --duration 30
+    python -m loadtest.run --scenario list --base-url http://localhost:8000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.scenarios import SCENARIOS
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.error_samples: Dict[str, int] = defaultdict(int)
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+async def run_scenario(
+    http: httpx.AsyncClient, ctx, scenario: str, concurrency: int, duration: float, seed: int
+) -> Dict[str, EndpointStats]:
+    from loadtest.scenarios import request_mix
+
+    builders, weights = request_mix(scenario, ctx.postgres)
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        rng = random.Random(f"{seed}:{worker_id}")
+        while time.perf_counter() < deadline:
+            label, method, path, body = rng.choices(builders, weights)[0](ctx, rng)
+            endpoint = stats[label]
+            start = time.perf_counter()
+            try:
+                response = await http.request(method, path, json=body)
+                error: Optional[str] = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+            except Exception as e:
+                error = type(e).__name__
+            endpoint.latencies.append(time.perf_counter() - start)
+            if error:
+                endpoint.errors += 1
+                endpoint.error_samples[error] += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return stats
+
+
+def report(stats: Dict[str, EndpointStats], elapsed: float) -> str:
+    lines = [
+        "| Endpoint | Peticiones | Errores | RPS | p50 (ms) | p95 (ms) | p99 (ms) |",
+        "| -------- | ---------- | ------- | --- | -------- | -------- | -------- |",
+    ]
+    total = EndpointStats()
+    for label, endpoint in sorted(stats.items()):
+        total.latencies.extend(endpoint.latencies)
+        total.errors += endpoint.errors
+        for error, count in endpoint.error_samples.items():
+            total.error_samples[f"{label}: {error}"] += count
+    for label, endpoint in sorted(stats.items()) + [("Total", total)]:
+        lines.append(
+            f"| {label} | {len(endpoint.latencies)} | {endpoint.errors} | {len(endpoint.latencies) / elapsed:.1f} | "
+            f"{endpoint.percentile(50) * 1000:.1f} | {endpoint.percentile(95) * 1000:.1f} | {endpoint.percentile(99) * 1000:.1f} |"
+        )
+    if total.error_samples:
+        lines.append("")
+        lines.append("Errores:")
+        lines.extend(f"  {count}x {error}" for error, count in sorted(total.error_samples.items()))
+    return "\n".join(lines)
+
+
+async def main_async(args) -> bool:
+    # Importa la app recién ahora: `database` lee DATABASE_URL al importarse.
+    from database import async_engine
+    from loadtest.data import DataGenerator, create_schema, reset, sample, seed
+    from loadtest.scenarios import ScenarioContext
+
+    # El eco de cada sentencia dominaría la medición.
+    async_engine.echo = False
+    postgres = async_engine.dialect.name == "postgresql"
+    generator = DataGenerator(args.seed)
+
+    if not postgres:
+        await create_schema(async_engine)
+    if args.seed_clients:
+        await reset(async_engine)
+        vehicles = await seed(async_engine, generator, args.seed_clients)
+        print(f"Sembrados {args.seed_clients} clientes y {vehicles} vehículos.", file=sys.stderr)
+
+    data = await sample(async_engine)
+    if not data["client_ids"]:
+        print("No hay datos sembrados: ejecuta con --seed-clients N.", file=sys.stderr)
+        return False
+    # Las escrituras nuevas usan números de cliente por encima de los sembrados, distintos en cada corrida.
+    first_new_client = 10_000_000 + int(time.time()) % 1_000_000 * 10
+    ctx = ScenarioContext(data, generator, first_new_client, postgres)
+
+    if args.base_url:
+        http = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+    else:
+        from main import app
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+
+    async with http:
+        if args.warmup:
+            await run_scenario(http, ctx, args.scenario, args.concurrency, args.warmup, args.seed)
+        start = time.perf_counter()
+        stats = await run_scenario(http, ctx, args.scenario, args.concurrency, args.duration, args.seed)
+        elapsed = time.perf_counter() - start
+
+    print(f"Escenario '{args.scenario}': {args.concurrency} trabajadores durante {elapsed:.1f}s "
+          f"({'Postgres' if postgres else async_engine.dialect.name}, {'HTTP ' + args.base_url if args.base_url else 'ASGI en proceso'})")
+    print(report(stats, elapsed))
+    await async_engine.dispose()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="lookup", help="Mezcla de peticiones.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Trabajadores concurrentes.")
+    parser.add_argument("--duration", type=float, default=20, help="Segundos de medición.")
+    parser.add_argument("--warmup", type=float, default=2, help="Segundos de calentamiento, no medidos.")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout por petición en segundos.")
+    parser.add_argument("--seed-clients", type=int, default=0, help="Borrar y volver a sembrar N clientes antes de medir.")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos y de la mezcla de peticiones.")
+    parser.add_argument("--database-url", help="Base a usar en lugar de DATABASE_URL (ej: sqlite+aiosqlite:///./loadtest.db).")
+    parser.add_argument("--base-url", help="URL de una API levantada con uvicorn; si se omite, la app corre en proceso.")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    ok = asyncio.run(main_async(args))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Escenarios de carga: cada uno es una mezcla ponderada de peticiones armadas sobre los datos sembrados.
+"""
+import itertools
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loadtest.data import DataGenerator
+
+# (etiqueta del endpoint, método, ruta, cuerpo JSON)
+Request = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+
+class ScenarioContext:
+    """Datos sembrados y generador para las escrituras nuevas, compartidos por todos los trabajadores."""
+    def __init__(self, sample: Dict[str, List[Any]], generator: DataGenerator, first_new_client: int, postgres: bool):
+        self.sample = sample
+        self.generator = generator
+        self.new_clients = itertools.count(first_new_client)
+        self.postgres = postgres
+
+
+def _client_json(client: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": client["name"],
+        "last_name": client["last_name"],
+        "birth_date": client["birth_date"].isoformat(),
+        "documento": client["documento"],
+        "documento_type": client["documento_type"].value,
+        "email": client["email"],
+        "phone_number": client["phone_number"],
+    }
+
+
+def _vehicle_json(vehicle: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: vehicle[key] for key in ("license_plate", "brand", "model", "year", "mileage")}
+
+
+# --- Lecturas puntuales ---
+
+def get_client(ctx: ScenarioContext, rng: random.Random) -> Request:
+    return "GET /api/clients/{client_id}", "GET", f"/api/clients/{rng.choice(ctx.sample['client_ids'])}", None
+
+def get_client_by_documento(ctx: ScenarioContext, rng: random.Random) -> Request:
+    documento = rng.choice(ctx.sample["documentos"])
+    return (
+        "GET /api/clients/by-documento/{documento}", "GET",
+        f"/api/clients/by-documento/{documento}?fields=name,last_name,birth_date,email", None,
+    )
+
+def get_vehicle_by_plate(ctx: ScenarioContext, rng: random.Random) -> Request:
+    plate = rng.choice(ctx.sample["license_plates"])
+    return "GET /api/vehicles/by-plate/{license_plate}", "GET", f"/api/vehicles/by-plate/{plate}", None
+
+def get_vehicles_by_plates(ctx: ScenarioContext, rng: random.Random) -> Request:
+    plates = rng.sample(ctx.sample["license_plates"], min(3, len(ctx.sample["license_plates"])))
+    return "POST /api/vehicles/by-plate", "POST", "/api/vehicles/by-plate", {"license_plates": plates}
+
+# --- Escrituras ---
+
+def create_client(ctx: ScenarioContext, rng: random.Random) -> Request:
+    client = ctx.generator.client(next(ctx.new_clients))
+    return "POST /api/clients/", "POST", "/api/clients/", _client_json(client)
+
+def intake(ctx: ScenarioContext, rng: random.Random) -> Request:
+    n = next(ctx.new_clients)
+    client = ctx.generator.client(n)
+    vehicle = ctx.generator.vehicles(n, client["id"])[0]
+    return "POST /api/intake", "POST", "/api/intake", {"client": _client_json(client), "vehicle": _vehicle_json(vehicle)}
+
+def upsert_existing_client(ctx: ScenarioContext, rng: random.Random) -> Request:
+    # Reescribe un cliente sembrado: el documento y el correo se mantienen, por lo que actualiza.
+    n = rng.randrange(len(ctx.sample["client_ids"]))
+    client = ctx.generator.client(n)
+    client["phone_number"] = f"11{rng.randint(10_000_000, 69_999_999)}"
+    return "PUT /api/clients/upsert", "PUT", "/api/clients/upsert", _client_json(client)
+
+def patch_vehicle(ctx: ScenarioContext, rng: random.Random) -> Request:
+    vehicle_id = rng.choice(ctx.sample["vehicle_ids"])
+    return "PATCH /api/vehicles/{vehicle_id}", "PATCH", f"/api/vehicles/{vehicle_id}", {"mileage": rng.randint(0, 150_000)}
+
+# --- Elegibilidad ---
+
+def check_eligibility(ctx: ScenarioContext, rng: random.Random) -> Request:
+    client_id, vehicle_id = rng.choice(ctx.sample["pairs"])
+    return (
+        "POST /api/eligibility/check", "POST", "/api/eligibility/check",
+        {"client_id": str(client_id), "vehicle_id": str(vehicle_id)},
+    )
+
+def eligible_pairs(ctx: ScenarioContext, rng: random.Random) -> Request:
+    return "GET /api/eligibility/eligible", "GET", "/api/eligibility/eligible?limit=100", None
+
+# --- Listados ---
+
+def list_clients(ctx: ScenarioContext, rng: random.Random) -> Request:
+    return "GET /api/clients/", "GET", "/api/clients/?fields=name,last_name,documento", None
+
+def client_vehicles(ctx: ScenarioContext, rng: random.Random) -> Request:
+    client_id, _ = rng.choice(ctx.sample["pairs"])
+    return "GET /api/vehicles/client/{client_id}", "GET", f"/api/vehicles/client/{client_id}", None
+
+def changes(ctx: ScenarioContext, rng: random.Random) -> Request:
+    return "GET /api/changes", "GET", "/api/changes?limit=200", None
+
+
+RequestBuilder = Callable[[ScenarioContext, random.Random], Request]
+
+# Peso de cada petición en la mezcla. Las marcadas en POSTGRES_ONLY se omiten con SQLite.
+SCENARIOS: Dict[str, List[Tuple[RequestBuilder, int]]] = {
+    "lookup": [(get_client, 40), (get_client_by_documento, 30), (get_vehicle_by_plate, 20), (get_vehicles_by_plates, 10)],
+    "write": [(intake, 40), (create_client, 20), (upsert_existing_client, 20), (patch_vehicle, 20)],
+    "eligibility": [(check_eligibility, 80), (eligible_pairs, 20)],
+    "list": [(client_vehicles, 50), (list_clients, 20), (eligible_pairs, 15), (changes, 15)],
+}
+
+# Endpoints que usan SQL propio de Postgres (make_interval, pg_stat_activity).
+POSTGRES_ONLY = {eligible_pairs, changes}
+
+
+def request_mix(scenario: str, postgres: bool) -> Tuple[List[RequestBuilder], List[int]]:
+    mix = [(builder, weight) for builder, weight in SCENARIOS[scenario] if postgres or builder not in POSTGRES_ONLY]
+    return [builder for builder, _ in mix], [weight for _, weight in mix]
@@ -0,0 +1,119 @@
+"""
+Mide el CPU que consume serializar respuestas grandes con el camino habitual de FastAPI
+(`FAST_JSON_ENABLED=false`) y con el serializador directo de pydantic-core.
+
+Arma en memoria N clientes sembrados con sus vehículos y llama a los endpoints reales del listado
+con el servicio reemplazado, así que no necesita base de datos. Verifica además que ambos caminos
+devuelvan el mismo JSON.
+
+Uso (desde /api):
+    python -m loadtest.serialization --clients 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import time
+from typing import List
+
+import httpx
+
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+from loadtest.data import DataGenerator
+from responses import json_response
+
+# (etiqueta, ruta) de cada medición; el listado completo incluye los vehículos anidados.
+CASES = [
+    ("clientes completos", "/api/clients/"),
+    ("clientes parciales", "/api/clients/?fields=name,last_name,documento&include=vehicles"),
+    ("vehículos de un cliente", "/api/vehicles/client/{client_id}"),
+]
+
+
+def build_clients(count: int, seed: int) -> List[Client]:
+    generator = DataGenerator(seed)
+    now = datetime.datetime(2025, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+    clients = []
+    for client_data, vehicles_data in generator.rows(0, count):
+        vehicles = [Vehicle(**vehicle, created_at=now, updated_at=now) for vehicle in vehicles_data]
+        clients.append(Client(**client_data, vehicles=vehicles, created_at=now, updated_at=now))
+    return clients
+
+
+class InMemoryClientService:
+    def __init__(self, clients: List[Client]):
+        self.clients = clients
+
+    async def get_all_clients(self, fields=None, include_vehicles=True) -> List[Client]:
+        return self.clients
+
+
+class InMemoryVehicleService:
+    def __init__(self, vehicles: List[Vehicle]):
+        self.vehicles = vehicles
+
+    async def get_vehicles_for_client(self, client_id) -> List[Vehicle]:
+        return self.vehicles
+
+
+async def measure(http: httpx.AsyncClient, path: str, repeat: int) -> tuple[float, bytes]:
+    """Segundos de CPU promedio por petición y el cuerpo de la última respuesta."""
+    await http.get(path)
+    start = time.process_time()
+    for _ in range(repeat):
+        response = await http.get(path)
+        response.raise_for_status()
+    return (time.process_time() - start) / repeat, response.content
+
+
+async def run(clients_count: int, repeat: int, seed: int) -> bool:
+    from main import app
+    from routers.client_router import get_client_service
+    from routers.vehicle_router import get_vehicle_service
+
+    clients = build_clients(clients_count, seed)
+    # Todos los vehículos como si fueran de un solo cliente: el listado más largo posible.
+    vehicles = [vehicle for client in clients for vehicle in client.vehicles]
+    app.dependency_overrides[get_client_service] = lambda: InMemoryClientService(clients)
+    app.dependency_overrides[get_vehicle_service] = lambda: InMemoryVehicleService(vehicles)
+
+    print(f"{clients_count} clientes, {len(vehicles)} vehículos, {repeat} repeticiones por caso (CPU por petición)")
+    print("| Caso | Tamaño (KB) | FastAPI (ms) | Directo (ms) | Mejora |")
+    print("| ---- | ----------- | ------------ | ------------ | ------ |")
+    ok = True
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+            for label, path in CASES:
+                path = path.format(client_id=clients[0].id)
+                json_response.FAST_JSON_ENABLED = False
+                default_seconds, default_body = await measure(http, path, repeat)
+                json_response.FAST_JSON_ENABLED = True
+                fast_seconds, fast_body = await measure(http, path, repeat)
+                same = json.loads(default_body) == json.loads(fast_body)
+                ok &= same
+                print(
+                    f"| {label} | {len(fast_body) / 1024:.0f} | {default_seconds * 1000:.1f} | {fast_seconds * 1000:.1f} | "
+                    f"{default_seconds / fast_seconds:.1f}x{'' if same else ' (¡JSON distinto!)'} |"
+                )
+    finally:
+        app.dependency_overrides.clear()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de CPU de la serialización de respuestas.")
+    parser.add_argument("--clients", type=int, default=10_000, help="Clientes en el listado.")
+    parser.add_argument("--repeat", type=int, default=5, help="Peticiones medidas por caso y camino.")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador de datos.")
+    args = parser.parse_args()
+
+    # El middleware de métricas registraría cada petición como lenta; no forma parte de lo medido.
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    ok = asyncio.run(run(args.clients, args.repeat, args.seed))
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,74 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 
-from session_router import api_router
+from compression import COMPRESSION_ENABLED, CompressionMiddleware
+from database import async_engine, replica_engine, replica_health
+from metrics import METRICS_ENABLED, MetricsMiddleware, instrument_engine, registry
+from session_router import include_routers
+from services.idempotency_service import purge_expired_keys
+from services.write_batcher import write_batcher
+from warmup import readiness, warm_up_until_ready
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('vic-api')
 logger.setLevel(logging.DEBUG)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Abre el pool y prepara las consultas frecuentes en segundo plano; `/ready` responde 200 al terminar.
+    warmup = asyncio.create_task(warm_up_until_ready(async_engine, replica=replica_engine))
+    replica_monitor = asyncio.create_task(replica_health.monitor()) if replica_engine is not None else None
+    idempotency_purge = asyncio.create_task(purge_expired_keys())
+    yield
+    readiness.ready = False
+    warmup.cancel()
+    if readiness.replica_warmup is not None:
+        readiness.replica_warmup.cancel()
+    idempotency_purge.cancel()
+    if replica_monitor is not None:
+        replica_monitor.cancel()
+    # Confirma las escrituras agrupadas pendientes antes de cerrar.
+    await write_batcher.close()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Vehicle Intake API",
     description="API de servicios para la gestión de identificaciones.",
     version="0.1.0"
 )
 
-app.include_router(api_router)
+include_routers(app)
+
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    """Indica si la API terminó de calentar el pool y puede recibir tráfico."""
+    if not readiness.ready:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    status = {"status": "ready", "warmup_seconds": round(readiness.warmup_seconds, 3)}
+    if replica_engine is not None:
+        status["replica"] = {
+            "available": replica_health.available,
+            "lag_seconds": round(replica_health.lag_seconds, 3),
+            "fallbacks": replica_health.fallbacks,
+        }
+    return status
+
+if COMPRESSION_ENABLED:
+    # Se agrega antes que las métricas para que estas registren los bytes ya comprimidos.
+    app.add_middleware(CompressionMiddleware)
+
+if METRICS_ENABLED:
+    instrument_engine(async_engine.sync_engine)
+    if replica_engine is not None:
+        instrument_engine(replica_engine.sync_engine)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Métricas por ruta en formato de texto de Prometheus."""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,186 @@
+import bisect
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('vic-api')
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_SLOW_REQUEST_MS = float(os.getenv("METRICS_SLOW_REQUEST_MS", "500"))
+
+# Límites superiores (segundos) del histograma de latencia; +Inf se agrega al exponer.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+# Rutas de infraestructura (scraping y sondas) que no se miden.
+UNMEASURED_PATHS = frozenset({"/metrics", "/ready"})
+
+
+class RequestStats:
+    """Sentencias SQL ejecutadas durante una petición, con su duración."""
+    __slots__ = ("statements", "db_seconds", "queries")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.queries: List[Tuple[str, float]] = []
+
+    def breakdown(self, top: int = 5) -> str:
+        """Las sentencias que más tiempo consumieron, agrupadas por texto."""
+        grouped: Dict[str, List[float]] = {}
+        for statement, seconds in self.queries:
+            grouped.setdefault(statement, []).append(seconds)
+        ranked = sorted(grouped.items(), key=lambda item: sum(item[1]), reverse=True)[:top]
+        return "\n".join(
+            f"  {len(durations)}x {sum(durations) * 1000:.1f}ms  {' '.join(statement.split())[:200]}"
+            for statement, durations in ranked
+        )
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class RouteMetrics:
+    __slots__ = ("buckets", "count", "seconds", "statements", "db_seconds", "response_bytes")
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    Acumula las métricas por método y plantilla de ruta (`/api/clients/{client_id}`, no la URL real,
+    para acotar la cardinalidad) y las expone en el formato de texto de Prometheus.
+    """
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats, response_bytes: int):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(LATENCY_BUCKETS):
+            metrics.buckets[index] += 1
+        metrics.count += 1
+        metrics.seconds += seconds
+        metrics.statements += stats.statements
+        metrics.db_seconds += stats.db_seconds
+        metrics.response_bytes += response_bytes
+        key = (method, route, status)
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def render(self) -> str:
+        lines = [
+            "# HELP vic_http_requests_total Peticiones HTTP atendidas.",
+            "# TYPE vic_http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f'vic_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP vic_http_request_duration_seconds Latencia de las peticiones HTTP.",
+            "# TYPE vic_http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for upper, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                cumulative += count
+                lines.append(f'vic_http_request_duration_seconds_bucket{{{labels},le="{upper}"}} {cumulative}')
+            lines.append(f'vic_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"vic_http_request_duration_seconds_sum{{{labels}}} {metrics.seconds}")
+            lines.append(f"vic_http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+        for name, help_text, attribute in (
+            ("vic_http_request_db_statements_total", "Sentencias SQL ejecutadas por las peticiones.", "statements"),
+            ("vic_http_request_db_seconds_total", "Tiempo en la base de datos de las peticiones.", "db_seconds"),
+            ("vic_http_response_bytes_total", "Bytes de cuerpo de respuesta enviados.", "response_bytes"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), metrics in sorted(self.routes.items()):
+                lines.append(f'{name}{{method="{method}",route="{route}"}} {getattr(metrics, attribute)}')
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición: latencia, sentencias SQL, tiempo en la base y bytes
+    de respuesta. Es ASGI puro (no `BaseHTTPMiddleware`) para no agregar una tarea por petición.
+    Las peticiones más lentas que `slow_request_ms` se registran con el detalle de sus consultas.
+    """
+    def __init__(self, app, registry: MetricsRegistry = registry, slow_request_ms: float = METRICS_SLOW_REQUEST_MS):
+        self.app = app
+        self.registry = registry
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNMEASURED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = scope.get("route")
+            route_path = route.path if route is not None else UNMATCHED_ROUTE
+            self.registry.observe(scope["method"], route_path, status, elapsed, stats, response_bytes)
+            if elapsed >= self.slow_request_seconds:
+                logger.warning(
+                    f"Petición lenta: {scope['method']} {route_path} -> {status} en {elapsed * 1000:.1f}ms "
+                    f"({stats.statements} sentencias, {stats.db_seconds * 1000:.1f}ms en la base)\n{stats.breakdown()}"
+                )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is None:
+        return
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    stats.statements += 1
+    stats.db_seconds += seconds
+    stats.queries.append((statement, seconds))
+
+
+def instrument_engine(engine: Engine):
+    """Registra los eventos que cuentan y cronometran las sentencias de la petición en curso."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
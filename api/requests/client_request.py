@@ -1,6 +1,6 @@
-from datetime import date
-from typing import Optional
-from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
 from entities.client_entity import IdentificationType
 
 class ClientRequest(BaseModel):
@@ -10,4 +10,63 @@ class ClientRequest(BaseModel):
     documento: str = Field(..., description="El número de documento del usuario.")
     documento_type: IdentificationType = Field(..., description="El tipo de documento (DNI, CUIT o CUIL).")
     email: str = Field(..., description="El correo electrónico del usuario.")
-    phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
\ No newline at end of file
+    phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
+
+# Columnas NOT NULL de `clients`: un PATCH puede omitirlas, pero no enviarlas en null.
+NON_NULLABLE_CLIENT_FIELDS = ("documento", "documento_type", "email")
+
+class ClientPatchRequest(BaseModel):
+    """
+    Actualización parcial de un cliente: solo se modifican los campos enviados. Un campo enviado
+    en null se borra, salvo los obligatorios (`NON_NULLABLE_CLIENT_FIELDS`), que se rechazan.
+    """
+    name: Optional[str] = Field(None, description="El nombre de pila del usuario.")
+    last_name: Optional[str] = Field(None, description="El apellido del usuario.")
+    birth_date: Optional[date] = Field(None, description="La fecha de nacimiento del usuario en formato YYYY-MM-DD.")
+    documento: Optional[str] = Field(None, description="El número de documento del usuario.")
+    documento_type: Optional[IdentificationType] = Field(None, description="El tipo de documento (DNI, CUIT o CUIL).")
+    email: Optional[str] = Field(None, description="El correo electrónico del usuario.")
+    phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
+    expected_updated_at: Optional[datetime] = Field(
+        None, description="El `updated_at` conocido del cliente. Si el registro cambió desde entonces, se responde 409."
+    )
+
+    @model_validator(mode="after")
+    def reject_required_nulls(self) -> "ClientPatchRequest":
+        nulls = [field for field in NON_NULLABLE_CLIENT_FIELDS if field in self.model_fields_set and getattr(self, field) is None]
+        if nulls:
+            raise ValueError(f"Campos obligatorios que no se pueden borrar: {', '.join(nulls)}.")
+        return self
+
+CLIENT_FIELDS = ("name", "last_name", "birth_date", "documento", "documento_type", "email", "phone_number", "created_at", "updated_at")
+
+class ClientProjection(BaseModel):
+    """
+    Forma de la respuesta pedida con `?fields=` e `?include=` en las lecturas de clientes.
+    """
+    fields: Optional[List[str]] = Field(None, description="Columnas a devolver además del id; None para todas.")
+    include_vehicles: bool = Field(True, description="Si se cargan y devuelven los vehículos del cliente.")
+
+    @classmethod
+    def from_query(cls, fields: Optional[str], include: Optional[str]) -> "ClientProjection":
+        """
+        Sin `fields` ni `include` se devuelve el cliente completo con sus vehículos. Si se indica
+        alguno, solo se devuelven los campos pedidos, y los vehículos solo con `include=vehicles`.
+        """
+        if fields is None and include is None:
+            return cls()
+
+        requested = [field.strip() for field in (fields or "").split(",") if field.strip() and field.strip() != "id"]
+        unknown = [field for field in requested if field not in CLIENT_FIELDS]
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(unknown)}. Permitidos: id, {', '.join(CLIENT_FIELDS)}.")
+
+        relations = [relation.strip() for relation in (include or "").split(",") if relation.strip()]
+        if any(relation != "vehicles" for relation in relations):
+            raise ValueError("Solo se puede incluir la relación 'vehicles'.")
+
+        return cls(fields=list(dict.fromkeys(requested)) if fields is not None else None, include_vehicles="vehicles" in relations)
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields is None and self.include_vehicles
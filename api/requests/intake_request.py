@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+from requests.client_request import ClientRequest
+from requests.vehicle_request import VehicleDataRequest
+
+class IntakeRequest(BaseModel):
+    """
+    Admisión completa: el cliente y su vehículo, registrados y evaluados en una única operación.
+    """
+    client: ClientRequest = Field(..., description="Datos del cliente. Si el documento ya está registrado, se actualiza.")
+    vehicle: VehicleDataRequest = Field(
+        ..., description="Datos del vehículo. Si la patente ya está registrada, se actualiza y se asocia al cliente."
+    )
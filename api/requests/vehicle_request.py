@@ -1,10 +1,65 @@
+import re
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
-class VehicleRequest(BaseModel):
+def normalize_license_plate(license_plate: str) -> str:
+    """Normaliza una patente a mayúsculas y sin espacios ni guiones ("ab 123-cd" -> "AB123CD")."""
+    return re.sub(r"[\s-]", "", license_plate).upper()
+
+class VehicleDataRequest(BaseModel):
+    """
+    Datos propios de un vehículo, sin el cliente propietario.
+    """
     license_plate: str = Field(..., description="Patente del vehículo")
     brand: str = Field(..., description="Marca del vehículo")
     model: str = Field(..., description="Modelo del vehículo")
     year: int = Field(..., description="Año del vehículo")
     mileage: int = Field(..., description="Kilometraje del vehículo")
-    client_id: UUID = Field(..., description="ID del cliente propietario del vehículo")
\ No newline at end of file
+
+    @field_validator("license_plate")
+    @classmethod
+    def normalize_plate(cls, value: str) -> str:
+        return normalize_license_plate(value)
+
+class VehicleRequest(VehicleDataRequest):
+    client_id: UUID = Field(..., description="ID del cliente propietario del vehículo")
+
+class VehiclePatchRequest(BaseModel):
+    """
+    Actualización parcial de un vehículo: solo se modifican los campos enviados. Todas sus columnas
+    son obligatorias, así que un campo enviado en null se rechaza.
+    """
+    license_plate: Optional[str] = Field(None, description="Patente del vehículo")
+    brand: Optional[str] = Field(None, description="Marca del vehículo")
+    model: Optional[str] = Field(None, description="Modelo del vehículo")
+    year: Optional[int] = Field(None, description="Año del vehículo")
+    mileage: Optional[int] = Field(None, description="Kilometraje del vehículo")
+    client_id: Optional[UUID] = Field(None, description="ID del cliente propietario del vehículo")
+    expected_updated_at: Optional[datetime] = Field(
+        None, description="El `updated_at` conocido del vehículo. Si el registro cambió desde entonces, se responde 409."
+    )
+
+    @field_validator("license_plate")
+    @classmethod
+    def normalize_plate(cls, value: Optional[str]) -> Optional[str]:
+        return normalize_license_plate(value) if value is not None else None
+
+    @model_validator(mode="after")
+    def reject_nulls(self) -> "VehiclePatchRequest":
+        nulls = [
+            field for field in self.model_fields_set
+            if field != "expected_updated_at" and getattr(self, field) is None
+        ]
+        if nulls:
+            raise ValueError(f"Campos obligatorios que no se pueden borrar: {', '.join(sorted(nulls))}.")
+        return self
+
+class VehiclePlatesRequest(BaseModel):
+    license_plates: List[str] = Field(..., max_length=500, description="Patentes de los vehículos a consultar")
+
+    @field_validator("license_plates")
+    @classmethod
+    def normalize_plates(cls, value: List[str]) -> List[str]:
+        return [normalize_license_plate(plate) for plate in value]
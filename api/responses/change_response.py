@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class ChangeResponse(BaseModel):
+    """
+    Un cliente o vehículo creado, actualizado o eliminado, con su estado más reciente.
+    """
+    entity_type: str = Field(description="El tipo de registro: `client` o `vehicle`.")
+    operation: str = Field(description="`created`, `updated` o `deleted`.")
+    id: uuid.UUID = Field(description="El ID único (UUID) del registro.")
+    changed_at: datetime = Field(description="Fecha y hora del cambio.")
+    data: Optional[Dict[str, Any]] = Field(None, description="El registro actual; nulo si fue eliminado.")
+
+class ChangesPageResponse(BaseModel):
+    """
+    Página del feed de cambios.
+    """
+    items: List[ChangeResponse] = Field([], description="Los cambios de esta página, en orden de confirmación.")
+    next_cursor: Optional[str] = Field(
+        None, description="Valor para `since` en la siguiente consulta. Se debe guardar aunque la página venga vacía."
+    )
+    has_more: bool = Field(False, description="Indica si hay más cambios disponibles sin esperar.")
@@ -1,11 +1,12 @@
 import uuid
 from datetime import date
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from pydantic import ConfigDict, Field
 
 from .base_response import BaseResponse
 from .vehicle_response import VehicleResponse
-from entities.client_entity import IdentificationType
+from entities.client_entity import Client, IdentificationType
+from requests.client_request import CLIENT_FIELDS, ClientProjection
 
 class ClientResponse(BaseResponse):
     """
@@ -21,4 +22,18 @@ class ClientResponse(BaseResponse):
     phone_number: Optional[str] = Field(None, description="El número de teléfono del cliente.")
     vehicles: List[VehicleResponse] = Field([], description="Una lista de los vehículos asociados a este cliente.")
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+def render_client(client: Client, projection: ClientProjection) -> Dict[str, Any] | ClientResponse:
+    """
+    Serializa el cliente con la forma pedida, leyendo solo los atributos cargados por la proyección.
+    """
+    if projection.is_full:
+        return ClientResponse.model_validate(client)
+
+    data: Dict[str, Any] = {"id": client.id}
+    for field in projection.fields if projection.fields is not None else CLIENT_FIELDS:
+        data[field] = getattr(client, field)
+    if projection.include_vehicles:
+        data["vehicles"] = [VehicleResponse.model_validate(vehicle) for vehicle in client.vehicles]
+    return data
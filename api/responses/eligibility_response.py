@@ -1,5 +1,6 @@
+import uuid
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 class EligibilityResponse(BaseModel):
     """
@@ -7,4 +8,30 @@ class EligibilityResponse(BaseModel):
     """
     is_eligible: bool = Field(description="Indica si el cliente y el vehículo son elegibles.")
     message: str = Field(description="Un mensaje resumen del resultado de la evaluación.")
-    reasons: List[str] = Field([], description="Una lista de razones por las que no es elegible (si aplica).")
\ No newline at end of file
+    reasons: List[str] = Field([], description="Una lista de razones por las que no es elegible (si aplica).")
+
+class EligiblePairResponse(BaseModel):
+    """
+    Par cliente/vehículo que cumple las reglas de elegibilidad.
+    """
+    client_id: uuid.UUID = Field(description="El ID único (UUID) del cliente.")
+    name: Optional[str] = Field(None, description="El nombre de pila del cliente.")
+    last_name: Optional[str] = Field(None, description="El apellido del cliente.")
+    documento: str = Field(description="El número de documento del cliente.")
+    email: str = Field(description="La dirección de correo electrónico del cliente.")
+    age: int = Field(description="La edad del cliente, calculada a partir de su fecha de nacimiento.")
+    vehicle_id: uuid.UUID = Field(description="El ID único (UUID) del vehículo.")
+    license_plate: str = Field(description="La patente (matrícula) del vehículo.")
+    brand: str = Field(description="La marca del vehículo.")
+    model: str = Field(description="El modelo del vehículo.")
+    year: int = Field(description="El año de fabricación del vehículo.")
+    mileage: int = Field(description="El kilometraje actual del vehículo.")
+
+class EligiblePairsPageResponse(BaseModel):
+    """
+    Página de pares elegibles.
+    """
+    items: List[EligiblePairResponse] = Field([], description="Los pares elegibles de esta página.")
+    next_cursor: Optional[uuid.UUID] = Field(
+        None, description="Valor para `after` en la siguiente página; nulo si no hay más resultados."
+    )
@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Response
+
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+from requests.client_request import ClientProjection
+
+# Sufijos que agrega `compression.CompressionMiddleware` a la ETag de una representación comprimida.
+CODING_SUFFIXES = ("-br", "-gzip")
+
+
+def _etag(*parts: Any) -> str:
+    raw = "|".join("" if part is None else part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+
+
+def projection_key(projection: ClientProjection) -> str:
+    """Cada forma de la respuesta (`?fields=`, `?include=`) es una representación distinta."""
+    if projection.is_full:
+        return "full"
+    return f"{','.join(projection.fields) if projection.fields is not None else '*'};{int(projection.include_vehicles)}"
+
+
+def client_etag(
+    client_id: Any, updated_at: datetime, vehicles_updated_at: Optional[datetime], vehicles_count: int,
+    projection: ClientProjection,
+) -> str:
+    """
+    ETag fuerte del cliente: su id y `updated_at` y, si se incluyen los vehículos, el último
+    `updated_at` y la cantidad de ellos (un vehículo que cambia no toca la fila del cliente).
+    """
+    if not projection.include_vehicles:
+        vehicles_updated_at, vehicles_count = None, 0
+    return _etag("client", client_id, updated_at, vehicles_updated_at, vehicles_count, projection_key(projection))
+
+
+def client_etag_for(client: Client, projection: ClientProjection) -> str:
+    """La misma ETag que `client_etag`, calculada sobre el cliente ya cargado."""
+    vehicles = client.vehicles if projection.include_vehicles else []
+    return client_etag(
+        client.id, client.updated_at, max((vehicle.updated_at for vehicle in vehicles), default=None), len(vehicles), projection
+    )
+
+
+def client_version_etag(version: Any, projection: ClientProjection) -> str:
+    """La misma ETag, a partir de la fila de `ClientService.get_client_version_by_*`."""
+    mapping = version._mapping
+    return client_etag(
+        version.id, version.updated_at, mapping.get("vehicles_updated_at"), mapping.get("vehicles_count", 0), projection
+    )
+
+
+def vehicle_etag(vehicle_id: Any, updated_at: datetime) -> str:
+    return _etag("vehicle", vehicle_id, updated_at)
+
+
+def vehicle_etag_for(vehicle: Vehicle) -> str:
+    return vehicle_etag(vehicle.id, vehicle.updated_at)
+
+
+def _strip_coding(tag: str) -> str:
+    for suffix in CODING_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return f'{tag[:-len(suffix) - 1]}"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de `If-None-Match` (RFC 9110): ignora `W/` y el sufijo de compresión."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if _strip_coding(tag) == etag:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> dict:
+    # `no-cache`: los clientes pueden guardar la respuesta, pero deben revalidarla siempre.
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,12 @@
+import uuid
+from pydantic import BaseModel, Field
+
+from .eligibility_response import EligibilityResponse
+
+class IntakeResponse(BaseModel):
+    """
+    Modelo de respuesta para una admisión completa.
+    """
+    client_id: uuid.UUID = Field(description="El ID único (UUID) del cliente registrado.")
+    vehicle_id: uuid.UUID = Field(description="El ID único (UUID) del vehículo registrado.")
+    eligibility: EligibilityResponse = Field(description="El resultado de la evaluación de elegibilidad.")
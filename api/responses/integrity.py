@@ -0,0 +1,38 @@
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Equivalentes en SQLite (`DATABASE_URL` local), que informa el tipo en `sqlite_errorname`.
+SQLITE_CODES = {
+    "SQLITE_CONSTRAINT_UNIQUE": UNIQUE_VIOLATION,
+    "SQLITE_CONSTRAINT_FOREIGNKEY": FOREIGN_KEY_VIOLATION,
+}
+
+# Mensaje por restricción; las que no figuran usan el genérico de su tipo.
+CONSTRAINT_DETAILS = {
+    "ix_clients_documento": "Documento already registered to another client",
+    "ix_clients_email": "Email already registered to another client",
+    "ix_vehicles_license_plate": "License plate already registered",
+    "vehicles_client_id_fkey": "Client not found",
+}
+
+
+def constraint_name(error: IntegrityError) -> str | None:
+    """Restricción violada, tal como la informa asyncpg en la causa del error."""
+    return getattr(error.orig.__cause__, "constraint_name", None) or getattr(error.orig, "constraint_name", None)
+
+
+def integrity_http_error(error: IntegrityError) -> HTTPException:
+    """
+    Traduce un `IntegrityError` según su SQLSTATE: 409 si choca con un valor único ya registrado,
+    422 si referencia un registro inexistente (clave foránea) o viola otra restricción.
+    """
+    code = getattr(error.orig, "pgcode", None) or SQLITE_CODES.get(getattr(error.orig, "sqlite_errorname", None))
+    detail = CONSTRAINT_DETAILS.get(constraint_name(error))
+    if code == UNIQUE_VIOLATION:
+        return HTTPException(status_code=409, detail=detail or "Value already registered to another record")
+    if code == FOREIGN_KEY_VIOLATION:
+        return HTTPException(status_code=422, detail=detail or "Referenced record not found")
+    return HTTPException(status_code=422, detail=detail or "Integrity constraint violated")
@@ -0,0 +1,52 @@
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "true").lower() == "true"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON serializada por pydantic-core directamente a bytes. Acepta modelos, listas y
+    diccionarios con UUID, fechas y enums, sin pasar por `jsonable_encoder` ni por el `json` estándar.
+    """
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def model_response(response_type: Any, content: Any, status_code: int = 200, headers: Optional[dict] = None) -> Any:
+    """
+    Valida `content` (objetos ORM o modelos) contra `response_type` una sola vez y lo devuelve ya
+    serializado. Al devolver una `Response`, FastAPI no vuelve a validar contra el `response_model`
+    de la ruta, que queda solo para la documentación.
+
+    Con `FAST_JSON_ENABLED=false` devuelve `content` tal cual y FastAPI usa su camino habitual
+    (salvo que haya `headers`, que requieren armar la respuesta acá).
+    """
+    adapter = _adapter(response_type)
+    if not FAST_JSON_ENABLED:
+        if headers is None:
+            return content
+        return JSONResponse(adapter.dump_python(adapter.validate_python(content, from_attributes=True), mode="json"), status_code, headers)
+    return FastJSONResponse(adapter.dump_json(adapter.validate_python(content, from_attributes=True)), status_code, headers)
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> Any:
+    """Serializa `content`, ya armado con modelos de respuesta, sin volver a validarlo."""
+    if not FAST_JSON_ENABLED:
+        if headers is None:
+            return content
+        return JSONResponse(jsonable_encoder(content), status_code, headers)
+    return FastJSONResponse(content, status_code, headers)
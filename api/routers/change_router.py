@@ -0,0 +1,31 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_db
+from services.change_service import ChangeService
+from services.exceptions import ChangeFeedUnavailableError
+from responses.change_response import ChangesPageResponse
+from responses.json_response import json_response
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+def get_change_service(db: AsyncSession = Depends(get_db)) -> ChangeService:
+    return ChangeService(db)
+
+@router.get("", response_model=ChangesPageResponse)
+async def get_changes(
+    since: Optional[str] = Query(None, description="`next_cursor` de la consulta anterior; vacío para empezar desde el inicio."),
+    limit: int = Query(100, ge=1, le=1000, description="Cantidad máxima de cambios por página."),
+    service: ChangeService = Depends(get_change_service)
+):
+    """
+    Feed de clientes y vehículos creados, actualizados y eliminados desde `since`, en orden de confirmación.
+    Responde 503 si el rol de la base no tiene `pg_read_all_stats`.
+    """
+    try:
+        return json_response(await service.get_changes(since, limit))
+    except ChangeFeedUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -1,37 +1,127 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from services.client_service import ClientService
-from requests.client_request import ClientRequest
-from responses.client_response import ClientResponse
+from services.idempotency_service import IdempotencyService
+from services.exceptions import ClientIdentityMismatchError, IdempotencyKeyReuseError, StaleRecordError
+from requests.client_request import ClientRequest, ClientPatchRequest, ClientProjection
+from responses.client_response import ClientResponse, render_client
+from responses.integrity import integrity_http_error
+from responses.etag import client_etag_for, client_version_etag, etag_headers, etag_matches, not_modified
+from responses.json_response import json_response, model_response
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
 def get_client_service(db: AsyncSession = Depends(get_db)) -> ClientService:
     return ClientService(db)
 
+def get_client_projection(
+    fields: Optional[str] = Query(
+        None, description="Campos a devolver separados por coma (ej: `name,email`). El id siempre se incluye."
+    ),
+    include: Optional[str] = Query(None, description="Relaciones a incluir: `vehicles`."),
+) -> ClientProjection:
+    try:
+        return ClientProjection.from_query(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def get_idempotency_service(db: AsyncSession = Depends(get_db)) -> IdempotencyService:
+    return IdempotencyService(db)
+
 @router.post("/", response_model=ClientResponse, status_code=201)
 async def create_client(
     client_data: ClientRequest,
     service: ClientService = Depends(get_client_service)
 ):
-    return await service.create_client(client_data)
+    return model_response(ClientResponse, await service.create_client(client_data), status_code=201)
+
+@router.put("/upsert", response_model=ClientResponse)
+async def upsert_client(
+    client_data: ClientRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    service: ClientService = Depends(get_client_service),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+):
+    """
+    Crea el cliente o actualiza el existente con el mismo documento. Responde 409 si ese cliente
+    tiene otro correo y otro teléfono: sus datos solo cambian con un PUT o PATCH por id.
+    Con `Idempotency-Key`, un reintento de la misma petición devuelve la respuesta original; la
+    clave se guarda en la misma transacción que el cliente.
+    """
+    request_hash = idempotency.request_hash(client_data.model_dump(mode="json"))
+    if idempotency_key:
+        try:
+            stored = await idempotency.get_response(idempotency_key, "clients.upsert", request_hash)
+        except IdempotencyKeyReuseError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if stored is not None:
+            return stored
+
+    try:
+        client = await service.upsert_client(client_data, commit=not idempotency_key)
+        response = ClientResponse.model_validate(client)
+        if idempotency_key:
+            await idempotency.save_response(
+                idempotency_key, "clients.upsert", request_hash, 200, response.model_dump(mode="json")
+            )
+    except ClientIdentityMismatchError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError as e:
+        raise integrity_http_error(e)
+    return json_response(response)
+
+# Las lecturas admiten respuestas parciales (`?fields=`, `?include=`), por lo que no se valida
+# contra `ClientResponse`; se documenta como la forma completa.
+# Con `If-None-Match`, primero se consulta solo la versión del cliente: si la ETag coincide se
+# responde 304 sin cargar la fila ni los vehículos.
+@router.get("/by-documento/{documento}", response_model=None, responses={200: {"model": ClientResponse}, 304: {}})
+async def get_client_by_documento(
+    documento: str,
+    projection: ClientProjection = Depends(get_client_projection),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    service: ClientService = Depends(get_client_service)
+):
+    if if_none_match:
+        version = await service.get_client_version_by_documento(documento, projection.include_vehicles)
+        if version is not None:
+            etag = client_version_etag(version, projection)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    client = await service.get_client_by_documento(documento, projection.fields, projection.include_vehicles)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return json_response(render_client(client, projection), headers=etag_headers(client_etag_for(client, projection)))
 
-@router.get("/{client_id}", response_model=ClientResponse)
+@router.get("/{client_id}", response_model=None, responses={200: {"model": ClientResponse}, 304: {}})
 async def get_client(
-    client_id: UUID, service: ClientService = Depends(get_client_service)
+    client_id: UUID,
+    projection: ClientProjection = Depends(get_client_projection),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    service: ClientService = Depends(get_client_service)
 ):
-    client = await service.get_client_by_id(client_id)
+    if if_none_match:
+        version = await service.get_client_version_by_id(client_id, projection.include_vehicles)
+        if version is not None:
+            etag = client_version_etag(version, projection)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    client = await service.get_client_by_id(client_id, projection.fields, projection.include_vehicles)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
-    return client
+    return json_response(render_client(client, projection), headers=etag_headers(client_etag_for(client, projection)))
 
-@router.get("/", response_model=List[ClientResponse])
-async def get_all_clients(service: ClientService = Depends(get_client_service)):
-    return await service.get_all_clients()
+@router.get("/", response_model=None, responses={200: {"model": List[ClientResponse]}})
+async def get_all_clients(
+    projection: ClientProjection = Depends(get_client_projection),
+    service: ClientService = Depends(get_client_service)
+):
+    clients = await service.get_all_clients(projection.fields, projection.include_vehicles)
+    return json_response([render_client(client, projection) for client in clients])
 
 @router.put("/{client_id}", response_model=ClientResponse)
 async def update_client(
@@ -39,10 +129,33 @@ async def update_client(
     client_data: ClientRequest,
     service: ClientService = Depends(get_client_service),
 ):
-    updated = await service.update_client(client_id, client_data)
+    try:
+        updated = await service.update_client(client_id, client_data)
+    except IntegrityError as e:
+        raise integrity_http_error(e)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return model_response(ClientResponse, updated)
+
+@router.patch("/{client_id}", response_model=ClientResponse)
+async def patch_client(
+    client_id: UUID,
+    patch_data: ClientPatchRequest,
+    service: ClientService = Depends(get_client_service),
+):
+    """
+    Actualiza parcialmente un cliente. Con `expected_updated_at` responde 409 si el registro cambió.
+    Un valor único ya usado por otro registro responde 409; una referencia inexistente, 422.
+    """
+    try:
+        updated = await service.patch_client(client_id, patch_data)
+    except StaleRecordError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError as e:
+        raise integrity_http_error(e)
     if not updated:
         raise HTTPException(status_code=404, detail="Client not found")
-    return updated
+    return model_response(ClientResponse, updated)
 
 @router.delete("/{client_id}", status_code=204)
 async def delete_client(
@@ -1,10 +1,12 @@
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from services.eligibility_service import EligibilityService
-from responses.eligibility_response import EligibilityResponse
+from responses.eligibility_response import EligibilityResponse, EligiblePairsPageResponse
+from responses.json_response import json_response
 
 router = APIRouter(prefix="/eligibility", tags=["Eligibility"])
 
@@ -20,4 +22,15 @@ async def check_eligibility(
     """
     Evalúa si un cliente y su vehículo son elegibles según las reglas de negocio.
     """
-    return await service.check_eligibility(client_id, vehicle_id)
\ No newline at end of file
+    return json_response(await service.check_eligibility(client_id, vehicle_id))
+
+@router.get("/eligible", response_model=EligiblePairsPageResponse)
+async def get_eligible_pairs(
+    after: Optional[UUID] = Query(None, description="`next_cursor` de la página anterior."),
+    limit: int = Query(100, ge=1, le=500, description="Cantidad máxima de pares por página."),
+    service: EligibilityService = Depends(get_eligibility_service)
+):
+    """
+    Lista los pares cliente/vehículo elegibles, evaluando las reglas en la base de datos.
+    """
+    return json_response(await service.get_eligible_pairs(after, limit))
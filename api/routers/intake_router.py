@@ -0,0 +1,54 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_db
+from services.intake_service import IntakeService
+from services.idempotency_service import IdempotencyService
+from services.exceptions import ClientIdentityMismatchError, IdempotencyKeyReuseError, VehicleOwnerMismatchError
+from requests.intake_request import IntakeRequest
+from responses.intake_response import IntakeResponse
+from responses.integrity import integrity_http_error
+from responses.json_response import json_response
+
+router = APIRouter(prefix="/intake", tags=["Intake"])
+
+def get_intake_service(db: AsyncSession = Depends(get_db)) -> IntakeService:
+    return IntakeService(db)
+
+def get_idempotency_service(db: AsyncSession = Depends(get_db)) -> IdempotencyService:
+    return IdempotencyService(db)
+
+@router.post("", response_model=IntakeResponse)
+async def intake(
+    intake_data: IntakeRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    service: IntakeService = Depends(get_intake_service),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+):
+    """
+    Crea o actualiza el cliente (por documento) y el vehículo (por patente) y evalúa su
+    elegibilidad, todo en una transacción y un único viaje de ida y vuelta. Responde 409 si el
+    documento es de un cliente con otro correo y otro teléfono, o la patente es de otro cliente.
+    Con `Idempotency-Key`, un reintento de la misma petición devuelve la respuesta original; la
+    clave se guarda en la misma transacción que los registros.
+    """
+    request_hash = idempotency.request_hash(intake_data.model_dump(mode="json"))
+    if idempotency_key:
+        try:
+            stored = await idempotency.get_response(idempotency_key, "intake", request_hash)
+        except IdempotencyKeyReuseError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if stored is not None:
+            return stored
+
+    try:
+        response = await service.intake(intake_data, commit=not idempotency_key)
+        if idempotency_key:
+            await idempotency.save_response(idempotency_key, "intake", request_hash, 200, response.model_dump(mode="json"))
+    except (ClientIdentityMismatchError, VehicleOwnerMismatchError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError as e:
+        raise integrity_http_error(e)
+    return json_response(response)
@@ -1,11 +1,17 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from services.vehicle_service import VehicleService
-from requests.vehicle_request import VehicleRequest
+from services.idempotency_service import IdempotencyService
+from services.exceptions import IdempotencyKeyReuseError, StaleRecordError, VehicleOwnerMismatchError
+from requests.vehicle_request import VehicleRequest, VehiclePatchRequest, VehiclePlatesRequest
+from responses.integrity import integrity_http_error
+from responses.etag import etag_headers, etag_matches, not_modified, vehicle_etag, vehicle_etag_for
+from responses.json_response import json_response, model_response
 from responses.vehicle_response import VehicleResponse
 
 router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
@@ -13,24 +19,116 @@ router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
 def get_vehicle_service(db: AsyncSession = Depends(get_db)) -> VehicleService:
     return VehicleService(db)
 
+def get_idempotency_service(db: AsyncSession = Depends(get_db)) -> IdempotencyService:
+    return IdempotencyService(db)
+
 @router.post("/", response_model=VehicleResponse, status_code=201)
 async def create_vehicle(
     vehicle_data: VehicleRequest,
     service: VehicleService = Depends(get_vehicle_service)
 ):
-    return await service.create_vehicle(vehicle_data)
+    return model_response(VehicleResponse, await service.create_vehicle(vehicle_data), status_code=201)
+
+@router.put("/upsert", response_model=VehicleResponse)
+async def upsert_vehicle(
+    vehicle_data: VehicleRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    service: VehicleService = Depends(get_vehicle_service),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+):
+    """
+    Crea el vehículo o actualiza el existente con la misma patente. Responde 409 si esa patente
+    está registrada a nombre de otro cliente: el propietario solo cambia con un PATCH explícito.
+    Con `Idempotency-Key`, un reintento de la misma petición devuelve la respuesta original; la
+    clave se guarda en la misma transacción que el vehículo.
+    """
+    request_hash = idempotency.request_hash(vehicle_data.model_dump(mode="json"))
+    if idempotency_key:
+        try:
+            stored = await idempotency.get_response(idempotency_key, "vehicles.upsert", request_hash)
+        except IdempotencyKeyReuseError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if stored is not None:
+            return stored
+
+    try:
+        vehicle = await service.upsert_vehicle(vehicle_data, commit=not idempotency_key)
+        response = VehicleResponse.model_validate(vehicle)
+        if idempotency_key:
+            await idempotency.save_response(
+                idempotency_key, "vehicles.upsert", request_hash, 200, response.model_dump(mode="json")
+            )
+    except VehicleOwnerMismatchError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError as e:
+        raise integrity_http_error(e)
+    return json_response(response)
 
-@router.get("/{vehicle_id}", response_model=VehicleResponse)
+# Con `If-None-Match`, primero se consulta solo la versión del vehículo: si la ETag coincide se
+# responde 304 sin cargar la fila.
+@router.get("/by-plate/{license_plate}", response_model=VehicleResponse, responses={304: {}})
+async def get_vehicle_by_license_plate(
+    license_plate: str,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    service: VehicleService = Depends(get_vehicle_service)
+):
+    if if_none_match:
+        version = await service.get_vehicle_version_by_license_plate(license_plate)
+        if version is not None:
+            etag = vehicle_etag(version.id, version.updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    vehicle = await service.get_vehicle_by_license_plate(license_plate)
+    if not vehicle:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return model_response(VehicleResponse, vehicle, headers=etag_headers(vehicle_etag_for(vehicle)))
+
+@router.post("/by-plate", response_model=List[VehicleResponse])
+async def get_vehicles_by_license_plates(
+    plates_data: VehiclePlatesRequest,
+    service: VehicleService = Depends(get_vehicle_service)
+):
+    return model_response(List[VehicleResponse], await service.get_vehicles_by_license_plates(plates_data.license_plates))
+
+@router.get("/{vehicle_id}", response_model=VehicleResponse, responses={304: {}})
 async def get_vehicle(
-    vehicle_id: UUID, service: VehicleService = Depends(get_vehicle_service)
+    vehicle_id: UUID,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    service: VehicleService = Depends(get_vehicle_service)
 ):
+    if if_none_match:
+        version = await service.get_vehicle_version_by_id(vehicle_id)
+        if version is not None:
+            etag = vehicle_etag(version.id, version.updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
     vehicle = await service.get_vehicle_by_id(vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
-    return vehicle
+    return model_response(VehicleResponse, vehicle, headers=etag_headers(vehicle_etag_for(vehicle)))
 
 @router.get("/client/{client_id}", response_model=List[VehicleResponse])
 async def get_client_vehicles(
     client_id: UUID, service: VehicleService = Depends(get_vehicle_service)
 ):
-    return await service.get_vehicles_for_client(client_id)
\ No newline at end of file
+    return model_response(List[VehicleResponse], await service.get_vehicles_for_client(client_id))
+
+@router.patch("/{vehicle_id}", response_model=VehicleResponse)
+async def patch_vehicle(
+    vehicle_id: UUID,
+    patch_data: VehiclePatchRequest,
+    service: VehicleService = Depends(get_vehicle_service),
+):
+    """
+    Actualiza parcialmente un vehículo. Con `expected_updated_at` responde 409 si el registro cambió.
+    Un valor único ya usado por otro registro responde 409; una referencia inexistente, 422.
+    """
+    try:
+        updated = await service.patch_vehicle(vehicle_id, patch_data)
+    except StaleRecordError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError as e:
+        raise integrity_http_error(e)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return model_response(VehicleResponse, updated)
@@ -0,0 +1,142 @@
+import base64
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+
+from entities.client_entity import Client
+from entities.tombstone_entity import Tombstone
+from entities.vehicle_entity import Vehicle
+from requests.client_request import ClientProjection
+from responses.change_response import ChangeResponse, ChangesPageResponse
+from responses.client_response import render_client
+from responses.vehicle_response import VehicleResponse
+from services.exceptions import ChangeFeedUnavailableError
+
+# Tablas del feed; el nombre también desempata los cambios con el mismo `updated_at`.
+FEED_SOURCES = (("client", Client), ("tombstone", Tombstone), ("vehicle", Vehicle))
+
+# `updated_at` toma now(), el inicio de la transacción que escribe. Una transacción aún abierta
+# solo puede confirmar filas con `updated_at` mayor o igual a su inicio, así que todo lo anterior
+# al inicio de la transacción abierta más antigua ya es definitivo y el cursor nunca lo saltea.
+#
+# `pg_stat_activity` muestra `xact_start` de las sesiones de otros roles solo con el rol
+# `pg_read_all_stats` (o superusuario); sin él aparecen en NULL y el horizonte pasaría por encima
+# de sus transacciones abiertas. Por eso la consulta también informa si el rol lo tiene.
+HORIZON_SQL = text("""
+    SELECT pg_has_role('pg_read_all_stats', 'USAGE') AS can_read_stats,
+           now()::timestamp AS now,
+           oldest.xact_start::timestamp AS oldest_xact_start,
+           oldest.pid,
+           oldest.state
+    FROM (SELECT 1) AS one
+    LEFT JOIN (
+        SELECT xact_start, pid, state
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND xact_start IS NOT NULL AND pid <> pg_backend_pid()
+        ORDER BY xact_start
+        LIMIT 1
+    ) AS oldest ON true
+""")
+
+# Una transacción abierta detiene el feed en su inicio hasta que termine (por ejemplo, una sesión
+# "idle in transaction"). Pasado este retraso se advierte en el log con el pid que lo provoca.
+CHANGE_FEED_STALL_WARNING_SECONDS = float(os.getenv("CHANGE_FEED_STALL_WARNING_SECONDS", "60"))
+
+logger = logging.getLogger('vic-api')
+
+Position = Tuple[datetime, str, UUID]
+
+class ChangeService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    @staticmethod
+    def encode_cursor(position: Position) -> str:
+        changed_at, source, record_id = position
+        raw = json.dumps([changed_at.isoformat(), source, str(record_id)])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Position:
+        """Lanza ValueError si el cursor no es uno emitido por el feed."""
+        try:
+            changed_at, source, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(changed_at), source, UUID(record_id)
+        except Exception as e:
+            raise ValueError(f"Cursor inválido: {cursor}") from e
+
+    async def get_changes(self, since: Optional[str] = None, limit: int = 100) -> ChangesPageResponse:
+        """
+        Devuelve los cambios posteriores a `since` en orden (updated_at, tabla, id), usando los
+        índices (updated_at, id) de cada tabla. Cada registro aparece con su estado más reciente.
+        """
+        position = self.decode_cursor(since) if since else None
+        horizon = await self._horizon()
+
+        rows: List[Tuple[datetime, str, UUID, Any]] = []
+        for source, entity in FEED_SOURCES:
+            query = select(entity).where(entity.updated_at < horizon)
+            if position is not None:
+                changed_at, cursor_source, cursor_id = position
+                if source > cursor_source:
+                    query = query.where(entity.updated_at >= changed_at)
+                elif source == cursor_source:
+                    query = query.where(tuple_(entity.updated_at, entity.id) > tuple_(changed_at, cursor_id))
+                else:
+                    query = query.where(entity.updated_at > changed_at)
+            if entity is Client:
+                query = query.options(noload(Client.vehicles))
+            query = query.order_by(entity.updated_at, entity.id).limit(limit + 1)
+
+            result = await self.db_session.execute(query)
+            rows.extend((record.updated_at, source, record.id, record) for record in result.scalars())
+
+        rows.sort(key=lambda row: row[:3])
+        page = rows[:limit]
+        return ChangesPageResponse(
+            items=[self._to_change(source, record) for _, source, _, record in page],
+            next_cursor=self.encode_cursor(page[-1][:3]) if page else since,
+            has_more=len(rows) > limit,
+        )
+
+    async def _horizon(self) -> datetime:
+        """
+        Instante hasta el que los cambios ya son definitivos: el inicio de la transacción abierta más
+        antigua, o now() si no hay ninguna. Lanza `ChangeFeedUnavailableError` si el rol de la base
+        no puede ver las transacciones de los demás roles.
+        """
+        row = (await self.db_session.execute(HORIZON_SQL)).one()
+        if not row.can_read_stats:
+            raise ChangeFeedUnavailableError()
+        if row.oldest_xact_start is None:
+            return row.now
+        stalled = (row.now - row.oldest_xact_start).total_seconds()
+        if stalled > CHANGE_FEED_STALL_WARNING_SECONDS:
+            logger.warning(
+                f"Feed de cambios detenido hace {stalled:.0f}s por la transacción del pid {row.pid} ({row.state})."
+            )
+        return min(row.now, row.oldest_xact_start)
+
+    @staticmethod
+    def _to_change(source: str, record: Any) -> ChangeResponse:
+        if source == "tombstone":
+            return ChangeResponse(
+                entity_type=record.entity_type, operation="deleted", id=record.entity_id, changed_at=record.updated_at
+            )
+        if source == "client":
+            data = render_client(record, ClientProjection(include_vehicles=False))
+        else:
+            data = VehicleResponse.model_validate(record).model_dump()
+        return ChangeResponse(
+            entity_type=source,
+            operation="created" if record.created_at == record.updated_at else "updated",
+            id=record.id,
+            changed_at=record.updated_at,
+            data=data,
+        )
@@ -1,60 +1,185 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from database import read_only
 from entities.client_entity import Client
-from requests.client_request import ClientRequest
+from entities.tombstone_entity import Tombstone
+from entities.vehicle_entity import Vehicle
+from requests.client_request import ClientRequest, ClientPatchRequest
+from services.exceptions import ClientIdentityMismatchError, StaleRecordError
+from services.write_batcher import CREATE_CLIENT, UPSERT_CLIENT, write_batcher
 
 class ClientService:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create_client(self, client_data: ClientRequest) -> Optional[Client]:
+        if write_batcher.enabled:
+            return await write_batcher.submit(CREATE_CLIENT, client_data.model_dump())
+
         new_client = Client(**client_data.model_dump())
         self.db_session.add(new_client)
         await self.db_session.commit()
         await self.db_session.refresh(new_client)
-        
-        result = await self.db_session.execute(
-            select(Client).options(selectinload(Client.vehicles)).filter_by(id=new_client.id)
+        # Un cliente recién creado no tiene vehículos: no hace falta volver a consultarlos.
+        set_committed_value(new_client, "vehicles", [])
+        return new_client
+
+    def _select_clients(self, fields: Optional[Sequence[str]] = None, include_vehicles: bool = True):
+        """
+        Consulta de clientes proyectada: solo las columnas de `fields` (más el id y `updated_at`,
+        que forma la ETag) y los vehículos únicamente si se piden.
+        """
+        query = select(Client)
+        if fields is not None:
+            query = query.options(load_only(Client.id, Client.updated_at, *(getattr(Client, field) for field in fields)))
+        if include_vehicles:
+            query = query.options(selectinload(Client.vehicles))
+        return query
+
+    async def upsert_client(
+        self, client_data: ClientRequest, include_vehicles: bool = True, commit: bool = True
+    ) -> Client:
+        """
+        Inserta el cliente o, si ya existe uno con el mismo documento, actualiza sus datos,
+        en una única sentencia INSERT ... ON CONFLICT (documento) DO UPDATE ... WHERE ... RETURNING.
+
+        Conocer el documento no alcanza para reemplazar los datos: el cliente existente solo se
+        actualiza si coincide su correo o su teléfono; si no, se lanza `ClientIdentityMismatchError`.
+
+        Con `commit=False` la sentencia queda en la transacción en curso, para confirmarla
+        junto con otras escrituras.
+        """
+        values = client_data.model_dump()
+        if write_batcher.enabled and commit:
+            return await write_batcher.submit(UPSERT_CLIENT, values)
+
+        statement = insert(Client).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Client.documento],
+            set_={
+                **{key: statement.excluded[key] for key in values if key != "documento"},
+                "updated_at": func.now(),
+            },
+            where=or_(Client.email == statement.excluded.email, Client.phone_number == statement.excluded.phone_number),
         )
-        created_client_with_relations = result.scalars().first()
-        return created_client_with_relations
+        query = select(Client).from_statement(statement.returning(Client))
+        if include_vehicles:
+            query = query.options(selectinload(Client.vehicles))
+        result = await self.db_session.execute(query, execution_options={"populate_existing": True})
+        client = result.scalars().first()
+        if client is None:
+            raise ClientIdentityMismatchError(values["documento"])
+        if commit:
+            await self.db_session.commit()
+        return client
 
-    async def get_client_by_id(self, client_id: UUID) -> Optional[Client]:
+    @read_only
+    async def get_client_by_id(
+        self, client_id: UUID, fields: Optional[Sequence[str]] = None, include_vehicles: bool = True
+    ) -> Optional[Client]:
         result = await self.db_session.execute(
-            select(Client).options(selectinload(Client.vehicles)).filter_by(id=client_id)
+            self._select_clients(fields, include_vehicles).filter_by(id=client_id)
         )
         return result.scalars().first()
 
-    async def get_all_clients(self) -> List[Client]:
+    @read_only
+    async def get_client_by_documento(
+        self, documento: str, fields: Optional[Sequence[str]] = None, include_vehicles: bool = True
+    ) -> Optional[Client]:
         result = await self.db_session.execute(
-            select(Client).options(selectinload(Client.vehicles))
+            self._select_clients(fields, include_vehicles).filter_by(documento=documento)
+        )
+        return result.scalars().first()
+
+    def _select_version(self, include_vehicles: bool = True):
+        """
+        Solo lo que forma la ETag del cliente, sin cargar la fila completa: su `updated_at` y, con
+        vehículos, el último `updated_at` y la cantidad de ellos.
+        """
+        if not include_vehicles:
+            return select(Client.id, Client.updated_at)
+        return (
+            select(
+                Client.id,
+                Client.updated_at,
+                func.max(Vehicle.updated_at).label("vehicles_updated_at"),
+                func.count(Vehicle.id).label("vehicles_count"),
+            )
+            .outerjoin(Vehicle, Vehicle.client_id == Client.id)
+            .group_by(Client.id, Client.updated_at)
         )
+
+    @read_only
+    async def get_client_version_by_id(self, client_id: UUID, include_vehicles: bool = True) -> Optional[Row]:
+        result = await self.db_session.execute(self._select_version(include_vehicles).where(Client.id == client_id))
+        return result.first()
+
+    @read_only
+    async def get_client_version_by_documento(self, documento: str, include_vehicles: bool = True) -> Optional[Row]:
+        result = await self.db_session.execute(self._select_version(include_vehicles).where(Client.documento == documento))
+        return result.first()
+
+    @read_only
+    async def get_all_clients(
+        self, fields: Optional[Sequence[str]] = None, include_vehicles: bool = True
+    ) -> List[Client]:
+        result = await self.db_session.execute(self._select_clients(fields, include_vehicles))
         return list(result.scalars().all())
 
     async def update_client(self, client_id: UUID, update_data: ClientRequest) -> Optional[Client]:
-        client = await self.get_client_by_id(client_id)
-        if not client:
-            return None
-        
-        for key, value in update_data.model_dump(exclude_unset=True).items():
-            setattr(client, key, value)
-            
+        """
+        Reemplaza los datos del cliente con un único UPDATE ... RETURNING, sin leerlo antes.
+        """
+        statement = update(Client).where(Client.id == client_id).values(**update_data.model_dump(exclude_unset=True))
+        result = await self.db_session.execute(
+            select(Client).from_statement(statement.returning(Client)).options(selectinload(Client.vehicles)),
+            execution_options={"populate_existing": True},
+        )
+        client = result.scalars().first()
         await self.db_session.commit()
-        await self.db_session.refresh(client)
-        
+        return client
+
+    async def patch_client(self, client_id: UUID, patch_data: ClientPatchRequest) -> Optional[Client]:
+        """
+        Actualiza solo los campos enviados con un único UPDATE ... RETURNING; un campo enviado en
+        null se borra (la petición ya rechaza los nulls en columnas obligatorias).
+
+        Si se indica `expected_updated_at` y el registro cambió desde entonces, lanza `StaleRecordError`.
+        """
+        changes = patch_data.model_dump(exclude_unset=True, exclude={"expected_updated_at"})
+        if not changes:
+            return await self.get_client_by_id(client_id)
+
+        statement = update(Client).where(Client.id == client_id).values(**changes)
+        if patch_data.expected_updated_at is not None:
+            statement = statement.where(Client.updated_at == patch_data.expected_updated_at)
         result = await self.db_session.execute(
-            select(Client).options(selectinload(Client.vehicles)).filter_by(id=client.id)
+            select(Client).from_statement(statement.returning(Client)).options(selectinload(Client.vehicles)),
+            execution_options={"populate_existing": True},
         )
-        return result.scalars().first()
+        client = result.scalars().first()
+        await self.db_session.commit()
 
+        if client is None and patch_data.expected_updated_at is not None:
+            exists = await self.db_session.scalar(select(Client.id).filter_by(id=client_id))
+            if exists:
+                raise StaleRecordError(client_id, patch_data.expected_updated_at)
+        return client
 
     async def delete_client(self, client_id: UUID) -> bool:
         client = await self.get_client_by_id(client_id)
         if client:
+            # Los vehículos se borran en cascada: todos dejan su lápida para el feed de cambios.
+            self.db_session.add(Tombstone(entity_type="client", entity_id=client.id))
+            for vehicle in client.vehicles:
+                self.db_session.add(Tombstone(entity_type="vehicle", entity_id=vehicle.id))
             await self.db_session.delete(client)
             await self.db_session.commit()
             return True
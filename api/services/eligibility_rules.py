@@ -0,0 +1,55 @@
+"""
+Umbrales de las reglas de elegibilidad.
+
+Los usan tanto la evaluación de un par cliente/vehículo (`EligibilityService.check_eligibility`)
+como el listado en SQL (`EligibilityService.get_eligible_pairs`), para que no puedan divergir.
+Los umbrales de vehículo además definen el índice parcial `ix_vehicles_eligible_id`: cambiarlos
+requiere una migración que lo recree con los valores nuevos.
+"""
+from datetime import date
+
+from sqlalchemy import ColumnElement, Index, Integer, and_, extract, func, literal
+
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+
+MIN_CLIENT_AGE = 18
+MIN_VEHICLE_YEAR = 2015
+MAX_VEHICLE_MILEAGE = 100_000  # Exclusivo: el kilometraje debe ser menor.
+
+def client_age(birth_date: date, today: date) -> int:
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+def client_age_sql() -> ColumnElement[int]:
+    """Edad del cliente calculada en la base a partir de `birth_date`."""
+    return extract("year", func.age(func.current_date(), Client.birth_date)).cast(Integer)
+
+def eligible_vehicle_sql(inline: bool = True) -> ColumnElement[bool]:
+    """
+    Reglas de elegibilidad del vehículo. Con `inline` los umbrales van como literales en el SQL:
+    el planificador solo usa el índice parcial si ve que la consulta implica su predicado, y con
+    parámetros no puede comprobarlo en un plan genérico.
+    """
+    if not inline:
+        return and_(Vehicle.year >= MIN_VEHICLE_YEAR, Vehicle.mileage < MAX_VEHICLE_MILEAGE)
+    return and_(
+        Vehicle.year >= literal(MIN_VEHICLE_YEAR, literal_execute=True),
+        Vehicle.mileage < literal(MAX_VEHICLE_MILEAGE, literal_execute=True),
+    )
+
+# Vehículos elegibles en orden de id, que es el orden en que pagina `get_eligible_pairs`.
+ELIGIBLE_VEHICLES_INDEX = Index(
+    "ix_vehicles_eligible_id", Vehicle.id, postgresql_where=eligible_vehicle_sql(inline=False)
+)
+
+def eligible_pair_sql() -> ColumnElement[bool]:
+    """
+    Condición de elegibilidad para un cliente y su vehículo, evaluada en la base.
+
+    La edad se compara como `birth_date <= current_date - MIN_CLIENT_AGE años`, equivalente a
+    `client_age >= MIN_CLIENT_AGE` pero sin aplicar funciones sobre la columna.
+    """
+    return and_(
+        Client.birth_date <= func.current_date() - func.make_interval(MIN_CLIENT_AGE),
+        eligible_vehicle_sql(),
+    )
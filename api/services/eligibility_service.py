@@ -1,10 +1,23 @@
+from typing import Optional
 from uuid import UUID
 from datetime import date
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database import read_only
 from .client_service import ClientService
 from .vehicle_service import VehicleService
-from responses.eligibility_response import EligibilityResponse
+from .eligibility_rules import (
+    MAX_VEHICLE_MILEAGE,
+    MIN_CLIENT_AGE,
+    MIN_VEHICLE_YEAR,
+    client_age,
+    client_age_sql,
+    eligible_pair_sql,
+)
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+from responses.eligibility_response import EligibilityResponse, EligiblePairResponse, EligiblePairsPageResponse
 
 class EligibilityService:
     def __init__(self, db_session: AsyncSession):
@@ -12,16 +25,19 @@ class EligibilityService:
         self.client_service = ClientService(db_session)
         self.vehicle_service = VehicleService(db_session)
 
+    @read_only
     async def check_eligibility(self, client_id: UUID, vehicle_id: UUID) -> EligibilityResponse:
         """
         Realiza la evaluación de elegibilidad para un cliente y su vehículo.
 
-        Reglas:
+        Reglas (umbrales en `eligibility_rules`):
         - Cliente debe ser mayor de 18 años.
         - El año del vehículo debe ser 2015 o más reciente.
         - El kilometraje del vehículo debe ser menor a 100,000 km.
         """
-        client = await self.client_service.get_client_by_id(client_id)
+        client = await self.client_service.get_client_by_id(
+            client_id, fields=["name", "birth_date"], include_vehicles=False
+        )
         vehicle = await self.vehicle_service.get_vehicle_by_id(vehicle_id)
 
         if not client or not vehicle:
@@ -31,29 +47,35 @@ class EligibilityService:
                 reasons=["Cliente o vehículo no encontrado."]
             )
 
+        return self.evaluate(client, vehicle)
+
+    @staticmethod
+    def evaluate(client: Client, vehicle: Vehicle) -> EligibilityResponse:
+        """
+        Aplica las reglas de elegibilidad a un cliente y un vehículo ya cargados, sin consultar la base.
+        """
         reasons = []
         is_eligible = True
 
         # 1. Validación de Edad del Cliente (mayor de 18)
         if client.birth_date:
-            today = date.today()
-            age = today.year - client.birth_date.year - ((today.month, today.day) < (client.birth_date.month, client.birth_date.day))
-            if age < 18:
+            age = client_age(client.birth_date, date.today())
+            if age < MIN_CLIENT_AGE:
                 is_eligible = False
-                reasons.append(f"El cliente es menor de 18 años (edad actual: {age}).")
+                reasons.append(f"El cliente es menor de {MIN_CLIENT_AGE} años (edad actual: {age}).")
         else:
             is_eligible = False
             reasons.append("La fecha de nacimiento del cliente no está registrada.")
 
         # 2. Validación del Año del Vehículo (posterior a 2015)
-        if vehicle.year < 2015:
+        if vehicle.year < MIN_VEHICLE_YEAR:
             is_eligible = False
-            reasons.append(f"El vehículo es del año {vehicle.year} (debe ser de 2015 o más nuevo).")
+            reasons.append(f"El vehículo es del año {vehicle.year} (debe ser de {MIN_VEHICLE_YEAR} o más nuevo).")
 
         # 3. Validación del Kilometraje (menor a 100k)
-        if vehicle.mileage >= 100000:
+        if vehicle.mileage >= MAX_VEHICLE_MILEAGE:
             is_eligible = False
-            reasons.append(f"El vehículo tiene {vehicle.mileage} km (el límite es 100,000 km).")
+            reasons.append(f"El vehículo tiene {vehicle.mileage} km (el límite es {MAX_VEHICLE_MILEAGE:,} km).")
         
         # Generar mensaje final
         if is_eligible:
@@ -65,4 +87,39 @@ class EligibilityService:
             is_eligible=is_eligible,
             message=message,
             reasons=reasons
-        )
\ No newline at end of file
+        )
+
+    @read_only
+    async def get_eligible_pairs(self, after: Optional[UUID] = None, limit: int = 100) -> EligiblePairsPageResponse:
+        """
+        Lista los pares cliente/vehículo elegibles evaluando las reglas en una única consulta SQL.
+
+        La paginación es por cursor: `after` es el `vehicle_id` del último par de la página anterior.
+        """
+        statement = (
+            select(
+                Client.id.label("client_id"),
+                Client.name,
+                Client.last_name,
+                Client.documento,
+                Client.email,
+                client_age_sql().label("age"),
+                Vehicle.id.label("vehicle_id"),
+                Vehicle.license_plate,
+                Vehicle.brand,
+                Vehicle.model,
+                Vehicle.year,
+                Vehicle.mileage,
+            )
+            .join(Vehicle.client)
+            .where(eligible_pair_sql())
+            .order_by(Vehicle.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            statement = statement.where(Vehicle.id > after)
+
+        rows = (await self.db_session.execute(statement)).mappings().all()
+        items = [EligiblePairResponse(**row) for row in rows[:limit]]
+        next_cursor = items[-1].vehicle_id if len(rows) > limit else None
+        return EligiblePairsPageResponse(items=items, next_cursor=next_cursor)
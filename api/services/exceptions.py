@@ -0,0 +1,48 @@
+class StaleRecordError(Exception):
+    """
+    El registro fue modificado por otra petición desde la versión (`updated_at`) que conocía el cliente.
+    """
+    def __init__(self, record_id, expected_updated_at):
+        self.record_id = record_id
+        self.expected_updated_at = expected_updated_at
+        super().__init__(f"El registro {record_id} fue modificado después de {expected_updated_at}.")
+
+
+class IdempotencyKeyReuseError(Exception):
+    """
+    La `Idempotency-Key` ya se usó con una petición distinta (otro endpoint u otro cuerpo).
+    """
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"La clave de idempotencia '{key}' ya se usó con una petición distinta.")
+
+
+class VehicleOwnerMismatchError(Exception):
+    """
+    Ya existe un vehículo con esa patente registrado a nombre de otro cliente: un upsert no cambia su propietario.
+    """
+    def __init__(self, license_plate: str):
+        self.license_plate = license_plate
+        super().__init__(f"El vehículo con patente '{license_plate}' pertenece a otro cliente.")
+
+
+class ClientIdentityMismatchError(Exception):
+    """
+    Ya existe un cliente con ese documento y ni su correo ni su teléfono coinciden con los enviados:
+    un upsert no reemplaza los datos de otra persona que conozca el documento.
+    """
+    def __init__(self, documento: str):
+        self.documento = documento
+        super().__init__(f"Ya existe un cliente con el documento '{documento}' y otros datos de contacto.")
+
+
+class ChangeFeedUnavailableError(Exception):
+    """
+    El rol de la base no ve las transacciones abiertas de otras sesiones en `pg_stat_activity`:
+    el feed no puede calcular hasta dónde es seguro avanzar el cursor.
+    """
+    def __init__(self):
+        super().__init__(
+            "El rol de la base necesita pg_read_all_stats para ver las transacciones abiertas de "
+            "otras sesiones (GRANT pg_read_all_stats TO <rol>)."
+        )
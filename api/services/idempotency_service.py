@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from database import AsyncSessionLocal
+from entities.idempotency_entity import IdempotencyKey
+from services.exceptions import IdempotencyKeyReuseError
+
+logger = logging.getLogger('vic-api')
+
+IDEMPOTENCY_KEY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+IDEMPOTENCY_PURGE_INTERVAL_SECONDS = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))
+
+class IdempotencyService:
+    """
+    Guarda la respuesta de las escrituras hechas con `Idempotency-Key` para devolverla
+    tal cual si el cliente reintenta la misma petición.
+
+    La clave se guarda en la misma transacción que la escritura: o se confirman las dos o ninguna.
+    Las claves se conservan `IDEMPOTENCY_KEY_TTL_HOURS` y luego las borra `purge_expired_keys`.
+    """
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    @staticmethod
+    def request_hash(payload: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def get_response(self, key: str, scope: str, request_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve la respuesta guardada para la clave, o None si es la primera vez que se usa.
+
+        Lanza `IdempotencyKeyReuseError` si la clave se usó con otro endpoint u otro cuerpo.
+        """
+        record = await self.db_session.get(IdempotencyKey, key)
+        if record is None:
+            return None
+        if record.scope != scope or record.request_hash != request_hash:
+            raise IdempotencyKeyReuseError(key)
+        return record.response_body
+
+    async def save_response(self, key: str, scope: str, request_hash: str, status_code: int, body: Dict[str, Any]):
+        """
+        Guarda la respuesta y confirma la transacción en curso, que debe contener la escritura
+        (hecha con `commit=False`) cuya respuesta se guarda.
+        """
+        # Dos reintentos simultáneos con la misma clave ejecutan la misma escritura idempotente:
+        # se conserva la primera respuesta guardada.
+        await self.db_session.execute(
+            insert(IdempotencyKey)
+            .values(key=key, scope=scope, request_hash=request_hash, status_code=status_code, response_body=body)
+            .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+        )
+        await self.db_session.commit()
+
+    async def purge_expired(self, ttl_hours: float = IDEMPOTENCY_KEY_TTL_HOURS) -> int:
+        """Borra las claves con más de `ttl_hours` y devuelve cuántas borró."""
+        # El corte se calcula en la base, con el mismo reloj que fijó `created_at`.
+        result = await self.db_session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.created_at < func.now() - timedelta(hours=ttl_hours))
+        )
+        await self.db_session.commit()
+        return result.rowcount
+
+
+async def purge_expired_keys(interval: float = IDEMPOTENCY_PURGE_INTERVAL_SECONDS):
+    """Tarea de fondo: purga periódicamente las claves de idempotencia vencidas."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                purged = await IdempotencyService(session).purge_expired()
+            if purged:
+                logger.info(f"Claves de idempotencia vencidas purgadas: {purged}.")
+        except Exception as e:
+            logger.warning(f"No se pudieron purgar las claves de idempotencia: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,32 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .client_service import ClientService
+from .vehicle_service import VehicleService
+from .eligibility_service import EligibilityService
+from requests.intake_request import IntakeRequest
+from requests.vehicle_request import VehicleRequest
+from responses.intake_response import IntakeResponse
+
+class IntakeService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.client_service = ClientService(db_session)
+        self.vehicle_service = VehicleService(db_session)
+
+    async def intake(self, intake_data: IntakeRequest, commit: bool = True) -> IntakeResponse:
+        """
+        Registra el cliente y su vehículo y evalúa la elegibilidad en una única transacción.
+
+        Ambos upserts usan RETURNING, por lo que la evaluación se hace sobre las filas
+        devueltas sin volver a consultarlas. Si alguna escritura falla, no se confirma ninguna.
+        Con `commit=False` la transacción queda abierta, para confirmarla junto con otras escrituras.
+        """
+        client = await self.client_service.upsert_client(intake_data.client, include_vehicles=False, commit=False)
+        vehicle = await self.vehicle_service.upsert_vehicle(
+            VehicleRequest(**intake_data.vehicle.model_dump(), client_id=client.id), commit=False
+        )
+        eligibility = EligibilityService.evaluate(client, vehicle)
+        if commit:
+            await self.db_session.commit()
+
+        return IntakeResponse(client_id=client.id, vehicle_id=vehicle.id, eligibility=eligibility)
@@ -1,30 +1,128 @@
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 
+from database import read_only
 from entities.vehicle_entity import Vehicle
-from requests.vehicle_request import VehicleRequest
+from requests.vehicle_request import VehicleRequest, VehiclePatchRequest, normalize_license_plate
+from services.exceptions import StaleRecordError, VehicleOwnerMismatchError
+from services.write_batcher import CREATE_VEHICLE, UPSERT_VEHICLE, write_batcher
 
 class VehicleService:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create_vehicle(self, vehicle_data: VehicleRequest) -> Vehicle:
+        if write_batcher.enabled:
+            return await write_batcher.submit(CREATE_VEHICLE, vehicle_data.model_dump())
+
         new_vehicle = Vehicle(**vehicle_data.model_dump())
         self.db_session.add(new_vehicle)
         await self.db_session.commit()
         await self.db_session.refresh(new_vehicle)
         return new_vehicle
 
+    async def upsert_vehicle(self, vehicle_data: VehicleRequest, commit: bool = True) -> Vehicle:
+        """
+        Inserta el vehículo o, si ya existe uno con la misma patente, actualiza sus datos con un único
+        INSERT ... ON CONFLICT (license_plate) DO UPDATE ... WHERE ... RETURNING.
+
+        El propietario nunca cambia por un upsert: si la patente está registrada a nombre de otro
+        cliente no se actualiza nada y se lanza `VehicleOwnerMismatchError`.
+        Con `commit=False` la sentencia queda en la transacción en curso.
+        """
+        values = vehicle_data.model_dump()
+        if write_batcher.enabled and commit:
+            return await write_batcher.submit(UPSERT_VEHICLE, values)
+
+        statement = insert(Vehicle).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Vehicle.license_plate],
+            set_={
+                **{key: statement.excluded[key] for key in values if key not in ("license_plate", "client_id")},
+                "updated_at": func.now(),
+            },
+            where=Vehicle.client_id == statement.excluded.client_id,
+        )
+        result = await self.db_session.execute(
+            statement.returning(Vehicle), execution_options={"populate_existing": True}
+        )
+        vehicle = result.scalars().first()
+        if vehicle is None:
+            raise VehicleOwnerMismatchError(values["license_plate"])
+        if commit:
+            await self.db_session.commit()
+        return vehicle
+
+    @read_only
     async def get_vehicle_by_id(self, vehicle_id: UUID) -> Optional[Vehicle]:
         result = await self.db_session.execute(
             select(Vehicle).filter_by(id=vehicle_id)
         )
         return result.scalars().first()
 
+    @read_only
+    async def get_vehicle_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
+        result = await self.db_session.execute(
+            select(Vehicle).filter_by(license_plate=normalize_license_plate(license_plate))
+        )
+        return result.scalars().first()
+
+    @read_only
+    async def get_vehicle_version_by_id(self, vehicle_id: UUID) -> Optional[Row]:
+        """Id y `updated_at` del vehículo, lo que forma su ETag, sin cargar la fila completa."""
+        result = await self.db_session.execute(select(Vehicle.id, Vehicle.updated_at).filter_by(id=vehicle_id))
+        return result.first()
+
+    @read_only
+    async def get_vehicle_version_by_license_plate(self, license_plate: str) -> Optional[Row]:
+        result = await self.db_session.execute(
+            select(Vehicle.id, Vehicle.updated_at).filter_by(license_plate=normalize_license_plate(license_plate))
+        )
+        return result.first()
+
+    @read_only
+    async def get_vehicles_by_license_plates(self, license_plates: List[str]) -> List[Vehicle]:
+        plates = {normalize_license_plate(plate) for plate in license_plates}
+        if not plates:
+            return []
+        result = await self.db_session.execute(
+            select(Vehicle).where(Vehicle.license_plate.in_(plates))
+        )
+        return list(result.scalars().all())
+
+    @read_only
     async def get_vehicles_for_client(self, client_id: UUID) -> List[Vehicle]:
         result = await self.db_session.execute(
-            select(Vehicle).filter_by(client_id=client_id)
+            select(Vehicle).filter_by(client_id=client_id).order_by(Vehicle.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def patch_vehicle(self, vehicle_id: UUID, patch_data: VehiclePatchRequest) -> Optional[Vehicle]:
+        """
+        Actualiza solo los campos enviados con un único UPDATE ... RETURNING. La petición ya
+        rechaza los null: todas las columnas del vehículo son obligatorias.
+
+        Si se indica `expected_updated_at` y el registro cambió desde entonces, lanza `StaleRecordError`.
+        """
+        changes = patch_data.model_dump(exclude_unset=True, exclude={"expected_updated_at"})
+        if not changes:
+            return await self.get_vehicle_by_id(vehicle_id)
+
+        statement = update(Vehicle).where(Vehicle.id == vehicle_id).values(**changes)
+        if patch_data.expected_updated_at is not None:
+            statement = statement.where(Vehicle.updated_at == patch_data.expected_updated_at)
+        result = await self.db_session.execute(
+            statement.returning(Vehicle), execution_options={"populate_existing": True}
         )
-        return list(result.scalars().all())
\ No newline at end of file
+        vehicle = result.scalars().first()
+        await self.db_session.commit()
+
+        if vehicle is None and patch_data.expected_updated_at is not None:
+            exists = await self.db_session.scalar(select(Vehicle.id).filter_by(id=vehicle_id))
+            if exists:
+                raise StaleRecordError(vehicle_id, patch_data.expected_updated_at)
+        return vehicle
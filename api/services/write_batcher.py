@@ -0,0 +1,266 @@
+import asyncio
+import contextvars
+import logging
+import os
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from database import AsyncSessionLocal
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+from services.exceptions import ClientIdentityMismatchError, VehicleOwnerMismatchError
+
+logger = logging.getLogger('vic-api')
+
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "false").lower() == "true"
+WRITE_BEHIND_MAX_DELAY_MS = int(os.getenv("WRITE_BEHIND_MAX_DELAY_MS", "10"))
+WRITE_BEHIND_MAX_ROWS = int(os.getenv("WRITE_BEHIND_MAX_ROWS", "100"))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "5000"))
+
+
+class BatchOperation:
+    """
+    Una escritura que se puede agrupar: INSERT simple o upsert sobre una columna única.
+
+    Las filas devueltas por RETURNING se asocian a cada llamador por `match_column`
+    (el id generado en los INSERT, la columna de conflicto en los upserts).
+    Con `owner_column`, el upsert no modifica esa columna y solo actualiza la fila existente si
+    coincide; con `identity_columns`, solo si coincide al menos una de ellas. Si no, la fila no
+    vuelve en RETURNING y el llamador recibe `mismatch_error(clave)`.
+    """
+    def __init__(
+        self,
+        name: str,
+        entity: type,
+        conflict_column: Optional[str] = None,
+        owner_column: Optional[str] = None,
+        identity_columns: Sequence[str] = (),
+        mismatch_error: Optional[Callable[[Any], Exception]] = None,
+    ):
+        self.name = name
+        self.entity = entity
+        self.conflict_column = conflict_column
+        self.owner_column = owner_column
+        self.identity_columns = identity_columns
+        self.mismatch_error = mismatch_error
+        self.match_column = conflict_column or "id"
+
+    def prepare(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        return values if self.conflict_column else {"id": uuid.uuid4(), **values}
+
+    def _guard(self, statement):
+        conditions = []
+        if self.owner_column:
+            conditions.append(getattr(self.entity, self.owner_column) == statement.excluded[self.owner_column])
+        if self.identity_columns:
+            conditions.append(or_(*(getattr(self.entity, column) == statement.excluded[column] for column in self.identity_columns)))
+        return and_(*conditions) if conditions else None
+
+    def statement(self, rows: List[Dict[str, Any]]):
+        statement = insert(self.entity).values(rows)
+        if self.conflict_column:
+            fixed = {self.conflict_column, self.owner_column}
+            statement = statement.on_conflict_do_update(
+                index_elements=[getattr(self.entity, self.conflict_column)],
+                set_={
+                    **{key: statement.excluded[key] for key in rows[0] if key not in fixed},
+                    "updated_at": func.now(),
+                },
+                where=self._guard(statement),
+            )
+        return select(self.entity).from_statement(statement.returning(self.entity))
+
+
+CREATE_CLIENT = BatchOperation("create_client", Client)
+UPSERT_CLIENT = BatchOperation(
+    "upsert_client", Client, conflict_column="documento",
+    identity_columns=("email", "phone_number"), mismatch_error=ClientIdentityMismatchError,
+)
+CREATE_VEHICLE = BatchOperation("create_vehicle", Vehicle)
+UPSERT_VEHICLE = BatchOperation(
+    "upsert_vehicle", Vehicle, conflict_column="license_plate",
+    owner_column="client_id", mismatch_error=VehicleOwnerMismatchError,
+)
+
+
+class PendingWrite:
+    def __init__(self, operation: BatchOperation, values: Dict[str, Any], future: asyncio.Future):
+        self.operation = operation
+        self.values = values
+        self.future = future
+
+    @property
+    def key(self) -> Any:
+        return self.values[self.operation.match_column]
+
+
+class WriteBatcher:
+    """
+    Agrupa las altas de varias peticiones en transacciones con INSERT de múltiples filas.
+
+    Cada llamador espera su propio future, que se resuelve recién después del COMMIT que
+    incluye su fila: la respuesta HTTP nunca confirma una escritura que no sea durable.
+    Se vacía cada `max_delay_ms` o al juntar `max_rows` filas, lo que ocurra primero.
+    Si una transacción agrupada falla (por ejemplo, por un documento duplicado), sus filas se
+    reintentan de a una para que el error le llegue solo a quien lo causó.
+    """
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        enabled: bool = WRITE_BEHIND_ENABLED,
+        max_delay_ms: int = WRITE_BEHIND_MAX_DELAY_MS,
+        max_rows: int = WRITE_BEHIND_MAX_ROWS,
+        max_pending: int = WRITE_BEHIND_MAX_PENDING,
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.max_delay = max_delay_ms / 1000
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.commits = 0
+        self.rows = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def submit(self, operation: BatchOperation, values: Dict[str, Any]) -> Any:
+        """Encola la escritura y devuelve la entidad persistida una vez confirmada."""
+        if self._closing:
+            raise RuntimeError("El agrupador de escrituras se está cerrando.")
+        if self._task is None:
+            # La cola acotada aplica contrapresión a los llamadores si la base no da abasto.
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            # Contexto vacío: la tarea no debe heredar el de la petición que la creó (métricas, etc.).
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(PendingWrite(operation, operation.prepare(values), future))
+        return await future
+
+    async def close(self):
+        """Deja de aceptar escrituras y espera a confirmar las pendientes."""
+        self._closing = True
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self.max_delay
+            stop = False
+            while len(batch) < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: List[PendingWrite]):
+        try:
+            async with self.session_factory() as session:
+                results = {}
+                for statement_writes in self._statements(batch):
+                    results.update(await self._execute(session, statement_writes))
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Lote de {len(batch)} escrituras rechazado ({e}); se reintentan de a una.")
+            for write in batch:
+                await self._flush_one(write)
+            return
+
+        self.commits += 1
+        self.rows += len(batch)
+        logger.debug(f"Lote de {len(batch)} escrituras confirmado en un único commit.")
+        for write in batch:
+            self._resolve(write, results)
+
+    async def _flush_one(self, write: PendingWrite):
+        try:
+            async with self.session_factory() as session:
+                results = await self._execute(session, [write])
+                await session.commit()
+            self.commits += 1
+            self.rows += 1
+            self._resolve(write, results)
+        except Exception as e:
+            if not write.future.done():
+                write.future.set_exception(e)
+
+    @staticmethod
+    def _resolve(write: PendingWrite, results: Dict[tuple, Any]):
+        if write.future.done():
+            return
+        record = results.get((write.operation.name, write.key))
+        if record is None:
+            # Upsert cuya guarda no coincidió con la fila existente: no se actualizó.
+            write.future.set_exception(write.operation.mismatch_error(write.key))
+        else:
+            write.future.set_result(record)
+
+    @staticmethod
+    def _statements(batch: Sequence[PendingWrite]) -> List[List[PendingWrite]]:
+        """
+        Agrupa por operación. En los upserts, una clave repetida pasa a una sentencia posterior:
+        ON CONFLICT DO UPDATE no puede modificar la misma fila dos veces en una sentencia.
+        """
+        statements: List[List[PendingWrite]] = []
+        open_statements: Dict[str, List[tuple]] = {}
+        for write in batch:
+            rounds = open_statements.setdefault(write.operation.name, [])
+            for keys, writes in rounds:
+                if write.key not in keys:
+                    keys.add(write.key)
+                    writes.append(write)
+                    break
+            else:
+                writes = [write]
+                rounds.append(({write.key}, writes))
+                statements.append(writes)
+        return statements
+
+    @staticmethod
+    async def _execute(session: AsyncSession, writes: List[PendingWrite]) -> Dict[tuple, Any]:
+        operation = writes[0].operation
+        result = await session.execute(
+            operation.statement([write.values for write in writes]),
+            execution_options={"populate_existing": True},
+        )
+        records = {getattr(record, operation.match_column): record for record in result.scalars()}
+
+        if operation.entity is Client:
+            # Los altas no tienen vehículos; los upserts pueden actualizar un cliente que sí los tenga.
+            vehicles: Dict[Any, List[Vehicle]] = {record.id: [] for record in records.values()}
+            if operation.conflict_column:
+                owned = await session.execute(
+                    select(Vehicle).where(Vehicle.client_id.in_(vehicles)).order_by(Vehicle.created_at)
+                )
+                for vehicle in owned.scalars():
+                    vehicles[vehicle.client_id].append(vehicle)
+            for record in records.values():
+                set_committed_value(record, "vehicles", vehicles[record.id])
+
+        return {(operation.name, key): record for key, record in records.items()}
+
+
+write_batcher = WriteBatcher(AsyncSessionLocal)
@@ -1,12 +1,23 @@
-from fastapi import APIRouter
+from fastapi import FastAPI
 
-# Crea un router principal
-api_router = APIRouter(prefix='/api')
+# Importa los routers de cada recurso
+from routers import client_router, vehicle_router, eligibility_router, change_router, intake_router
 
-# Importa el router de locaciones
-from routers import client_router, vehicle_router, eligibility_router
+API_PREFIX = '/api'
 
-# Incluye los routers de cada recurso
-api_router.include_router(client_router.router)
-api_router.include_router(vehicle_router.router)
-api_router.include_router(eligibility_router.router) 
+routers = [
+    client_router.router,
+    vehicle_router.router,
+    eligibility_router.router,
+    change_router.router,
+    intake_router.router,
+]
+
+
+def include_routers(app: FastAPI):
+    """
+    Incluye los routers de cada recurso directamente en la app bajo `/api`. Pasar por un router
+    principal intermedio volvía a construir cada ruta una vez más al arrancar.
+    """
+    for router in routers:
+        app.include_router(router, prefix=API_PREFIX)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from entities.client_entity import Client
+from entities.vehicle_entity import Vehicle
+from services.client_service import ClientService
+from services.eligibility_service import EligibilityService
+from services.vehicle_service import VehicleService
+
+logger = logging.getLogger('vic-api')
+
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "5"))
+WARMUP_RETRY_SECONDS = 2.0
+
+# Proyección que usa el chatbot para buscar clientes por documento.
+LOOKUP_FIELDS = ["name", "last_name", "birth_date", "documento", "documento_type", "email", "phone_number"]
+
+HotPath = Tuple[str, Callable[[AsyncSession, Client, Vehicle], Awaitable[object]]]
+
+# Las consultas más frecuentes, ejecutadas a través de los mismos servicios para que el SQL sea
+# idéntico al de las peticiones (y reutilice la misma sentencia preparada).
+HOT_PATHS: List[HotPath] = [
+    ("client_by_id", lambda session, client, vehicle: ClientService(session).get_client_by_id(client.id)),
+    ("client_by_documento", lambda session, client, vehicle: ClientService(session).get_client_by_documento(client.documento)),
+    ("client_lookup", lambda session, client, vehicle: ClientService(session).get_client_by_documento(
+        client.documento, fields=LOOKUP_FIELDS, include_vehicles=False
+    )),
+    ("vehicle_by_id", lambda session, client, vehicle: VehicleService(session).get_vehicle_by_id(vehicle.id)),
+    ("vehicle_by_plate", lambda session, client, vehicle: VehicleService(session).get_vehicle_by_license_plate(
+        vehicle.license_plate
+    )),
+    ("vehicles_by_plates", lambda session, client, vehicle: VehicleService(session).get_vehicles_by_license_plates(
+        [vehicle.license_plate]
+    )),
+    ("eligibility_check", lambda session, client, vehicle: EligibilityService(session).check_eligibility(
+        client.id, vehicle.id
+    )),
+    ("eligible_pairs", lambda session, client, vehicle: EligibilityService(session).get_eligible_pairs(limit=100)),
+]
+
+# Consultas que usan SQL propio de Postgres (make_interval, age).
+POSTGRES_ONLY = {"eligible_pairs"}
+
+
+class Readiness:
+    """Estado de `/ready`: listo recién cuando el pool está abierto y las consultas preparadas."""
+    def __init__(self):
+        self.ready = False
+        self.warmup_seconds: float = 0.0
+        # Calentamiento de la réplica, que corre aparte después de marcar la API como lista.
+        self.replica_warmup: Optional[asyncio.Task] = None
+
+
+readiness = Readiness()
+
+
+async def _sample_rows(conn: AsyncConnection) -> Tuple[Client, Vehicle]:
+    """Un cliente y un vehículo reales, si existen, para que también se ejecuten las cargas de relaciones."""
+    row = (await conn.execute(
+        select(Vehicle.id, Vehicle.license_plate, Client.id.label("client_id"), Client.documento)
+        .join(Client, Client.id == Vehicle.client_id)
+        .limit(1)
+    )).first()
+    if row is None:
+        return Client(id=uuid.UUID(int=0), documento="0"), Vehicle(id=uuid.UUID(int=0), license_plate="AA000AA")
+    return Client(id=row.client_id, documento=row.documento), Vehicle(id=row.id, license_plate=row.license_plate)
+
+
+async def _warm_connection(conn: AsyncConnection, client: Client, vehicle: Vehicle):
+    session = AsyncSession(bind=conn, expire_on_commit=False)
+    is_postgres = conn.dialect.name == "postgresql"
+    try:
+        for name, hot_path in HOT_PATHS:
+            if name in POSTGRES_ONLY and not is_postgres:
+                continue
+            try:
+                await hot_path(session, client, vehicle)
+            except Exception as e:
+                # Una consulta que falla no impide arrancar: solo llegará sin preparar.
+                logger.warning(f"Calentamiento: no se pudo preparar '{name}': {e}")
+                await session.rollback()
+    finally:
+        await session.rollback()
+        await session.close()
+
+
+async def warm_up(engine: AsyncEngine, connections: int = DB_WARMUP_CONNECTIONS):
+    """
+    Abre `connections` conexiones del pool a la vez (sin superar su tamaño) y en cada una ejecuta
+    las consultas frecuentes. Así la conexión, la introspección de tipos de asyncpg y la caché de
+    sentencias preparadas de cada conexión, y la caché de compilación de SQLAlchemy, quedan listas
+    antes de la primera petición.
+    """
+    pool_size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    count = max(1, min(connections, pool_size))
+    conns: List[AsyncConnection] = []
+
+    async def connect():
+        conns.append(await engine.connect())
+
+    try:
+        # Se espera a todas las conexiones aunque alguna falle: las que sí se abrieron se cierran abajo.
+        errors = [
+            result for result in await asyncio.gather(*(connect() for _ in range(count)), return_exceptions=True)
+            if isinstance(result, BaseException)
+        ]
+        if errors:
+            raise errors[0]
+        client, vehicle = await _sample_rows(conns[0])
+        await conns[0].rollback()
+        await asyncio.gather(*(_warm_connection(conn, client, vehicle) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.close()
+    return count
+
+
+async def warm_up_until_ready(
+    engine: AsyncEngine, connections: int = DB_WARMUP_CONNECTIONS, replica: Optional[AsyncEngine] = None
+):
+    """
+    Reintenta el calentamiento hasta que la base responda y entonces marca la API como lista.
+    La réplica se calienta una sola vez, en otra tarea, después de marcarla: no demora `/ready` y,
+    si no responde, las lecturas van al primario.
+    """
+    if connections <= 0:
+        readiness.ready = True
+        return
+    start = time.perf_counter()
+    while True:
+        try:
+            count = await warm_up(engine, connections)
+            break
+        except Exception as e:
+            logger.error(f"Calentamiento fallido, se reintenta en {WARMUP_RETRY_SECONDS:.0f}s: {e}")
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+    readiness.warmup_seconds = time.perf_counter() - start
+    readiness.ready = True
+    logger.info(f"API lista: {count} conexiones abiertas y {len(HOT_PATHS)} consultas frecuentes ejecutadas en {readiness.warmup_seconds:.2f}s.")
+    if replica is not None:
+        readiness.replica_warmup = asyncio.create_task(_warm_up_replica(replica, connections))
+
+
+async def _warm_up_replica(replica: AsyncEngine, connections: int):
+    try:
+        count = await warm_up(replica, connections)
+        logger.info(f"Réplica calentada: {count} conexiones abiertas.")
+    except Exception as e:
+        logger.warning(f"Calentamiento de la réplica fallido: {e}")
@@ -1,13 +1,85 @@
 import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
 import httpx
 
+from api.clients.resilience import ResilientTransport
+
+CONDITIONAL_CACHE_SIZE = int(os.getenv("API_CONDITIONAL_CACHE_SIZE", "256"))
+
+
+class ConditionalCache:
+    """
+    Últimas respuestas con ETag por URL, para revalidarlas con `If-None-Match`. Si la API
+    responde 304 se reutiliza el cuerpo guardado. LRU acotado a `max_entries`.
+    """
+    def __init__(self, max_entries: int = CONDITIONAL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, httpx.Headers, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, httpx.Headers, bytes]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, etag: str, headers: httpx.Headers, content: bytes):
+        self._entries[key] = (etag, headers, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
+
+# Compartida por todas las instancias: los clientes de API se crean en cada llamada de herramienta.
+conditional_cache = ConditionalCache()
+
+
 class BaseApiClient:
     """
     Cliente base de API que maneja la configuración de la URL y el cliente HTTP.
+
+    Todas las peticiones pasan por `ResilientTransport`: plazo por intento según el presupuesto del
+    turno, reintentos de las idempotentes y un cortocircuito por endpoint.
     """
     def __init__(self):
         self.base_url = os.getenv("API_URL", "http://localhost:8000")
 
     def get_api_client(self) -> httpx.AsyncClient:
         """Retorna una instancia del cliente HTTP asíncrono."""
-        return httpx.AsyncClient(base_url=self.base_url)
\ No newline at end of file
+        return httpx.AsyncClient(base_url=self.base_url, transport=ResilientTransport())
+
+    async def conditional_get(
+        self, client: httpx.AsyncClient, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """
+        GET que revalida la última respuesta guardada para la misma URL con `If-None-Match`.
+        Ante un 304 devuelve la respuesta guardada como si fuera un 200, así que quien llama la
+        trata igual que a un GET común.
+        """
+        key = str(client.build_request("GET", url, params=params).url)
+        cached = conditional_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached is not None else None
+        response = await client.get(url, params=params, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            conditional_cache.hits += 1
+            _, cached_headers, content = cached
+            return httpx.Response(200, headers=cached_headers, content=content, request=response.request)
+
+        conditional_cache.misses += 1
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag:
+            # Se guarda el cuerpo ya decodificado; sin `content-encoding` para no volver a descomprimirlo.
+            stored_headers = httpx.Headers(
+                {name: value for name, value in response.headers.items() if name.lower() not in ("content-encoding", "content-length")}
+            )
+            conditional_cache.put(key, etag, stored_headers, response.content)
+        else:
+            conditional_cache.discard(key)
+        return response
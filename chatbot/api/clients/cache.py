@@ -0,0 +1,144 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "true").lower() == "true"
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "1024"))
+
+# Segundos que se reutiliza cada tipo de recurso sin volver a pedirlo a la API.
+CLIENT = "client"
+VEHICLE = "vehicle"
+CLIENT_VEHICLES = "client_vehicles"
+RESOURCE_TTLS: Dict[str, float] = {
+    CLIENT: float(os.getenv("API_CACHE_CLIENT_TTL", "30")),
+    VEHICLE: float(os.getenv("API_CACHE_VEHICLE_TTL", "30")),
+    CLIENT_VEHICLES: float(os.getenv("API_CACHE_CLIENT_VEHICLES_TTL", "15")),
+}
+
+Key = Tuple[str, Hashable, Hashable]
+
+
+class CacheStats:
+    def __init__(self):
+        self.requests = 0
+        self.hits = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    @property
+    def coalescing_rate(self) -> float:
+        """Fracción de pedidos que esperaron una petición ya en curso en lugar de hacer la suya."""
+        return self.coalesced / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hit_rate, 4),
+            "coalescing_rate": round(self.coalescing_rate, 4),
+        }
+
+
+class ApiCache:
+    """
+    Caché asíncrona de lecturas de la API con TTL por tipo de recurso y coalescencia: los GET
+    idénticos y simultáneos comparten una única petición en curso.
+
+    Las claves son (recurso, id como texto, variante); `invalidate(recurso, id)` descarta todas las
+    variantes de ese id (por ejemplo, las distintas proyecciones de un cliente) y la petición en curso.
+    Las respuestas vacías (`None`, un 404) no se guardan.
+    """
+    def __init__(self, ttls: Dict[str, float] = RESOURCE_TTLS, max_entries: int = API_CACHE_MAX_ENTRIES):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.enabled = API_CACHE_ENABLED
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Key, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Key, asyncio.Task] = {}
+
+    async def get_or_load(self, resource: str, resource_id: Hashable, loader: Callable[[], Awaitable[Any]], variant: Hashable = None) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        key = (resource, str(resource_id), variant)
+        self.stats.requests += 1
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return _copy(entry[1])
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.stats.coalesced += 1
+        else:
+            self.stats.loads += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+        # `shield`: si se cancela quien espera, la petición sigue para los demás.
+        return _copy(await asyncio.shield(task))
+
+    async def _load(self, key: Key, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        finally:
+            invalidated = self._inflight.get(key) is not asyncio.current_task()
+            if not invalidated:
+                del self._inflight[key]
+        if value is not None and not invalidated:
+            self._entries[key] = (time.monotonic() + self.ttls.get(key[0], 0.0), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, resource: str, resource_id: Hashable):
+        """Descarta el recurso (todas sus variantes) tras una escritura."""
+        self.stats.invalidations += 1
+        resource_id = str(resource_id)
+        for key in [key for key in self._entries if key[0] == resource and key[1] == resource_id]:
+            del self._entries[key]
+        for key in [key for key in self._inflight if key[0] == resource and key[1] == resource_id]:
+            # La petición en curso puede traer datos previos a la escritura: no se guarda ni se comparte.
+            del self._inflight[key]
+
+    def invalidate_client(self, client_id: Hashable):
+        """Un cliente incluye sus vehículos: cualquier cambio en ellos invalida también al cliente."""
+        self.invalidate(CLIENT, client_id)
+        self.invalidate(CLIENT_VEHICLES, client_id)
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+    def report(self) -> str:
+        stats = self.stats
+        return (
+            f"Caché de API: {stats.requests} lecturas, {stats.hit_rate:.1%} aciertos, "
+            f"{stats.coalescing_rate:.1%} coalescidas, {stats.loads} peticiones, {stats.invalidations} invalidaciones."
+        )
+
+
+def _copy(value: Any) -> Any:
+    """Cada llamador recibe su propia copia: los modelos guardados no deben modificarse."""
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if hasattr(value, "model_copy"):
+        return value.model_copy(deep=True)
+    return value
+
+
+# Compartida por todas las instancias de los clientes de API, como `conditional_cache`.
+api_cache = ApiCache()
@@ -1,8 +1,9 @@
 import uuid
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from api.clients.base import BaseApiClient
-from api.requests.client_request import ClientRequest
+from api.clients.cache import CLIENT, api_cache
+from api.requests.client_request import ClientRequest, ClientPatchRequest
 from api.responses.client_response import ClientResponse
 
 class ClientApiClient(BaseApiClient):
@@ -19,11 +20,69 @@ class ClientApiClient(BaseApiClient):
 
             response = await client.post("/api/clients/", json=json_data)
             response.raise_for_status()
+            created = ClientResponse(**response.json())
+        api_cache.invalidate_client(created.id)
+        return created
+
+    async def upsert_client(self, client_data: ClientRequest, idempotency_key: Optional[str] = None) -> Optional[ClientResponse]:
+        """
+        Crea el cliente o actualiza el existente con el mismo documento (PUT /upsert).
+        La misma `Idempotency-Key` se reutiliza si la petición se reintenta.
+        Retorna None si el documento ya está registrado con otro correo y otro teléfono (409):
+        la API no reemplaza los datos de ese cliente.
+        """
+        async with self.get_api_client() as client:
+            json_data = client_data.model_dump(mode="json")
+            headers = {"Idempotency-Key": idempotency_key or str(uuid.uuid4())}
+
+            response = await client.put("/api/clients/upsert", json=json_data, headers=headers)
+            if response.status_code == 409:
+                return None
+            response.raise_for_status()
+            upserted = ClientResponse(**response.json())
+        api_cache.invalidate_client(upserted.id)
+        return upserted
+
+    @staticmethod
+    def _projection_params(fields: Optional[List[str]], include_vehicles: bool) -> Dict[str, str]:
+        """Parámetros `fields`/`include` para pedir solo lo necesario; sin ellos la API devuelve el cliente completo."""
+        params = {}
+        if fields is not None:
+            params["fields"] = ",".join(fields)
+        if include_vehicles:
+            params["include"] = "vehicles"
+        elif fields is None:
+            params["include"] = ""
+        return params
+
+    async def get_client(
+        self, client_id: uuid.UUID, fields: Optional[List[str]] = None, include_vehicles: bool = True
+    ) -> Optional[ClientResponse]:
+        """Lectura cacheada por id y proyección; las llamadas simultáneas comparten una sola petición."""
+        return await api_cache.get_or_load(
+            CLIENT, client_id, lambda: self._get_client(client_id, fields, include_vehicles),
+            variant=(tuple(fields) if fields is not None else None, include_vehicles),
+        )
+
+    async def _get_client(
+        self, client_id: uuid.UUID, fields: Optional[List[str]], include_vehicles: bool
+    ) -> Optional[ClientResponse]:
+        async with self.get_api_client() as client:
+            response = await self.conditional_get(
+                client, f"/api/clients/{client_id}", params=self._projection_params(fields, include_vehicles)
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
             return ClientResponse(**response.json())
 
-    async def get_client(self, client_id: uuid.UUID) -> Optional[ClientResponse]:
+    async def get_client_by_documento(
+        self, documento: str, fields: Optional[List[str]] = None, include_vehicles: bool = True
+    ) -> Optional[ClientResponse]:
         async with self.get_api_client() as client:
-            response = await client.get(f"/api/clients/{client_id}")
+            response = await self.conditional_get(
+                client, f"/api/clients/by-documento/{documento}", params=self._projection_params(fields, include_vehicles)
+            )
             if response.status_code == 404:
                 return None
             response.raise_for_status()
@@ -35,24 +94,28 @@ class ClientApiClient(BaseApiClient):
             response.raise_for_status()
             return [ClientResponse(**item) for item in response.json()]
 
-    async def update_client(self, client_id: uuid.UUID, client_data: ClientRequest) -> Optional[ClientResponse]:
-        async with self.get_api_client() as client:
-            json_data = client_data.model_dump(by_alias=True)
-            if json_data.get("birth_date"):
-                json_data["birth_date"] = json_data["birth_date"].isoformat()
-            if json_data.get("documento_type"):
-                json_data["documento_type"] = json_data["documento_type"].value
+    async def update_client(self, client_id: uuid.UUID, client_data: ClientPatchRequest) -> Optional[ClientResponse]:
+        """Envía solo los campos asignados en `client_data` (PATCH); uno asignado en None se borra."""
+        try:
+            async with self.get_api_client() as client:
+                json_data = client_data.model_dump(mode="json", exclude_unset=True)
 
-            response = await client.put(f"/api/clients/{client_id}", json=json_data)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return ClientResponse(**response.json())
+                response = await client.patch(f"/api/clients/{client_id}", json=json_data)
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                return ClientResponse(**response.json())
+        finally:
+            # También si falló: la escritura pudo haberse aplicado igual.
+            api_cache.invalidate_client(client_id)
 
     async def delete_client(self, client_id: uuid.UUID) -> bool:
-        async with self.get_api_client() as client:
-            response = await client.delete(f"/api/clients/{client_id}")
-            if response.status_code == 404:
-                return False
-            response.raise_for_status()
-            return True
\ No newline at end of file
+        try:
+            async with self.get_api_client() as client:
+                response = await client.delete(f"/api/clients/{client_id}")
+                if response.status_code == 404:
+                    return False
+                response.raise_for_status()
+                return True
+        finally:
+            api_cache.invalidate_client(client_id)
\ No newline at end of file
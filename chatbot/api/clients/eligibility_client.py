@@ -13,6 +13,9 @@ class EligibilityApiClient(BaseApiClient):
         """
         request_data = EligibilityRequest(client_id=client_id, vehicle_id=vehicle_id)
         async with self.get_api_client() as client:
-            response = await client.post("/api/eligibility/check", content=request_data.model_dump_json())
+            # Solo consulta, no escribe: se puede reintentar como un GET.
+            response = await client.post(
+                "/api/eligibility/check", content=request_data.model_dump_json(), extensions={"idempotent": True}
+            )
             response.raise_for_status()
             return EligibilityResponse(**response.json())
\ No newline at end of file
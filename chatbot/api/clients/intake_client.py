@@ -0,0 +1,26 @@
+import uuid
+from typing import Optional
+
+from .base import BaseApiClient
+from .cache import VEHICLE, api_cache
+from api.requests.intake_request import IntakeRequest
+from api.responses.intake_response import IntakeResponse
+
+class IntakeApiClient(BaseApiClient):
+    """
+    Cliente de API para el endpoint de admisión completa.
+    """
+    async def intake(self, intake_data: IntakeRequest, idempotency_key: Optional[str] = None) -> IntakeResponse:
+        """
+        Registra cliente y vehículo y evalúa la elegibilidad en una sola llamada (POST /api/intake).
+        La misma `Idempotency-Key` se reutiliza si la petición se reintenta.
+        """
+        async with self.get_api_client() as client:
+            headers = {"Idempotency-Key": idempotency_key or str(uuid.uuid4())}
+
+            response = await client.post("/api/intake", json=intake_data.model_dump(mode="json"), headers=headers)
+            response.raise_for_status()
+            result = IntakeResponse(**response.json())
+        api_cache.invalidate_client(result.client_id)
+        api_cache.invalidate(VEHICLE, result.vehicle_id)
+        return result
@@ -0,0 +1,327 @@
+import asyncio
+import contextvars
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+from logger import logger
+
+API_TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "5"))
+API_RETRY_ATTEMPTS = int(os.getenv("API_RETRY_ATTEMPTS", "3"))
+API_RETRY_BASE_DELAY = float(os.getenv("API_RETRY_BASE_DELAY", "0.1"))
+API_RETRY_MAX_DELAY = float(os.getenv("API_RETRY_MAX_DELAY", "1"))
+API_BREAKER_FAILURES = int(os.getenv("API_BREAKER_FAILURES", "5"))
+API_BREAKER_RESET_SECONDS = float(os.getenv("API_BREAKER_RESET_SECONDS", "10"))
+
+# Por debajo de este margen no se intenta una petición: no llegaría a completarse.
+MIN_ATTEMPT_SECONDS = 0.05
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+# Instante (`time.monotonic()`) en que vence el turno en curso; `None` si no tiene límite.
+call_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("call_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    """Las llamadas a la API hechas dentro del bloque no pasan de `deadline`."""
+    token = call_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        call_deadline.reset(token)
+
+
+class WriteTracker:
+    """Registra si el turno en curso ya envió alguna escritura a la API."""
+    def __init__(self):
+        self.started = False
+
+
+# Escrituras del turno en curso; `None` fuera de un turno.
+call_writes: contextvars.ContextVar[Optional[WriteTracker]] = contextvars.ContextVar("call_writes", default=None)
+
+
+@contextmanager
+def write_scope(tracker: WriteTracker) -> Iterator[None]:
+    """Las escrituras a la API hechas dentro del bloque (y en sus tareas hijas) se anotan en `tracker`."""
+    token = call_writes.set(tracker)
+    try:
+        yield
+    finally:
+        call_writes.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Segundos que le quedan al turno en curso, o `None` si no tiene límite."""
+    deadline = call_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class CircuitOpenError(httpx.TransportError):
+    """El endpoint falló demasiadas veces seguidas: se rechaza la llamada sin enviarla."""
+
+
+class DeadlineExceededError(httpx.TimeoutException):
+    """No queda presupuesto del turno para (re)intentar la llamada."""
+
+
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_key(request: httpx.Request) -> str:
+    """`GET /api/clients/{id}`: los segmentos con dígitos (ids, documentos, patentes) se agrupan."""
+    path = "/".join("{id}" if _ID_SEGMENT.search(segment) else segment for segment in request.url.path.split("/"))
+    return f"{request.method} {path}"
+
+
+def is_write(request: httpx.Request) -> bool:
+    """Peticiones que modifican datos; los POST de solo consulta se marcan con la extensión `idempotent`."""
+    return request.method in WRITE_METHODS and not request.extensions.get("idempotent")
+
+
+def is_idempotent(request: httpx.Request) -> bool:
+    """Métodos idempotentes, peticiones con `Idempotency-Key` o marcadas con la extensión `idempotent`."""
+    return (
+        request.method in IDEMPOTENT_METHODS
+        or "Idempotency-Key" in request.headers
+        or bool(request.extensions.get("idempotent"))
+    )
+
+
+class EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.short_circuited = 0
+        self.deadline_exceeded = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class CircuitBreaker:
+    """
+    Cortocircuito de un endpoint: tras `failure_threshold` fallos seguidos se abre y rechaza las
+    llamadas durante `reset_seconds`; luego deja pasar una sola de prueba (semiabierto) y según su
+    resultado vuelve a cerrarse o a abrirse.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = API_BREAKER_FAILURES, reset_seconds: float = API_BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuito de {self.name} cerrado.")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuito de {self.name} abierto tras {self.failures} fallos; se reintenta en {self.reset_seconds:.0f}s.")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """La llamada de prueba terminó sin resultado (p. ej. se canceló): se permite otra."""
+        self._probing = False
+
+
+class Resilience:
+    """Cortocircuitos y métricas por endpoint, compartidos por todos los clientes de API."""
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stats: Dict[str, EndpointStats] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+    def stats_for(self, endpoint: str) -> EndpointStats:
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats[endpoint] = EndpointStats()
+        return stats
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            endpoint: {**stats.as_dict(), "circuit": self.breaker(endpoint).state}
+            for endpoint, stats in self.stats.items()
+        }
+
+    def report(self) -> str:
+        totals = EndpointStats()
+        for stats in self.stats.values():
+            for name, value in vars(stats).items():
+                setattr(totals, name, getattr(totals, name) + value)
+        open_circuits = [name for name, breaker in self.breakers.items() if breaker.state != CircuitBreaker.CLOSED]
+        return (
+            f"API: {totals.calls} llamadas, {totals.retries} reintentos, {totals.failures} fallidas, "
+            f"{totals.timeouts} timeouts, {totals.short_circuited} cortocircuitadas, "
+            f"{totals.deadline_exceeded} sin presupuesto. Circuitos abiertos: {', '.join(open_circuits) or 'ninguno'}."
+        )
+
+
+resilience = Resilience()
+
+
+def _backoff(attempt: int) -> float:
+    """Espera exponencial con jitter completo: uniforme entre 0 y min(máximo, base * 2^intento)."""
+    return random.uniform(0, min(API_RETRY_MAX_DELAY, API_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte HTTP con plazo por intento derivado del presupuesto del turno, reintentos con
+    espera exponencial y jitter, y un cortocircuito por endpoint.
+
+    Se reintentan los errores de conexión, los timeouts y las respuestas 429/502/503/504, pero solo
+    en peticiones idempotentes; las demás se reintentan únicamente si no llegaron a enviarse
+    (`httpx.ConnectError`). Cada intento lee la respuesta completa dentro de su plazo, así que la
+    latencia de una llamada queda acotada por el presupuesto y no por el peor caso de la API.
+    """
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, attempts: int = API_RETRY_ATTEMPTS):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.attempts = max(1, attempts)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = endpoint_key(request)
+        stats = resilience.stats_for(endpoint)
+        breaker = resilience.breaker(endpoint)
+        idempotent = is_idempotent(request)
+        stats.calls += 1
+        tracker = call_writes.get()
+        if tracker is not None and is_write(request):
+            # Se anota antes de enviarla: desde aquí la escritura puede llegar a la API.
+            tracker.started = True
+
+        attempt = 0
+        last_response: Optional[httpx.Response] = None
+        while True:
+            timeout = self._attempt_timeout()
+            if timeout is None:
+                stats.deadline_exceeded += 1
+                if last_response is not None:
+                    stats.failures += 1
+                    return last_response
+                raise DeadlineExceededError(f"Sin presupuesto para {endpoint}", request=request)
+            if not breaker.allow():
+                stats.short_circuited += 1
+                if last_response is not None:
+                    stats.failures += 1
+                    return last_response
+                raise CircuitOpenError(f"Circuito abierto para {endpoint}", request=request)
+
+            stats.attempts += 1
+            try:
+                response = await self._send(request, timeout)
+            except (httpx.TransportError, TimeoutError) as e:
+                breaker.record_failure()
+                if isinstance(e, (httpx.TimeoutException, TimeoutError)):
+                    stats.timeouts += 1
+                # Sin haber enviado la petición cualquier método puede reintentarse.
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or not await self._wait_before_retry(attempt, None):
+                    stats.failures += 1
+                    if isinstance(e, httpx.TransportError):
+                        raise
+                    raise httpx.ReadTimeout(f"Timeout de {timeout:.2f}s en {endpoint}", request=request) from e
+                last_response = None
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in RETRYABLE_STATUS or not idempotent:
+                    return response
+                if not await self._wait_before_retry(attempt, _retry_after(response)):
+                    stats.failures += 1
+                    return response
+                last_response = response
+            attempt += 1
+            stats.retries += 1
+
+    def _attempt_timeout(self) -> Optional[float]:
+        remaining = remaining_budget()
+        if remaining is None:
+            return API_TIMEOUT_SECONDS
+        if remaining < MIN_ATTEMPT_SECONDS:
+            return None
+        return min(API_TIMEOUT_SECONDS, remaining)
+
+    async def _send(self, request: httpx.Request, timeout: float) -> httpx.Response:
+        request.extensions = {**request.extensions, "timeout": httpx.Timeout(timeout).as_dict()}
+        async with asyncio.timeout(timeout):
+            response = await self._transport.handle_async_request(request)
+            try:
+                # Cuerpo sin decodificar: lo descomprime después el cliente, como siempre.
+                content = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+        return httpx.Response(
+            response.status_code, headers=response.headers, stream=httpx.ByteStream(content),
+            extensions=response.extensions, request=request,
+        )
+
+    async def _wait_before_retry(self, attempt: int, retry_after: Optional[float]) -> bool:
+        """Espera antes del siguiente intento; `False` si no quedan intentos o no alcanza el presupuesto."""
+        if attempt + 1 >= self.attempts:
+            return False
+        if retry_after is not None and retry_after > API_RETRY_MAX_DELAY:
+            return False
+        delay = retry_after if retry_after is not None else _backoff(attempt)
+        remaining = remaining_budget()
+        if remaining is not None and delay + MIN_ATTEMPT_SECONDS > remaining:
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -1,8 +1,10 @@
 import uuid
 from typing import List, Optional
+from urllib.parse import quote
 
 from .base import BaseApiClient
-from api.requests.vehicle_request import VehicleRequest
+from .cache import CLIENT_VEHICLES, VEHICLE, api_cache
+from api.requests.vehicle_request import VehicleRequest, VehiclePatchRequest, VehiclePlatesRequest
 from api.responses.vehicle_response import VehicleResponse
 
 class VehicleApiClient(BaseApiClient):
@@ -16,29 +18,80 @@ class VehicleApiClient(BaseApiClient):
 
             response = await client.post("/api/vehicles/", json=json_data)
             response.raise_for_status()
-            return VehicleResponse(**response.json())
+            created = VehicleResponse(**response.json())
+        self._invalidate(created)
+        return created
+
+    async def upsert_vehicle(self, vehicle_data: VehicleRequest, idempotency_key: Optional[str] = None) -> VehicleResponse:
+        """
+        Crea el vehículo o actualiza el existente con la misma patente (PUT /upsert).
+        La misma `Idempotency-Key` se reutiliza si la petición se reintenta.
+        """
+        async with self.get_api_client() as client:
+            json_data = vehicle_data.model_dump(mode="json")
+            headers = {"Idempotency-Key": idempotency_key or str(uuid.uuid4())}
+
+            response = await client.put("/api/vehicles/upsert", json=json_data, headers=headers)
+            response.raise_for_status()
+            upserted = VehicleResponse(**response.json())
+        self._invalidate(upserted)
+        return upserted
+
+    @staticmethod
+    def _invalidate(vehicle: VehicleResponse):
+        """Tras escribir un vehículo se descartan él, su cliente y la lista de vehículos del cliente."""
+        api_cache.invalidate(VEHICLE, vehicle.id)
+        api_cache.invalidate_client(vehicle.client_id)
 
     async def get_vehicle(self, vehicle_id: uuid.UUID) -> Optional[VehicleResponse]:
+        """Lectura cacheada por id; las llamadas simultáneas comparten una sola petición."""
+        return await api_cache.get_or_load(VEHICLE, vehicle_id, lambda: self._get_vehicle(vehicle_id))
+
+    async def _get_vehicle(self, vehicle_id: uuid.UUID) -> Optional[VehicleResponse]:
+        async with self.get_api_client() as client:
+            response = await self.conditional_get(client, f"/api/vehicles/{vehicle_id}")
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return VehicleResponse(**response.json())
+
+    async def get_vehicle_by_license_plate(self, license_plate: str) -> Optional[VehicleResponse]:
         async with self.get_api_client() as client:
-            response = await client.get(f"/api/vehicles/{vehicle_id}")
+            response = await self.conditional_get(client, f"/api/vehicles/by-plate/{quote(license_plate, safe='')}")
             if response.status_code == 404:
                 return None
             response.raise_for_status()
             return VehicleResponse(**response.json())
 
+    async def get_vehicles_by_license_plates(self, license_plates: List[str]) -> List[VehicleResponse]:
+        async with self.get_api_client() as client:
+            request_data = VehiclePlatesRequest(license_plates=license_plates)
+            response = await client.post("/api/vehicles/by-plate", json=request_data.model_dump())
+            response.raise_for_status()
+            return [VehicleResponse(**item) for item in response.json()]
+
     async def get_client_vehicles(self, client_id: uuid.UUID) -> List[VehicleResponse]:
+        """Lectura cacheada por cliente; las llamadas simultáneas comparten una sola petición."""
+        return await api_cache.get_or_load(CLIENT_VEHICLES, client_id, lambda: self._get_client_vehicles(client_id))
+
+    async def _get_client_vehicles(self, client_id: uuid.UUID) -> List[VehicleResponse]:
         async with self.get_api_client() as client:
             response = await client.get(f"/api/vehicles/client/{client_id}")
             response.raise_for_status()
             return [VehicleResponse(**item) for item in response.json()]
 
-    async def update_vehicle(self, vehicle_id: uuid.UUID, vehicle_data: VehicleRequest) -> Optional[VehicleResponse]:
-        async with self.get_api_client() as client:
-            json_data = vehicle_data.model_dump()
-            json_data['client_id'] = str(json_data['client_id'])
+    async def update_vehicle(self, vehicle_id: uuid.UUID, vehicle_data: VehiclePatchRequest) -> Optional[VehicleResponse]:
+        """Envía solo los campos indicados en `vehicle_data` (PATCH)."""
+        try:
+            async with self.get_api_client() as client:
+                json_data = vehicle_data.model_dump(mode="json", exclude_none=True)
 
-            response = await client.put(f"/api/vehicles/{vehicle_id}", json=json_data)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return VehicleResponse(**response.json())
\ No newline at end of file
+                response = await client.patch(f"/api/vehicles/{vehicle_id}", json=json_data)
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                updated = VehicleResponse(**response.json())
+        finally:
+            api_cache.invalidate(VEHICLE, vehicle_id)
+        self._invalidate(updated)
+        return updated
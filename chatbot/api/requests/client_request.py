@@ -10,4 +10,13 @@ class ClientRequest(BaseModel):
     documento: str = Field(..., description="El número de documento del usuario.")
     documento_type: IdentificationType = Field(..., description="El tipo de documento (DNI, CUIT o CUIL).")
     email: str = Field(..., description="El correo electrónico del usuario.")
-    phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
\ No newline at end of file
+    phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
+
+class ClientPatchRequest(BaseModel):
+    name: Optional[str] = Field(None, description="El nombre de pila del usuario.")
+    last_name: Optional[str] = Field(None, description="El apellido del usuario.")
+    birth_date: Optional[date] = Field(None, description="La fecha de nacimiento del usuario en formato YYYY-MM-DD.")
+    documento: Optional[str] = Field(None, description="El número de documento del usuario.")
+    documento_type: Optional[IdentificationType] = Field(None, description="El tipo de documento (DNI, CUIT o CUIL).")
+    email: Optional[str] = Field(None, description="El correo electrónico del usuario.")
+    phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
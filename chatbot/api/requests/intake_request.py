@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from api.requests.client_request import ClientRequest
+
+class IntakeVehicleRequest(BaseModel):
+    license_plate: str
+    brand: str
+    model: str
+    year: int
+    mileage: int
+
+class IntakeRequest(BaseModel):
+    client: ClientRequest
+    vehicle: IntakeVehicleRequest
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -7,4 +8,15 @@ class VehicleRequest(BaseModel):
     brand: str
     model: str
     year: int
-    mileage: int
\ No newline at end of file
+    mileage: int
+
+class VehiclePatchRequest(BaseModel):
+    client_id: Optional[UUID] = None
+    license_plate: Optional[str] = None
+    brand: Optional[str] = None
+    model: Optional[str] = None
+    year: Optional[int] = None
+    mileage: Optional[int] = None
+
+class VehiclePlatesRequest(BaseModel):
+    license_plates: List[str]
@@ -1,9 +1,11 @@
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel
 
 class BaseResponse(BaseModel):
     """
     Modelo base para las respuestas de la API.
+    Las marcas de tiempo pueden faltar en respuestas parciales (`?fields=`).
     """
-    created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
\ No newline at end of file
@@ -7,12 +7,16 @@ from .vehicle_response import VehicleResponse
 from workflow.orchestrator_state import IdentificationType
 
 class ClientResponse(BaseResponse):
+    """
+    Cliente devuelto por la API. Con `?fields=` solo llegan los campos pedidos y,
+    sin `include=vehicles`, la lista de vehículos queda vacía.
+    """
     id: uuid.UUID
-    name: Optional[str]
-    last_name: Optional[str]
-    birth_date: Optional[date]
-    documento: Optional[str]
-    documento_type: Optional[IdentificationType]
-    email: Optional[str]
-    phone_number: Optional[str]
-    vehicles: List[VehicleResponse]
\ No newline at end of file
+    name: Optional[str] = None
+    last_name: Optional[str] = None
+    birth_date: Optional[date] = None
+    documento: Optional[str] = None
+    documento_type: Optional[IdentificationType] = None
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+    vehicles: List[VehicleResponse] = []
\ No newline at end of file
@@ -0,0 +1,12 @@
+import uuid
+from pydantic import BaseModel
+
+from .eligibility_response import EligibilityResponse
+
+class IntakeResponse(BaseModel):
+    """
+    Modelo de respuesta para una admisión completa.
+    """
+    client_id: uuid.UUID
+    vehicle_id: uuid.UUID
+    eligibility: EligibilityResponse
@@ -7,4 +7,5 @@ class VehicleResponse(BaseResponse):
     brand: str | None
     model: str | None
     year: int | None
-    mileage: int | None
\ No newline at end of file
+    mileage: int | None
+    client_id: uuid.UUID | None = None
\ No newline at end of file
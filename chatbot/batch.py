@@ -0,0 +1,174 @@
+"""
+Procesamiento offline de conversaciones grabadas.
+
+Lee un archivo JSONL donde cada línea es una conversación:
+    {"id": "conv-001", "messages": ["Hola", "Juan Pérez", ...]}
+
+Ejecuta cada conversación en su propio `thread_id` sobre un único grafo compilado,
+con concurrencia acotada, y escribe una línea JSONL por conversación con el estado final,
+el resultado de elegibilidad y los tiempos. Una línea que no es un objeto JSON produce un
+resultado con `error` (y `final_state`/`eligibility` en null) sin detener el resto del lote.
+
+Uso (desde /chatbot):
+    python batch.py conversaciones.jsonl resultados.jsonl --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.state import CompiledStateGraph
+
+from api.clients.cache import api_cache
+from api.clients.resilience import resilience
+from llm_provider import get_node_llms, SUPERVISOR_NODE
+from logger import logger
+from workflow.chat_runner import ChatRunner
+from workflow.checkpoint_serializer import CompactStateSerializer
+from workflow.orchestrator import create_orchestrator
+
+# Cargar variables de entorno
+load_dotenv()
+
+_DONE = object()
+
+
+def _dump(value: Any) -> Any:
+    """Serializa a JSON los modelos pydantic del estado."""
+    if value is None:
+        return None
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+def _result(conversation_id: Any, thread_id: Optional[str] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    """Línea de resultado con todas sus claves, también cuando la conversación no llegó a ejecutarse."""
+    return {
+        "id": conversation_id,
+        "thread_id": thread_id,
+        "responses": [],
+        "turn_timings_s": [],
+        "turn_budgets": [],
+        "error": error,
+        "final_state": None,
+        "eligibility": None,
+        "total_s": 0.0,
+    }
+
+
+async def run_conversation(
+    conversation: Dict[str, Any],
+    llm: BaseChatModel,
+    graph: CompiledStateGraph,
+    memory: MemorySaver,
+) -> Dict[str, Any]:
+    """Ejecuta una conversación completa y devuelve su resultado."""
+    thread_id = str(uuid.uuid4())
+    runner = ChatRunner(llm, memory, thread_id, graph=graph)
+    result = _result(conversation.get("id"), thread_id)
+
+    start = time.perf_counter()
+    try:
+        for message in conversation.get("messages", []):
+            turn_start = time.perf_counter()
+            result["responses"].append(await runner.handle_message(message))
+            result["turn_timings_s"].append(round(time.perf_counter() - turn_start, 4))
+            if runner.last_turn_budget is not None:
+                result["turn_budgets"].append(runner.last_turn_budget.summary())
+
+        state = await runner.get_state()
+        result["final_state"] = {
+            "client": _dump(state.get("client")),
+            "vehicle": _dump(state.get("vehicle")),
+            "confirmation_request": state.get("confirmation_request"),
+        }
+        result["eligibility"] = state.get("eligibility_result")
+    except Exception as e:
+        logger.error(f"Error en la conversación {conversation.get('id')}: {e}", exc_info=True)
+        result["error"] = str(e)
+    finally:
+        # Libera el checkpoint del hilo: en lotes grandes la memoria crecería sin límite.
+        memory.delete_thread(thread_id)
+
+    result["total_s"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+async def run_batch(input_path: str, output_path: str, concurrency: int, limit: Optional[int] = None):
+    """Procesa el archivo de entrada con `concurrency` conversaciones simultáneas como máximo."""
+    memory = MemorySaver(serde=CompactStateSerializer())
+    node_llms = get_node_llms()
+    graph = create_orchestrator(node_llms[SUPERVISOR_NODE], memory, node_llms)
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def producer():
+        # Los workers terminan solo al recibir `_DONE`: se encola aunque la lectura falle, y el
+        # error (archivo inexistente o ilegible) se propaga recién en el `gather` final.
+        try:
+            with open(input_path, encoding="utf-8") as f:
+                for count, line in enumerate(f):
+                    if limit is not None and count >= limit:
+                        break
+                    if not line.strip():
+                        continue
+                    try:
+                        conversation = json.loads(line)
+                        if not isinstance(conversation, dict):
+                            raise ValueError(f"se esperaba un objeto JSON, no {type(conversation).__name__}")
+                    except ValueError as e:
+                        # Una línea inválida queda como resultado con error; el resto del lote sigue.
+                        logger.error(f"Línea {count + 1} inválida: {e}")
+                        await results.put(_result(None, error=f"Línea {count + 1}: {e}"))
+                        continue
+                    await queue.put(conversation)
+        finally:
+            for _ in range(concurrency):
+                await queue.put(_DONE)
+
+    async def worker():
+        while (conversation := await queue.get()) is not _DONE:
+            await results.put(await run_conversation(conversation, node_llms[SUPERVISOR_NODE], graph, memory))
+        await results.put(_DONE)
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(producer())] + [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    processed = failed = finished_workers = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        while finished_workers < concurrency:
+            result = await results.get()
+            if result is _DONE:
+                finished_workers += 1
+                continue
+            out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            processed += 1
+            failed += result["error"] is not None
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Lote finalizado: {processed} conversaciones ({failed} con error) en {elapsed:.1f}s "
+        f"({processed / elapsed if elapsed else 0:.2f} conv/s, concurrencia {concurrency})."
+    )
+    logger.info(api_cache.report())
+    logger.info(resilience.report())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procesa conversaciones JSONL en lote sobre el grafo del chatbot.")
+    parser.add_argument("input", help="Archivo JSONL de conversaciones ({'id', 'messages'}).")
+    parser.add_argument("output", help="Archivo JSONL de resultados.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Conversaciones simultáneas.")
+    parser.add_argument("--limit", type=int, help="Procesar solo las primeras N conversaciones.")
+    args = parser.parse_args()
+
+    asyncio.run(run_batch(args.input, args.output, max(1, args.concurrency), args.limit))
@@ -0,0 +1,112 @@
+"""
+Compara el serializador de checkpoints por defecto (JsonPlusSerializer) con CompactStateSerializer.
+
+Construye los valores de canal que se escriben en cada checkpoint a lo largo de una admisión
+(mensajes acumulados, cliente, vehículo, solicitud de confirmación, enrutamiento) y mide
+bytes por checkpoint y tiempo de serialización/deserialización.
+
+Uso (desde /chatbot):
+    python -m benchmarks.checkpoint_serde --iterations 2000
+"""
+import argparse
+import datetime
+import time
+import uuid
+from typing import Any, Dict, List
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from workflow.checkpoint_serializer import CompactStateSerializer
+from workflow.orchestrator_state import ClientResult, IdentificationType, NextNode, VehicleResult
+
+
+def build_channel_values(turn: int) -> Dict[str, Any]:
+    """Valores de canal representativos del estado tras `turn` turnos de conversación."""
+    messages = []
+    for i in range(turn):
+        messages.append(HumanMessage(content=f"Mensaje del usuario número {i}", id=str(uuid.uuid4())))
+        messages.append(AIMessage(
+            content="Gracias. ¿Podrías indicarme el siguiente dato para continuar con el registro?",
+            id=str(uuid.uuid4()),
+            response_metadata={"model_name": "llama-3.3-70b-versatile", "finish_reason": "stop"},
+            usage_metadata={"input_tokens": 420, "output_tokens": 25, "total_tokens": 445},
+        ))
+    client = ClientResult(
+        id=uuid.uuid4(),
+        name="Juan",
+        last_name="Pérez",
+        birth_date=datetime.date(1990, 5, 15),
+        documento="30123456",
+        documento_type=IdentificationType.DNI,
+        email="juan.perez@example.com",
+        phone_number="1122334455",
+    )
+    vehicle = VehicleResult(
+        id=uuid.uuid4(), license_plate="AB123CD", brand="Toyota", model="Corolla", year=2019, mileage=45000
+    )
+    return {
+        "message": [("user", "sí")],
+        "messages": messages,
+        "client": client,
+        "vehicle": vehicle if turn > 6 else None,
+        "confirmation_request": {"license_plate": "AB123CD", "brand": "Toyota", "model": "Corolla"},
+        "intent_description": "Usuario proporciona el dato solicitado",
+        "raw_extracted_data": ["AB123CD", "Toyota", "Corolla"],
+        "base_message": ["Por favor, confirma si los siguientes datos del vehículo son correctos."],
+        "next_node": NextNode.CONFIRM_VEHICLE_DATA,
+        "is_first_run": False,
+    }
+
+
+def measure(serde, channel_values: Dict[str, Any], iterations: int, check: bool = False) -> Dict[str, float]:
+    """Serializa cada canal por separado, como lo hace el checkpointer."""
+    blobs = {key: serde.dumps_typed(value) for key, value in channel_values.items()}
+    if check:
+        for key, blob in blobs.items():
+            if serde.loads_typed(blob) != channel_values[key]:
+                raise AssertionError(f"El canal '{key}' no sobrevive al ciclo de serialización con {type(serde).__name__}.")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for value in channel_values.values():
+            serde.dumps_typed(value)
+    dumps_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for blob in blobs.values():
+            serde.loads_typed(blob)
+    loads_us = (time.perf_counter() - start) / iterations * 1e6
+
+    return {"bytes": sum(len(blob[1]) for blob in blobs.values()), "dumps_us": dumps_us, "loads_us": loads_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de checkpoints.")
+    parser.add_argument("--iterations", type=int, default=2000, help="Repeticiones por medición.")
+    parser.add_argument("--turns", default="1,6,12", help="Tamaños de conversación (turnos), separados por coma.")
+    args = parser.parse_args()
+
+    serializers = {"default": JsonPlusSerializer(), "compact": CompactStateSerializer()}
+    rows: List[str] = []
+    for turn in [int(t) for t in args.turns.split(",")]:
+        channel_values = build_channel_values(turn)
+        # El serializador por defecto convierte las tuplas en listas; solo se verifica el compacto.
+        results = {
+            name: measure(serde, channel_values, args.iterations, check=name == "compact")
+            for name, serde in serializers.items()
+        }
+        for name, result in results.items():
+            ratio = result["bytes"] / results["default"]["bytes"]
+            rows.append(
+                f"| {turn} | {name} | {result['bytes']} ({ratio:.0%}) | {result['dumps_us']:.1f} | {result['loads_us']:.1f} |"
+            )
+
+    print("| Turnos | Serializador | Bytes por checkpoint | Serializar (µs) | Deserializar (µs) |")
+    print("| ------ | ------------ | -------------------- | --------------- | ----------------- |")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Reporte comparativo de latencia y costo por admisión completa según el perfil de niveles de modelo.
+
+Reproduce un cassette grabado con el proveedor 'replay' (sin llamadas al LLM) a través del grafo real.
+Las herramientas sí llaman a la API, por lo que debe estar disponible en API_URL.
+
+Uso (desde /chatbot):
+    python -m benchmarks.model_tiering --provider groq --profiles single,tiered,fast --runs 3
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+from langgraph.checkpoint.memory import MemorySaver
+
+from llm_provider import LLM_NODES, MODEL_TIERS, TIER_PROFILES, SUPERVISOR_NODE
+from llm_replay import ReplayChatModel, ReplayLedger, load_cassette, render_placeholders
+from workflow.chat_runner import ChatRunner
+from workflow.checkpoint_serializer import CompactStateSerializer
+
+load_dotenv()
+
+DEFAULT_CASSETTE = "benchmarks/cassettes/intake_basic.json"
+
+
+async def run_intake(cassette: Dict[str, Any], provider: str, profile: str) -> Dict[str, Any]:
+    """Ejecuta una admisión completa del cassette y devuelve sus métricas."""
+    ledger = ReplayLedger()
+    variables = {"run": f"{random.randint(0, 999999):06d}"}
+    node_llms = {
+        node: ReplayChatModel(
+            cassette=cassette,
+            node=node,
+            model=MODEL_TIERS[provider][TIER_PROFILES[profile][node]],
+            variables=variables,
+            ledger=ledger,
+        )
+        for node in LLM_NODES
+    }
+    runner = ChatRunner(node_llms[SUPERVISOR_NODE], MemorySaver(serde=CompactStateSerializer()), str(uuid.uuid4()), node_llms=node_llms)
+
+    start = time.perf_counter()
+    for turn in cassette["turns"]:
+        await runner.handle_message(render_placeholders(turn, [], variables))
+    wall_clock_s = time.perf_counter() - start
+
+    return {
+        "completed": all(llm.exhausted for llm in node_llms.values()),
+        "turns": len(cassette["turns"]),
+        "llm_latency_s": ledger.latency_s,
+        "cost_usd": ledger.cost_usd,
+        "wall_clock_s": wall_clock_s,
+        "calls": [call.model_dump() for call in ledger.calls],
+    }
+
+
+def summarize(profile: str, provider: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    completed = [r for r in results if r["completed"]]
+    by_node: Dict[str, Dict[str, Any]] = {}
+    for result in completed:
+        for call in result["calls"]:
+            node = by_node.setdefault(call["node"], {"model": call["model"], "calls": 0, "latency_s": 0.0, "cost_usd": 0.0})
+            node["calls"] += 1
+            node["latency_s"] += call["latency_s"]
+            node["cost_usd"] += call["cost_usd"]
+    n = len(completed) or 1
+    for node in by_node.values():
+        node["calls"] /= n
+        node["latency_s"] /= n
+        node["cost_usd"] /= n
+    return {
+        "profile": profile,
+        "provider": provider,
+        "runs": len(results),
+        "completed": len(completed),
+        "llm_latency_s": sum(r["llm_latency_s"] for r in completed) / n,
+        "cost_usd": sum(r["cost_usd"] for r in completed) / n,
+        "wall_clock_s": sum(r["wall_clock_s"] for r in completed) / n,
+        "by_node": by_node,
+    }
+
+
+def print_report(summaries: List[Dict[str, Any]]):
+    print("\n## Costo y latencia por admisión completa\n")
+    print("| Perfil | Completadas | Latencia LLM (s) | Costo (USD) | Reloj total (s) |")
+    print("| ------ | ----------- | ---------------- | ----------- | --------------- |")
+    for s in summaries:
+        print(f"| {s['profile']} | {s['completed']}/{s['runs']} | {s['llm_latency_s']:.2f} | {s['cost_usd']:.6f} | {s['wall_clock_s']:.2f} |")
+
+    for s in summaries:
+        print(f"\n### Perfil '{s['profile']}' ({s['provider']})\n")
+        print("| Nodo | Modelo | Llamadas | Latencia (s) | Costo (USD) |")
+        print("| ---- | ------ | -------- | ------------ | ----------- |")
+        for node, data in s["by_node"].items():
+            print(f"| {node} | {data['model']} | {data['calls']:.1f} | {data['latency_s']:.2f} | {data['cost_usd']:.6f} |")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compara perfiles de niveles de modelo con el proveedor de replay.")
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE, help="Ruta del cassette a reproducir.")
+    parser.add_argument("--provider", default="groq", choices=list(MODEL_TIERS), help="Proveedor simulado.")
+    parser.add_argument("--profiles", default=",".join(TIER_PROFILES), help="Perfiles a comparar, separados por coma.")
+    parser.add_argument("--runs", type=int, default=3, help="Admisiones por perfil.")
+    parser.add_argument("--output", help="Archivo JSON donde guardar el resumen.")
+    args = parser.parse_args()
+
+    cassette = load_cassette(args.cassette)
+    summaries = []
+    for profile in args.profiles.split(","):
+        results = [await run_intake(cassette, args.provider, profile) for _ in range(args.runs)]
+        summaries.append(summarize(profile, args.provider, results))
+
+    print_report(summaries)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
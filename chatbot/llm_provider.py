@@ -1,52 +1,207 @@
 import os
-from pydantic import SecretStr
+from typing import Dict, Optional
+from pydantic import BaseModel, Field, SecretStr
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-def get_llm() -> BaseChatModel:
+from workflow.orchestrator_state import NextNode
+
+# Nodos del grafo que invocan a un modelo de lenguaje.
+SUPERVISOR_NODE = "supervisor"
+LLM_NODES = [
+    SUPERVISOR_NODE,
+    NextNode.COLLECT_CLIENT_DATA.value,
+    NextNode.CONFIRM_CLIENT_DATA.value,
+    NextNode.COLLECT_VEHICLE_DATA.value,
+    NextNode.CONFIRM_VEHICLE_DATA.value,
+    NextNode.CHECK_ELIGIBILITY.value,
+    NextNode.GENERATE_RESPONSE.value,
+]
+
+# Modelos por proveedor y nivel. "fast" para clasificación y extracción,
+# "quality" donde la calidad del texto o del uso de herramientas importa.
+MODEL_TIERS: Dict[str, Dict[str, str]] = {
+    "groq": {
+        "fast": "llama-3.1-8b-instant",
+        "quality": "llama-3.3-70b-versatile",
+    },
+    "gemini": {
+        "fast": "gemini-2.0-flash-lite",
+        "quality": "gemini-2.5-flash-lite",
+    },
+}
+
+# Perfiles de asignación de nivel por nodo.
+TIER_PROFILES: Dict[str, Dict[str, str]] = {
+    # Comportamiento original: el modelo grande en todos los nodos.
+    "single": {node: "quality" for node in LLM_NODES},
+    # Enrutamiento y extracción con el modelo rápido; herramientas y respuesta final con el grande.
+    "tiered": {
+        SUPERVISOR_NODE: "fast",
+        NextNode.COLLECT_CLIENT_DATA.value: "fast",
+        NextNode.CONFIRM_CLIENT_DATA.value: "quality",
+        NextNode.COLLECT_VEHICLE_DATA.value: "fast",
+        NextNode.CONFIRM_VEHICLE_DATA.value: "quality",
+        NextNode.CHECK_ELIGIBILITY.value: "fast",
+        NextNode.GENERATE_RESPONSE.value: "quality",
+    },
+    # Todo con el modelo rápido. Útil como cota inferior de costo.
+    "fast": {node: "fast" for node in LLM_NODES},
+}
+
+DEFAULT_TEMPERATURE = 0.1
+
+
+class LLMConfig(BaseModel):
     """
-    Inicializa y devuelve una instancia del modelo de lenguaje_
-    seleccionado mediante variables de entorno.
+    Configuración de modelo para un nodo del grafo.
+    """
+    provider: str = Field(description="Proveedor del modelo ('groq', 'gemini' o 'replay').")
+    model: str = Field(description="Nombre del modelo en el proveedor.")
+    temperature: float = Field(DEFAULT_TEMPERATURE, description="Temperatura de muestreo.")
+    max_tokens: Optional[int] = Field(None, description="Límite de tokens de salida (None = sin límite).")
 
-    Esta función lee la variable de entorno LLM_PROVIDER para decidir_
-    si usar 'groq' o 'gemini'
-    y configura el cliente correspondiente con su respectiva API key.
+
+def _node_env(node: Optional[str], key: str) -> Optional[str]:
+    """Lee `LLM_<NODO>_<KEY>` y, si no existe, `LLM_<KEY>`."""
+    if node:
+        value = os.getenv(f"LLM_{node.upper()}_{key}")
+        if value:
+            return value
+    return os.getenv(f"LLM_{key}")
+
+
+def get_llm_config(node: Optional[str] = None, profile: Optional[str] = None) -> LLMConfig:
+    """
+    Resuelve la configuración de modelo para un nodo.
+
+    Prioridad (de mayor a menor):
+    1. Variables específicas del nodo: `LLM_<NODO>_PROVIDER`, `LLM_<NODO>_MODEL`,
+       `LLM_<NODO>_TEMPERATURE`, `LLM_<NODO>_MAX_TOKENS` y `LLM_<NODO>_TIER`.
+    2. Variables globales: `LLM_MODEL`, `LLM_TEMPERATURE`, `LLM_MAX_TOKENS`.
+    3. El nivel asignado al nodo por el perfil `LLM_TIER_PROFILE` (por defecto 'single').
     """
-    llm_provider = os.getenv("LLM_PROVIDER", "groq").lower()
-    
-    if llm_provider == "gemini":
+    provider = (_node_env(node, "PROVIDER") or "groq").lower()
+    # El proveedor 'replay' simula los modelos de otro proveedor sin llamadas de red.
+    tier_provider = os.getenv("LLM_REPLAY_PROVIDER", "groq").lower() if provider == "replay" else provider
+
+    if tier_provider not in MODEL_TIERS:
+        raise ValueError(
+            f"Proveedor de LLM no válido: '{tier_provider}'. "
+            f"Las opciones válidas son: {', '.join(MODEL_TIERS)} o 'replay'."
+        )
+
+    profile_name = (profile or os.getenv("LLM_TIER_PROFILE", "single")).lower()
+    if profile_name not in TIER_PROFILES:
+        raise ValueError(
+            f"Perfil de niveles no válido: '{profile_name}'. "
+            f"Las opciones válidas son: {', '.join(TIER_PROFILES)}."
+        )
+
+    tier = _node_env(node, "TIER") if node else None
+    tier = (tier or TIER_PROFILES[profile_name].get(node or "", "quality")).lower()
+    if tier not in MODEL_TIERS[tier_provider]:
+        raise ValueError(f"Nivel de modelo no válido: '{tier}'. Las opciones válidas son 'fast' o 'quality'.")
+
+    model = _node_env(node, "MODEL") or MODEL_TIERS[tier_provider][tier]
+    temperature = _node_env(node, "TEMPERATURE")
+    max_tokens = _node_env(node, "MAX_TOKENS")
+
+    return LLMConfig(
+        provider=provider,
+        model=model,
+        temperature=float(temperature) if temperature else DEFAULT_TEMPERATURE,
+        max_tokens=int(max_tokens) if max_tokens else None,
+    )
+
+
+def build_llm(config: LLMConfig, node: Optional[str] = None) -> BaseChatModel:
+    """
+    Construye el cliente del modelo descrito por `config`.
+    """
+    if config.provider == "gemini":
         gemini_api_key = os.getenv("GEMINI_API_KEY")
         if not gemini_api_key:
             raise ValueError(
                 "La variable de entorno GEMINI_API_KEY no está configurada. "
                 "Por favor, asegúrate de que esté definida en tu archivo .env."
             )
-        print("--- Usando Gemini ---")
         return ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-lite",
+            model=config.model,
             google_api_key=gemini_api_key,
-            temperature=0.1,
+            temperature=config.temperature,
+            max_output_tokens=config.max_tokens,
             convert_system_message_to_human=True
         )
-        
-    elif llm_provider == "groq":
+
+    elif config.provider == "groq":
         groq_api_key = os.getenv("GROQ_API_KEY")
         if not groq_api_key:
             raise ValueError(
                 "La variable de entorno GROQ_API_KEY no está configurada. "
                 "Por favor, asegúrate de que esté definida en tu archivo .env."
             )
-        print("--- Usando Groq ---")
         return ChatGroq(
-            model="llama-3.3-70b-versatile",
+            model=config.model,
             api_key=SecretStr(groq_api_key),
-            temperature=0.1,
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
         )
-    
+
+    elif config.provider == "replay":
+        from llm_replay import ReplayChatModel, load_cassette
+
+        cassette_path = os.getenv("LLM_REPLAY_CASSETTE")
+        if not cassette_path:
+            raise ValueError(
+                "La variable de entorno LLM_REPLAY_CASSETTE no está configurada. "
+                "Es necesaria para usar el proveedor 'replay'."
+            )
+        return ReplayChatModel(
+            cassette=load_cassette(cassette_path),
+            node=node or SUPERVISOR_NODE,
+            model=config.model,
+            max_tokens=config.max_tokens,
+        )
+
     else:
         raise ValueError(
-            f"Proveedor de LLM no válido: '{llm_provider}'. "
-            "Las opciones válidas son 'groq' o 'gemini'."
-        )
\ No newline at end of file
+            f"Proveedor de LLM no válido: '{config.provider}'. "
+            "Las opciones válidas son 'groq', 'gemini' o 'replay'."
+        )
+
+
+def get_llm(node: Optional[str] = None) -> BaseChatModel:
+    """
+    Inicializa y devuelve una instancia del modelo de lenguaje_
+    seleccionado mediante variables de entorno.
+
+    Esta función lee la variable de entorno LLM_PROVIDER para decidir_
+    si usar 'groq' o 'gemini'
+    y configura el cliente correspondiente con su respectiva API key.
+    Si se indica `node`, aplica la configuración por nodo (ver `get_llm_config`).
+    """
+    config = get_llm_config(node)
+    print(f"--- Usando {config.provider} ({config.model}) ---")
+    return build_llm(config, node)
+
+
+def get_node_llms(profile: Optional[str] = None) -> Dict[str, BaseChatModel]:
+    """
+    Devuelve un modelo por cada nodo del grafo que usa LLM.
+
+    Los nodos con configuración idéntica comparten la misma instancia.
+    """
+    configs = {node: get_llm_config(node, profile) for node in LLM_NODES}
+    instances: Dict[str, BaseChatModel] = {}
+    node_llms: Dict[str, BaseChatModel] = {}
+    for node, config in configs.items():
+        # El proveedor 'replay' mantiene un cursor por nodo, no se comparte.
+        key = config.model_dump_json() if config.provider != "replay" else node
+        if key not in instances:
+            print(f"--- Nodo '{node}': {config.provider} ({config.model}) ---")
+            instances[key] = build_llm(config, node)
+        node_llms[node] = instances[key]
+    return node_llms
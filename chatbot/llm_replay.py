@@ -0,0 +1,253 @@
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, PrivateAttr
+from langchain_core.callbacks import BaseCallbackHandler, CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult, LLMResult
+
+from logger import logger
+
+UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(uuid:\d+|\w+)\}\}")
+
+
+class ModelProfile(BaseModel):
+    """
+    Perfil de latencia y precio de un modelo, usado por el proveedor de replay.
+    Los valores son referenciales (precios de lista y velocidades publicadas).
+    """
+    ttft_s: float = Field(description="Tiempo hasta el primer token, en segundos.")
+    output_tokens_per_s: float = Field(description="Velocidad de generación, en tokens por segundo.")
+    input_usd_per_mtok: float = Field(description="Precio por millón de tokens de entrada (USD).")
+    output_usd_per_mtok: float = Field(description="Precio por millón de tokens de salida (USD).")
+
+
+MODEL_PROFILES: Dict[str, ModelProfile] = {
+    "llama-3.3-70b-versatile": ModelProfile(ttft_s=0.30, output_tokens_per_s=275, input_usd_per_mtok=0.59, output_usd_per_mtok=0.79),
+    "llama-3.1-8b-instant": ModelProfile(ttft_s=0.15, output_tokens_per_s=750, input_usd_per_mtok=0.05, output_usd_per_mtok=0.08),
+    "gemini-2.5-flash-lite": ModelProfile(ttft_s=0.35, output_tokens_per_s=400, input_usd_per_mtok=0.10, output_usd_per_mtok=0.40),
+    "gemini-2.0-flash-lite": ModelProfile(ttft_s=0.30, output_tokens_per_s=350, input_usd_per_mtok=0.075, output_usd_per_mtok=0.30),
+}
+
+
+class LLMCall(BaseModel):
+    """Registro de una llamada simulada al modelo."""
+    node: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    latency_s: float
+    cost_usd: float
+
+
+class ReplayLedger:
+    """
+    Acumula las llamadas simuladas de uno o más modelos de replay.
+    """
+    def __init__(self):
+        self.calls: List[LLMCall] = []
+
+    def record(self, call: LLMCall):
+        self.calls.append(call)
+
+    @property
+    def latency_s(self) -> float:
+        return sum(call.latency_s for call in self.calls)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(call.cost_usd for call in self.calls)
+
+
+def load_cassette(path: str) -> Dict[str, Any]:
+    """
+    Carga un cassette de replay.
+
+    Formato: `{"turns": [str], "responses": {nodo: [{"content": str, "tool_calls": [{"name", "args"}]}]}}`.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimación aproximada de tokens (~4 caracteres por token)."""
+    return len(text) // 4 + 1
+
+
+def render_placeholders(value: Any, prompt_uuids: List[str], variables: Dict[str, str]) -> Any:
+    """
+    Reemplaza los placeholders de un valor grabado.
+
+    - `{{uuid:N}}`: el N-ésimo UUID que aparece en el prompt actual (IDs que el modelo copia del contexto).
+    - `{{nombre}}`: el valor de `variables[nombre]`.
+    """
+    if isinstance(value, str):
+        def replace(match: re.Match) -> str:
+            key = match.group(1)
+            if key.startswith("uuid:"):
+                index = int(key.split(":", 1)[1])
+                return prompt_uuids[index] if index < len(prompt_uuids) else match.group(0)
+            return variables.get(key, match.group(0))
+        return PLACEHOLDER_PATTERN.sub(replace, value)
+    if isinstance(value, list):
+        return [render_placeholders(item, prompt_uuids, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: render_placeholders(item, prompt_uuids, variables) for key, item in value.items()}
+    return value
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Modelo de lenguaje offline que reproduce las respuestas grabadas de un nodo.
+
+    Cada instancia avanza un cursor sobre `cassette["responses"][node]` y registra
+    tokens, latencia y costo simulados según el perfil de `model`.
+    """
+    cassette: Dict[str, Any]
+    node: str
+    model: str
+    max_tokens: Optional[int] = None
+    variables: Dict[str, str] = Field(default_factory=dict)
+    ledger: Optional[ReplayLedger] = None
+    simulate_latency: bool = False
+
+    _cursor: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    @property
+    def exhausted(self) -> bool:
+        """True si ya se reprodujeron todas las respuestas grabadas del nodo."""
+        return self._cursor >= len(self.cassette.get("responses", {}).get(self.node, []))
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        # Las respuestas ya incluyen las llamadas a herramientas grabadas.
+        return self
+
+    def _next_response(self, messages: List[BaseMessage]) -> tuple[AIMessage, float]:
+        responses = self.cassette.get("responses", {}).get(self.node, [])
+        if self._cursor >= len(responses):
+            raise ValueError(f"El cassette no tiene más respuestas para el nodo '{self.node}'.")
+        recorded = responses[self._cursor]
+        self._cursor += 1
+
+        prompt = _prompt_text(messages)
+        recorded = render_placeholders(recorded, UUID_PATTERN.findall(prompt), self.variables)
+        tool_calls = [
+            {"name": call["name"], "args": call.get("args", {}), "id": call.get("id") or f"call_{uuid.uuid4().hex[:12]}"}
+            for call in recorded.get("tool_calls", [])
+        ]
+
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(recorded.get("content", "") + json.dumps([c["args"] for c in tool_calls]))
+        if self.max_tokens is not None:
+            output_tokens = min(output_tokens, self.max_tokens)
+
+        profile = MODEL_PROFILES.get(self.model)
+        if profile is None:
+            logger.warning(f"---REPLAY: Modelo sin perfil '{self.model}', se asume latencia y costo cero.---")
+            latency_s, cost_usd = 0.0, 0.0
+        else:
+            latency_s = profile.ttft_s + output_tokens / profile.output_tokens_per_s
+            cost_usd = (
+                input_tokens * profile.input_usd_per_mtok + output_tokens * profile.output_usd_per_mtok
+            ) / 1_000_000
+
+        if self.ledger is not None:
+            self.ledger.record(LLMCall(
+                node=self.node,
+                model=self.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency_s=latency_s,
+                cost_usd=cost_usd,
+            ))
+
+        message = AIMessage(
+            content=recorded.get("content", ""),
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return message, latency_s
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message, latency_s = self._next_response(messages)
+        if self.simulate_latency:
+            time.sleep(latency_s)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message, latency_s = self._next_response(messages)
+        if self.simulate_latency:
+            await asyncio.sleep(latency_s)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class CassetteRecorder(BaseCallbackHandler):
+    """
+    Callback que graba las respuestas de los modelos por nodo para luego reproducirlas.
+
+    Los UUIDs que el modelo copia del prompt se guardan como `{{uuid:N}}`.
+    """
+    def __init__(self):
+        self.turns: List[str] = []
+        self.responses: Dict[str, List[Dict[str, Any]]] = {}
+        self._runs: Dict[uuid.UUID, tuple[str, List[str]]] = {}
+
+    def record_turn(self, message: str):
+        self.turns.append(message)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        prompt_uuids = UUID_PATTERN.findall("\n".join(_prompt_text(batch) for batch in messages))
+        self._runs[run_id] = (node, prompt_uuids)
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        node, prompt_uuids = self._runs.pop(run_id, ("unknown", []))
+        message = response.generations[0][0].message
+
+        def anonymize(value: Any) -> Any:
+            if isinstance(value, str) and value in prompt_uuids:
+                return f"{{{{uuid:{prompt_uuids.index(value)}}}}}"
+            if isinstance(value, dict):
+                return {key: anonymize(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [anonymize(item) for item in value]
+            return value
+
+        self.responses.setdefault(node, []).append({
+            "content": message.content if isinstance(message.content, str) else json.dumps(message.content),
+            "tool_calls": [{"name": call["name"], "args": anonymize(call["args"])} for call in getattr(message, "tool_calls", [])],
+        })
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"turns": self.turns, "responses": self.responses}, f, ensure_ascii=False, indent=2, default=str)
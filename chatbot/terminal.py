@@ -1,30 +1,59 @@
+import os
 import uuid
 import asyncio
 from dotenv import load_dotenv
 
-from llm_provider import get_llm
+from llm_provider import get_node_llms, SUPERVISOR_NODE
+from llm_replay import CassetteRecorder
 from langgraph.checkpoint.memory import MemorySaver
 
 from logger import logger
 from workflow.chat_runner import ChatRunner
+from workflow.checkpoint_serializer import CompactStateSerializer
+from workflow.session_inbox import SessionInbox
 
 # Cargar variables de entorno
 load_dotenv()
 
+async def reply(inbox: SessionInbox, prompt: str):
+    """Envía el mensaje a la bandeja e imprime la respuesta, salvo que se haya unido a uno posterior."""
+    try:
+        response = await inbox.submit(prompt)
+    except asyncio.CancelledError:
+        return
+    except Exception as e:
+        logger.error(f"Ocurrió un error durante la ejecución: {e}", exc_info=True)
+        return
+    if response is not None:
+        print(f"Asistente: {response}")
+
 async def run_terminal_chat():
     """
     Inicializa y ejecuta un bucle de chat interactivo en la terminal.
     """
     session_id = str(uuid.uuid4())
+    # Si se define LLM_RECORD_CASSETTE, la sesión se graba para el proveedor 'replay'.
+    record_path = os.getenv("LLM_RECORD_CASSETTE")
+    recorder = CassetteRecorder() if record_path else None
 
     logger.debug("--- Asistente de Admisión (Terminal) ---")
     logger.debug("El asistente se está inicializando...")
 
     try:
         # Inicializar el runner y el grafo subyacente
-        memory = MemorySaver()
-        llm = get_llm()
-        runner = ChatRunner(llm, memory, session_id)
+        memory = MemorySaver(serde=CompactStateSerializer())
+        node_llms = get_node_llms()
+        runner = ChatRunner(
+            node_llms[SUPERVISOR_NODE],
+            memory,
+            session_id,
+            node_llms=node_llms,
+            callbacks=[recorder] if recorder else None,
+        )
+        # Los mensajes pasan por la bandeja de la sesión: si el usuario escribe mientras el
+        # asistente responde, el turno en curso se cancela y se responde a todo junto.
+        inbox = SessionInbox(runner)
+        replies = set()
         logger.debug("¡Asistente listo! Escribe 'salir' para terminar.")
         print("-" * 40)
 
@@ -42,10 +71,14 @@ async def run_terminal_chat():
             if not prompt.strip():
                 continue
 
-            # Llamar al manejador de mensajes del grafo
-            response = await runner.handle_message(prompt)
-            
-            print(f"Asistente: {response}")
+            if recorder:
+                # Al grabar, cada mensaje es un turno: se espera la respuesta antes de leer el siguiente.
+                recorder.record_turn(prompt)
+                await reply(inbox, prompt)
+            else:
+                task = asyncio.create_task(reply(inbox, prompt))
+                replies.add(task)
+                task.add_done_callback(replies.discard)
 
         except KeyboardInterrupt:
             logger.debug("Fin de la sesión (interrupción manual).")
@@ -53,5 +86,11 @@ async def run_terminal_chat():
         except Exception as e:
             logger.error(f"Ocurrió un error durante la ejecución: {e}", exc_info=True)            
 
+    await inbox.close()
+
+    if recorder:
+        recorder.save(record_path)
+        logger.debug(f"Sesión grabada en {record_path}")
+
 if __name__ == "__main__":
     asyncio.run(run_terminal_chat())
\ No newline at end of file
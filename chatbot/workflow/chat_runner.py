@@ -1,14 +1,23 @@
+import time
+from typing import Dict, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph.state import CompiledStateGraph
 from langchain_core.runnables import RunnableConfig
 from langchain.globals import set_debug
+from logger import logger
 from workflow.orchestrator import create_orchestrator
+from api.clients.resilience import WriteTracker, write_scope
+from workflow.turn_budget import BUDGET_KEY, TURN_BUDGET_SECONDS, TurnBudget
 
 
 class ChatRunner:
     """
     Encapsulates the chat workflow, managing the language model, memory, and session.
+
+    Turns of a session must not overlap: front ends that may receive messages concurrently should
+    submit them through `workflow.session_inbox.SessionInbox`, which serializes and merges them.
     """
 
     def __init__(
@@ -16,21 +25,87 @@ class ChatRunner:
         llm: BaseChatModel,
         memory: MemorySaver,
         session_id: str,
+        node_llms: Optional[Dict[str, BaseChatModel]] = None,
+        callbacks: Optional[List[BaseCallbackHandler]] = None,
+        graph: Optional[CompiledStateGraph] = None,
     ):
         self.llm = llm
         self.memory = memory
         self.session_id = session_id
-        # Inicializar tu grafo de LangGraph
-        self.graph: CompiledStateGraph = create_orchestrator(self.llm, self.memory)
+        self.callbacks = callbacks or []
+        # Presupuesto del último turno, con el tiempo de cada nodo y el que lo agotó.
+        self.last_turn_budget: Optional[TurnBudget] = None
+        # Checkpoint from which the next turn starts, set by `rewind`.
+        self._resume_from: Optional[str] = None
+        # API writes of the turn in progress; None between turns.
+        self._writes: Optional[WriteTracker] = None
+        # Inicializar tu grafo de LangGraph (o reutilizar uno ya compilado con la misma memoria)
+        self.graph: CompiledStateGraph = graph or create_orchestrator(self.llm, self.memory, node_llms)
+
+    def get_config(self, budget: Optional[TurnBudget] = None) -> RunnableConfig:
+        """Returns the graph config for this session, carrying the turn budget if given."""
+        configurable = {"thread_id": self.session_id}
+        if self._resume_from is not None:
+            configurable["checkpoint_id"] = self._resume_from
+        if budget is not None:
+            configurable[BUDGET_KEY] = budget
+        return {
+            "configurable": configurable,
+            "callbacks": self.callbacks,
+        }
+
+    async def get_state(self) -> dict:
+        """Returns the current checkpointed state values of this session."""
+        snapshot = await self.graph.aget_state(self.get_config())
+        return snapshot.values
+
+    async def get_checkpoint_id(self) -> Optional[str]:
+        """Returns the id of the latest checkpoint of this session, or None before the first turn."""
+        snapshot = await self.graph.aget_state(self.get_config())
+        return snapshot.config.get("configurable", {}).get("checkpoint_id") if snapshot.config else None
+
+    @property
+    def write_started(self) -> bool:
+        """
+        Whether the turn in progress already sent a write to the API. Rewinding the checkpoint would
+        not undo it, so such a turn must be allowed to finish instead of being cancelled.
+        """
+        return self._writes is not None and self._writes.started
+
+    async def rewind(self, checkpoint_id: Optional[str]):
+        """
+        Discards whatever was checkpointed after `checkpoint_id` (the whole thread if None), e.g. by
+        a cancelled turn: the next turn forks from that checkpoint.
+        """
+        if checkpoint_id is None:
+            await self.memory.adelete_thread(self.session_id)
+        self._resume_from = checkpoint_id
+
+    async def handle_message(self, message: str, deadline: Optional[float] = None):
+        """
+        Handles an incoming message and returns the bot's response.
 
-    async def handle_message(self, message: str):
-        """Handles an incoming message and returns the bot's response."""
-        config: RunnableConfig = {"configurable": {"thread_id": self.session_id}}
+        `deadline` (a `time.monotonic()` instant) bounds the whole turn; by default it is
+        `TURN_BUDGET_SECONDS` from now, and `TURN_BUDGET_SECONDS=0` leaves turns unbounded.
+        """
+        if deadline is None and TURN_BUDGET_SECONDS > 0:
+            deadline = time.monotonic() + TURN_BUDGET_SECONDS
+        budget = TurnBudget(deadline) if deadline is not None else None
+        self.last_turn_budget = budget
+        config = self.get_config(budget)
         set_debug(False)
         
         initial_input = {
             "message": [("user", message)],
         }
         
-        response = await self.graph.ainvoke(initial_input, config)
+        self._writes = WriteTracker()
+        try:
+            with write_scope(self._writes):
+                response = await self.graph.ainvoke(initial_input, config)
+        finally:
+            self._writes = None
+        self._resume_from = None
+        if budget is not None:
+            logger.debug(f"---PRESUPUESTO: {budget.summary()}---")
         return response["messages"][-1].content
\ No newline at end of file
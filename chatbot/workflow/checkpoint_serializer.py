@@ -0,0 +1,143 @@
+import datetime
+import enum
+import uuid
+import zlib
+from typing import Any, Tuple, Type
+
+import ormsgpack
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from pydantic import BaseModel
+
+from workflow.orchestrator_state import ClientResult, ContactType, IdentificationType, NextNode, VehicleResult
+
+# Tipos conocidos del estado. El orden es parte del formato y entra en `schema_fingerprint`.
+ENUM_TYPES: Tuple[Type[enum.Enum], ...] = (IdentificationType, ContactType, NextNode)
+MODEL_TYPES: Tuple[Type[BaseModel], ...] = (ClientResult, VehicleResult)
+MESSAGE_TYPES: Tuple[Type[BaseMessage], ...] = (HumanMessage, AIMessage, SystemMessage, ToolMessage)
+
+
+def schema_fingerprint() -> str:
+    """
+    Huella del esquema posicional: nombres y orden de los campos de cada modelo, de los miembros
+    de cada enum y de los tipos de mensaje. Cambia si cualquiera de ellos cambia.
+    """
+    schema = (
+        [(model.__name__, list(model.model_fields)) for model in MODEL_TYPES],
+        [(enum_type.__name__, [member.name for member in enum_type]) for enum_type in ENUM_TYPES],
+        [message.__name__ for message in MESSAGE_TYPES],
+    )
+    return f"{zlib.crc32(repr(schema).encode()):08x}"
+
+
+EXT_UUID = 1
+EXT_DATE = 2
+EXT_DATETIME = 3
+EXT_ENUM = 4
+EXT_MODEL = 5
+EXT_MESSAGE = 6
+EXT_TUPLE = 7
+EXT_FALLBACK = 8
+
+PACK_OPTIONS = (
+    ormsgpack.OPT_PASSTHROUGH_UUID
+    | ormsgpack.OPT_PASSTHROUGH_DATETIME
+    | ormsgpack.OPT_PASSTHROUGH_ENUM
+    | ormsgpack.OPT_PASSTHROUGH_SUBCLASS
+    | ormsgpack.OPT_PASSTHROUGH_TUPLE
+    | ormsgpack.OPT_PASSTHROUGH_DATACLASS
+    | ormsgpack.OPT_NON_STR_KEYS
+)
+
+
+class CompactStateSerializer(JsonPlusSerializer):
+    """
+    Serializador de checkpoints que codifica el esquema conocido de `OrchestratorState` en msgpack:
+
+    - enums como (tipo, índice) en 2 bytes,
+    - UUIDs como sus 16 bytes,
+    - fechas como ordinales,
+    - `ClientResult`/`VehicleResult` como listas posicionales de campos,
+    - mensajes como (tipo, campos distintos del valor por defecto).
+
+    Cualquier otro objeto se delega a `JsonPlusSerializer`, y los checkpoints escritos
+    con el serializador por defecto se siguen pudiendo leer.
+
+    Como modelos y enums se guardan por posición, el tipo de cada checkpoint lleva la huella del
+    esquema con que se escribió (`vicpack/<huella>`). Al leer se compara con la actual: un
+    checkpoint de otro esquema se rechaza en lugar de asignar valores a campos equivocados.
+    """
+    TYPE = "vicpack"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.typed_name = f"{self.TYPE}/{schema_fingerprint()}"
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        if obj is None or isinstance(obj, bytes):
+            return super().dumps_typed(obj)
+        return self.typed_name, ormsgpack.packb(obj, default=self._encode, option=PACK_OPTIONS)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ == self.typed_name:
+            return ormsgpack.unpackb(payload, ext_hook=self._decode, option=ormsgpack.OPT_NON_STR_KEYS)
+        if type_.partition("/")[0] == self.TYPE:
+            raise ValueError(
+                f"Checkpoint escrito con otro esquema de estado ({type_}, el actual es {self.typed_name}); "
+                "no se puede leer por posición."
+            )
+        return super().loads_typed(data)
+
+    def _pack(self, value: Any) -> bytes:
+        return ormsgpack.packb(value, default=self._encode, option=PACK_OPTIONS)
+
+    def _encode(self, obj: Any) -> ormsgpack.Ext:
+        if isinstance(obj, uuid.UUID):
+            return ormsgpack.Ext(EXT_UUID, obj.bytes)
+        if isinstance(obj, datetime.datetime):
+            return ormsgpack.Ext(EXT_DATETIME, obj.isoformat().encode())
+        if isinstance(obj, datetime.date):
+            return ormsgpack.Ext(EXT_DATE, self._pack(obj.toordinal()))
+        if isinstance(obj, enum.Enum) and type(obj) in ENUM_TYPES:
+            enum_type = type(obj)
+            return ormsgpack.Ext(EXT_ENUM, bytes([ENUM_TYPES.index(enum_type), list(enum_type).index(obj)]))
+        if type(obj) in MODEL_TYPES:
+            values = [getattr(obj, field) for field in type(obj).model_fields]
+            return ormsgpack.Ext(EXT_MODEL, self._pack([MODEL_TYPES.index(type(obj)), values]))
+        if type(obj) in MESSAGE_TYPES:
+            fields = obj.model_dump(exclude_defaults=True)
+            return ormsgpack.Ext(EXT_MESSAGE, self._pack([MESSAGE_TYPES.index(type(obj)), fields]))
+        if isinstance(obj, tuple):
+            return ormsgpack.Ext(EXT_TUPLE, self._pack(list(obj)))
+        if isinstance(obj, str):
+            # Subclases de str que no son enums conocidos.
+            return str(obj)
+        type_, payload = super().dumps_typed(obj)
+        return ormsgpack.Ext(EXT_FALLBACK, self._pack([type_, payload]))
+
+    def _decode(self, code: int, data: bytes) -> Any:
+        if code == EXT_UUID:
+            return uuid.UUID(bytes=data)
+        if code == EXT_DATE:
+            return datetime.date.fromordinal(self._unpack(data))
+        if code == EXT_DATETIME:
+            return datetime.datetime.fromisoformat(data.decode())
+        if code == EXT_ENUM:
+            return list(ENUM_TYPES[data[0]])[data[1]]
+        if code == EXT_MODEL:
+            type_index, values = self._unpack(data)
+            model_type = MODEL_TYPES[type_index]
+            return model_type.model_construct(**dict(zip(model_type.model_fields, values)))
+        if code == EXT_MESSAGE:
+            type_index, fields = self._unpack(data)
+            return MESSAGE_TYPES[type_index](**fields)
+        if code == EXT_TUPLE:
+            return tuple(self._unpack(data))
+        if code == EXT_FALLBACK:
+            type_, payload = self._unpack(data)
+            return super().loads_typed((type_, payload))
+        raise ValueError(f"Código de extensión desconocido en el checkpoint: {code}")
+
+    def _unpack(self, data: bytes) -> Any:
+        return ormsgpack.unpackb(data, ext_hook=self._decode, option=ormsgpack.OPT_NON_STR_KEYS)
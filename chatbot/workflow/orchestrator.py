@@ -1,5 +1,5 @@
 from functools import partial
-from typing import Literal
+from typing import Dict, List, Literal, Optional, Union
 from logger import logger
 from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.checkpoint.memory import MemorySaver
@@ -7,11 +7,19 @@ from langgraph.graph.state import CompiledStateGraph
 from langgraph.graph import StateGraph, END
 
 from workflow.orchestrator_state import NextNode, OrchestratorState
+from workflow.turn_budget import budgeted
 from workflow.workers.response_generator_worker import create_response_generator_agent, response_generator_node
 from workflow.workers.supervisor_worker import create_supervisor_agent, supervisor_node
 from workflow.workers.client_validator_worker import create_client_validator_agent, client_validator_node
 from workflow.workers.client_confirmation_worker import create_client_confirmation_agent, client_confirmation_node
-from workflow.workers.vehicle_validator_worker import create_vehicle_validator_agent, vehicle_validator_node
+from workflow.workers.vehicle_validator_worker import (
+    create_vehicle_validator_agent,
+    vehicle_validator_node,
+    create_vehicle_extractor_agent,
+    vehicle_extraction_node,
+    vehicle_confirmation_request_node,
+    has_all_vehicle_fields,
+)
 from workflow.workers.vehicle_confirmation_worker import create_vehicle_confirmation_agent, vehicle_confirmation_node
 from workflow.workers.eligibility_worker import create_eligibility_agent, eligibility_check_node
 
@@ -25,8 +33,12 @@ def fallback_node(state: OrchestratorState) -> dict:
     print("---FALLBACK---")
     return {"next_node": NextNode.GENERATE_RESPONSE}
 
+# Nodos internos, no seleccionables por el supervisor
+EXTRACT_VEHICLE_DATA = "extract_vehicle_data"
+REQUEST_VEHICLE_CONFIRMATION = "request_vehicle_confirmation"
+
 # --- Enrutador ---
-def supervisor_router(state: OrchestratorState) -> Literal[
+def supervisor_router(state: OrchestratorState) -> Union[List[str], Literal[
             "call_tool", 
             NextNode.COLLECT_CLIENT_DATA, 
             NextNode.CONFIRM_CLIENT_DATA,
@@ -37,24 +49,51 @@ def supervisor_router(state: OrchestratorState) -> Literal[
             NextNode.FALLBACK,
             "__end__",
             "continue",
-        ]:
+        ]]:
     next_node = state.get('next_node', NextNode.FALLBACK)
+    if next_node == NextNode.COLLECT_CLIENT_DATA and state.get("extract_vehicle_data"):
+        logger.info(f"---ROUTER: Decisión -> {next_node} + {EXTRACT_VEHICLE_DATA} (en paralelo)---")
+        return [NextNode.COLLECT_CLIENT_DATA, EXTRACT_VEHICLE_DATA]
     logger.info(f"---ROUTER: Decisión -> {next_node}---")
     return next_node
+
+def client_confirmation_router(state: OrchestratorState) -> str:
+    """Si el cliente quedó registrado y el vehículo ya fue extraído completo, pide su confirmación en el mismo turno."""
+    client = state.get("client")
+    vehicle = state.get("vehicle")
+    if (
+        client and client.id
+        and vehicle and not vehicle.id
+        and not state.get("confirmation_request")
+        and has_all_vehicle_fields(vehicle)
+    ):
+        return REQUEST_VEHICLE_CONFIRMATION
+    return NextNode.GENERATE_RESPONSE
     
 def create_orchestrator(
         llm: BaseChatModel,
         memory: MemorySaver,
+        node_llms: Optional[Dict[str, BaseChatModel]] = None,
         ) -> CompiledStateGraph:
-    """Crea y compila el grafo orquestador principal."""
-    
-    supervisor_agent = create_supervisor_agent(llm)
-    response_generator_agent = create_response_generator_agent(llm)
-    client_validator_agent = create_client_validator_agent(llm)
-    client_processor_agent = create_client_confirmation_agent(llm)
-    vehicle_validator_agent = create_vehicle_validator_agent(llm)
-    vehicle_confirmation_agent = create_vehicle_confirmation_agent(llm)
-    eligibility_agent = create_eligibility_agent(llm)
+    """
+    Crea y compila el grafo orquestador principal.
+
+    `node_llms` permite asignar un modelo distinto a cada nodo (por nombre);
+    los nodos sin entrada usan `llm`.
+    """
+    node_llms = node_llms or {}
+
+    def llm_for(node: str) -> BaseChatModel:
+        return node_llms.get(node, llm)
+
+    supervisor_agent = create_supervisor_agent(llm_for("supervisor"))
+    response_generator_agent = create_response_generator_agent(llm_for(NextNode.GENERATE_RESPONSE.value))
+    client_validator_agent = create_client_validator_agent(llm_for(NextNode.COLLECT_CLIENT_DATA.value))
+    client_processor_agent = create_client_confirmation_agent(llm_for(NextNode.CONFIRM_CLIENT_DATA.value))
+    vehicle_validator_agent = create_vehicle_validator_agent(llm_for(NextNode.COLLECT_VEHICLE_DATA.value))
+    vehicle_confirmation_agent = create_vehicle_confirmation_agent(llm_for(NextNode.CONFIRM_VEHICLE_DATA.value))
+    vehicle_extractor_agent = create_vehicle_extractor_agent(llm_for(NextNode.COLLECT_VEHICLE_DATA.value))
+    eligibility_agent = create_eligibility_agent(llm_for(NextNode.CHECK_ELIGIBILITY.value))
 
     supervisor_node_partial = partial(supervisor_node, agent=supervisor_agent)
     response_generator_node_partial = partial(
@@ -72,20 +111,30 @@ def create_orchestrator(
     vehicle_confirmation_node_partial = partial(
         vehicle_confirmation_node, agent=vehicle_confirmation_agent
     )
+    vehicle_extraction_node_partial = partial(
+        vehicle_extraction_node, agent=vehicle_extractor_agent
+    )
     eligibility_check_node_partial = partial(
         eligibility_check_node, agent=eligibility_agent
     )
 
     workflow = StateGraph(OrchestratorState)
     
-    workflow.add_node("supervisor", supervisor_node_partial)
-    workflow.add_node(NextNode.COLLECT_CLIENT_DATA, client_validator_node_partial)
-    workflow.add_node(NextNode.CONFIRM_CLIENT_DATA, client_confirmation_node_partial)
-    workflow.add_node(NextNode.COLLECT_VEHICLE_DATA, vehicle_validator_node_partial)
-    workflow.add_node(NextNode.CONFIRM_VEHICLE_DATA, vehicle_confirmation_node_partial)
-    workflow.add_node(NextNode.CHECK_ELIGIBILITY, eligibility_check_node_partial)
-    workflow.add_node(NextNode.FALLBACK, fallback_node)
-    workflow.add_node(NextNode.GENERATE_RESPONSE, response_generator_node_partial)
+    nodes = {
+        "supervisor": supervisor_node_partial,
+        NextNode.COLLECT_CLIENT_DATA: client_validator_node_partial,
+        NextNode.CONFIRM_CLIENT_DATA: client_confirmation_node_partial,
+        NextNode.COLLECT_VEHICLE_DATA: vehicle_validator_node_partial,
+        NextNode.CONFIRM_VEHICLE_DATA: vehicle_confirmation_node_partial,
+        NextNode.CHECK_ELIGIBILITY: eligibility_check_node_partial,
+        EXTRACT_VEHICLE_DATA: vehicle_extraction_node_partial,
+        REQUEST_VEHICLE_CONFIRMATION: vehicle_confirmation_request_node,
+        NextNode.FALLBACK: fallback_node,
+        NextNode.GENERATE_RESPONSE: response_generator_node_partial,
+    }
+    # Cada nodo mide su duración en el presupuesto del turno y limita sus llamadas a la API a ese plazo.
+    for name, node in nodes.items():
+        workflow.add_node(name, budgeted(name, node))
 
     workflow.set_entry_point("supervisor")
 
@@ -100,12 +149,22 @@ def create_orchestrator(
             NextNode.CHECK_ELIGIBILITY: NextNode.CHECK_ELIGIBILITY,
             NextNode.GENERATE_RESPONSE: NextNode.GENERATE_RESPONSE,
             NextNode.FALLBACK: NextNode.FALLBACK,
+            EXTRACT_VEHICLE_DATA: EXTRACT_VEHICLE_DATA,
         },
     )
     
     # Definición de las transiciones entre nodos
     workflow.add_edge(NextNode.COLLECT_CLIENT_DATA, NextNode.GENERATE_RESPONSE)
-    workflow.add_edge(NextNode.CONFIRM_CLIENT_DATA, NextNode.GENERATE_RESPONSE) 
+    workflow.add_conditional_edges(
+        NextNode.CONFIRM_CLIENT_DATA,
+        client_confirmation_router,
+        {
+            REQUEST_VEHICLE_CONFIRMATION: REQUEST_VEHICLE_CONFIRMATION,
+            NextNode.GENERATE_RESPONSE: NextNode.GENERATE_RESPONSE,
+        },
+    )
+    workflow.add_edge(EXTRACT_VEHICLE_DATA, NextNode.GENERATE_RESPONSE)
+    workflow.add_edge(REQUEST_VEHICLE_CONFIRMATION, NextNode.GENERATE_RESPONSE)
     workflow.add_edge(NextNode.COLLECT_VEHICLE_DATA, NextNode.GENERATE_RESPONSE)
     workflow.add_edge(NextNode.CONFIRM_VEHICLE_DATA, NextNode.GENERATE_RESPONSE)
     workflow.add_edge(NextNode.CHECK_ELIGIBILITY, NextNode.GENERATE_RESPONSE)
@@ -29,6 +29,9 @@ class ClientResult(BaseModel):
     email: Optional[str] = Field(None, description="El correo electrónico del usuario.")
     phone_number: Optional[str] = Field(None, description="El número de teléfono del usuario.")
 
+# Campos de ClientResult que se piden a la API (`?fields=`), sin vehículos ni marcas de tiempo.
+CLIENT_RESULT_FIELDS = [field for field in ClientResult.model_fields if field != "id"]
+
 ## Vehículo
 class VehicleResult(BaseModel):
     id: Optional[uuid.UUID] = Field(None, description="El ID único del vehículo en el sistema.")
@@ -72,6 +75,9 @@ class OrchestratorState(TypedDict, total=False):
     # El usuario fue notificado de su elegibilidad
     notify_elegibility: Optional[bool]
 
+    # Resultado de la última evaluación de elegibilidad
+    eligibility_result: Optional[dict]
+
     # Campo para almacenar la lista de datos crudos del supervisor
     raw_extracted_data: Optional[List[str]]
 
@@ -81,6 +87,9 @@ class OrchestratorState(TypedDict, total=False):
     # Indicador para la primera ejecución del supervisor
     is_first_run: Optional[bool]
 
+    # El mensaje incluye también datos del vehículo: se extraen en paralelo a los del cliente
+    extract_vehicle_data: Optional[bool]
+
     next_node: Literal[
             "call_tool", 
             NextNode.COLLECT_CLIENT_DATA, 
@@ -0,0 +1,171 @@
+import enum
+import re
+import uuid
+from typing import Any, Dict, List, Optional
+
+from workflow.orchestrator_state import CLIENT_RESULT_FIELDS, ClientResult, VehicleResult
+from api.clients.client_client import ClientApiClient
+from api.clients.vehicle_client import VehicleApiClient
+from logger import logger
+
+client_api = ClientApiClient()
+vehicle_api = VehicleApiClient()
+
+# DNI (7-8 dígitos, con o sin puntos) y CUIT/CUIL (11 dígitos, con o sin guiones).
+DOCUMENTO_PATTERN = re.compile(r"(?<![\d.-])(\d{1,2}\.?\d{3}\.?\d{3}|\d{2}-?\d{8}-?\d)(?![\d.-])")
+# Patentes Mercosur (AB123CD) y anteriores (ABC123).
+LICENSE_PLATE_PATTERN = re.compile(r"\b([A-Za-z]{2}[\s-]?\d{3}[\s-]?[A-Za-z]{2}|[A-Za-z]{3}[\s-]?\d{3})\b")
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s-]{6,}\d")
+# Dígitos finales que deben coincidir para considerar el mismo teléfono (con o sin código de país o de área).
+PHONE_MATCH_DIGITS = 8
+
+VEHICLE_DESCRIPTIONS = {
+    "license_plate": "patente",
+    "brand": "marca",
+    "model": "modelo",
+    "year": "año",
+    "mileage": "kilometraje",
+}
+
+
+def message_text(message: Any) -> str:
+    """Devuelve el texto del mensaje del usuario, sea un string o una lista de tuplas (rol, contenido)."""
+    if isinstance(message, str):
+        return message
+    if isinstance(message, list):
+        return " ".join(str(item[1]) if isinstance(item, tuple) else str(item) for item in message)
+    return str(getattr(message, "content", message or ""))
+
+
+def find_documentos(text: str) -> List[str]:
+    """Extrae los candidatos a número de documento del texto, sin puntos ni guiones."""
+    return [re.sub(r"[.-]", "", match) for match in DOCUMENTO_PATTERN.findall(text)]
+
+
+def find_license_plates(text: str) -> List[str]:
+    """Extrae los candidatos a patente del texto, en mayúsculas y sin espacios ni guiones."""
+    return [re.sub(r"[\s-]", "", match).upper() for match in LICENSE_PLATE_PATTERN.findall(text)]
+
+
+def find_emails(text: str) -> List[str]:
+    return [email.lower() for email in EMAIL_PATTERN.findall(text)]
+
+
+def find_phone_numbers(text: str) -> List[str]:
+    """Extrae los candidatos a teléfono del texto, solo con sus dígitos."""
+    return [re.sub(r"\D", "", match) for match in PHONE_PATTERN.findall(text)]
+
+
+def _same_phone(a: Optional[str], b: Optional[str]) -> bool:
+    a, b = re.sub(r"\D", "", a or ""), re.sub(r"\D", "", b or "")
+    if min(len(a), len(b)) < PHONE_MATCH_DIGITS:
+        return False
+    return a[-PHONE_MATCH_DIGITS:] == b[-PHONE_MATCH_DIGITS:]
+
+
+def matches_second_identifier(client: ClientResult, text: str, known: Optional[ClientResult] = None) -> bool:
+    """
+    Verifica que el usuario haya indicado, además del documento, el correo o el teléfono registrados
+    (en este mensaje o en los datos ya recolectados en la conversación).
+    """
+    emails = set(find_emails(text))
+    phones = [phone for phone in find_phone_numbers(text) if phone != (client.documento or "")]
+    if known is not None:
+        if known.email:
+            emails.add(known.email.lower())
+        if known.phone_number:
+            phones.append(known.phone_number)
+    if client.email and client.email.lower() in emails:
+        return True
+    return any(_same_phone(client.phone_number, phone) for phone in phones)
+
+
+async def lookup_client(text: str, known: Optional[ClientResult] = None) -> Optional[ClientResult]:
+    """
+    Busca un cliente existente por cualquiera de los documentos mencionados en el texto.
+
+    El documento solo no alcanza: el registro se devuelve únicamente si el usuario indicó también su
+    correo o su teléfono registrados (`matches_second_identifier`). Si no, no se revela que exista.
+    """
+    for documento in find_documentos(text):
+        try:
+            client = await client_api.get_client_by_documento(
+                documento, fields=CLIENT_RESULT_FIELDS, include_vehicles=False
+            )
+        except Exception as e:
+            logger.warning(f"---LOOKUP: No se pudo consultar el documento {documento}: {e}---")
+            return None
+        if client:
+            result = ClientResult(**client.model_dump())
+            if not matches_second_identifier(result, text, known):
+                logger.debug("---LOOKUP: Documento registrado sin un segundo dato coincidente, no se precarga---")
+                return None
+            logger.debug("---LOOKUP: Cliente existente encontrado y verificado con un segundo dato---")
+            return result
+    return None
+
+
+async def lookup_vehicle(text: str, client_id: uuid.UUID) -> Optional[VehicleResult]:
+    """Busca un vehículo del cliente cuya patente se mencione en el texto."""
+    plates = find_license_plates(text)
+    if not plates:
+        return None
+    try:
+        vehicles = await vehicle_api.get_vehicles_by_license_plates(plates)
+    except Exception as e:
+        logger.warning(f"---LOOKUP: No se pudieron consultar las patentes {plates}: {e}---")
+        return None
+    for vehicle in vehicles:
+        # Una patente registrada a otro cliente no se precarga: la confirmación la resolverá.
+        if vehicle.client_id == client_id:
+            logger.debug(f"---LOOKUP: Vehículo existente encontrado con patente {vehicle.license_plate}---")
+            return VehicleResult(**vehicle.model_dump())
+    return None
+
+
+def _confirmation_request(record: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        key: str(value.value if isinstance(value, enum.Enum) else value)
+        for key, value in record.items()
+        if value is not None
+    }
+
+
+def prefill_client(client: ClientResult) -> Dict[str, Any]:
+    """
+    Construye la actualización de estado que precarga un cliente existente y pide su confirmación.
+
+    El mensaje no repite los datos guardados: solo informa que el documento y el segundo dato que
+    indicó el usuario coinciden con un registro. El `id` se guarda solo en la solicitud de
+    confirmación: el cliente se da por completo recién cuando el usuario confirma y el agente de
+    confirmación lo recupera.
+    """
+    message = (
+        "Encontramos un registro con el documento y el dato de contacto que indicaste. "
+        "¿Quieres continuar con esos datos?\n\n"
+        "Responde 'sí' para confirmar o 'no' para cargarlos de nuevo."
+    )
+    return {
+        "client": client.model_copy(update={"id": None}),
+        "confirmation_request": _confirmation_request(client.model_dump()),
+        "base_message": [message],
+    }
+
+
+def prefill_vehicle(vehicle: VehicleResult) -> Dict[str, Any]:
+    """
+    Construye la actualización de estado que precarga un vehículo existente y pide su confirmación.
+    Solo se precargan vehículos del cliente ya confirmado, así que se muestran sus datos.
+    """
+    confirmation_request = _confirmation_request(vehicle.model_dump())
+    message = (
+        "Encontramos los datos de tu vehículo ya registrados. Por favor, confirma si siguen siendo correctos:\n"
+        + "\n".join(f"{VEHICLE_DESCRIPTIONS[key]}: {value}" for key, value in confirmation_request.items() if key in VEHICLE_DESCRIPTIONS)
+        + "\n\nResponde 'sí' para confirmar o 'no' para corregir."
+    )
+    return {
+        "vehicle": vehicle.model_copy(update={"id": None}),
+        "confirmation_request": confirmation_request,
+        "base_message": [message],
+    }
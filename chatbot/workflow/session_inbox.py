@@ -0,0 +1,149 @@
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from logger import logger
+from workflow.chat_runner import ChatRunner
+
+# Espera antes de arrancar un turno para juntar los mensajes que llegan en ráfaga.
+INBOX_DEBOUNCE_SECONDS = float(os.getenv("INBOX_DEBOUNCE_SECONDS", "0.25"))
+
+Item = Tuple[str, asyncio.Future]
+
+
+class InboxStats:
+    def __init__(self):
+        self.messages = 0
+        self.turns = 0
+        self.merged = 0
+        self.cancelled = 0
+        # Turnos que no se cancelaron porque ya habían escrito en la API.
+        self.kept_for_writes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class SessionInbox:
+    """
+    Bandeja de entrada de una sesión, delante de su `ChatRunner`.
+
+    - Serializa los turnos: nunca corren dos `graph.ainvoke` a la vez sobre el mismo `thread_id`.
+    - Los mensajes que llegan mientras un turno espera para arrancar se unen en un único turno.
+    - Si llega un mensaje mientras un turno está en curso, ese turno quedó obsoleto: se cancela,
+      el hilo vuelve al checkpoint previo y sus mensajes se procesan junto con los nuevos.
+    - Salvo que el turno ya haya enviado una escritura a la API (`ChatRunner.write_started`):
+      volver al checkpoint no la desharía, así que el turno termina y los mensajes nuevos
+      forman el turno siguiente.
+
+    `submit` devuelve la respuesta del turno al último mensaje que lo compone; a los anteriores,
+    que se respondieron juntos con él, les devuelve `None`.
+    """
+    def __init__(self, runner: ChatRunner, debounce_seconds: float = INBOX_DEBOUNCE_SECONDS):
+        self.runner = runner
+        self.debounce_seconds = debounce_seconds
+        self.stats = InboxStats()
+        self._pending: List[Item] = []
+        self._worker: Optional[asyncio.Task] = None
+        self._turn: Optional[asyncio.Task] = None
+
+    async def submit(self, message: str) -> Optional[str]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+        self.stats.messages += 1
+        if self._turn is not None and not self._turn.done():
+            if self.runner.write_started:
+                logger.debug(f"---BANDEJA: Nuevo mensaje en la sesión {self.runner.session_id}; el turno en curso ya escribió en la API, se espera a que termine---")
+                self.stats.kept_for_writes += 1
+            else:
+                logger.debug(f"---BANDEJA: Nuevo mensaje en la sesión {self.runner.session_id}, se cancela el turno en curso---")
+                self._turn.cancel()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        while self._pending:
+            if self.debounce_seconds > 0:
+                await asyncio.sleep(self.debounce_seconds)
+            items, self._pending = self._pending, []
+            items = [(message, future) for message, future in items if not future.cancelled()]
+            if not items:
+                continue
+
+            checkpoint_id = None
+            try:
+                checkpoint_id = await self.runner.get_checkpoint_id()
+                self._turn = asyncio.create_task(self.runner.handle_message("\n".join(message for message, _ in items)))
+                response = await self._turn
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    # Se cerró la bandeja, no es un turno obsoleto.
+                    self._fail(items, asyncio.CancelledError())
+                    raise
+                # Turno obsoleto: se descarta lo que haya guardado y sus mensajes se unen a los nuevos.
+                self.stats.cancelled += 1
+                await self.runner.rewind(checkpoint_id)
+                self._pending = items + self._pending
+                continue
+            except Exception as e:
+                logger.error(f"Error en el turno de la sesión {self.runner.session_id}: {e}", exc_info=True)
+                self._fail(items, e)
+                continue
+            finally:
+                self._turn = None
+
+            self.stats.turns += 1
+            self.stats.merged += len(items) - 1
+            for _, future in items[:-1]:
+                if not future.done():
+                    future.set_result(None)
+            if not items[-1][1].done():
+                items[-1][1].set_result(response)
+
+    @staticmethod
+    def _fail(items: List[Item], error: BaseException):
+        for _, future in items:
+            if not future.done():
+                if isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+
+    async def close(self):
+        """
+        Cancela el turno en curso (aunque haya empezado a escribir) y descarta los mensajes pendientes.
+        """
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._fail(self._pending, asyncio.CancelledError())
+        self._pending = []
+
+
+class SessionInboxes:
+    """Una bandeja (y un `ChatRunner`) por sesión, creados a demanda con `runner_factory(session_id)`."""
+    def __init__(self, runner_factory: Callable[[str], ChatRunner], debounce_seconds: float = INBOX_DEBOUNCE_SECONDS):
+        self.runner_factory = runner_factory
+        self.debounce_seconds = debounce_seconds
+        self._inboxes: Dict[str, SessionInbox] = {}
+
+    def get(self, session_id: str) -> SessionInbox:
+        inbox = self._inboxes.get(session_id)
+        if inbox is None:
+            inbox = self._inboxes[session_id] = SessionInbox(self.runner_factory(session_id), self.debounce_seconds)
+        return inbox
+
+    async def submit(self, session_id: str, message: str) -> Optional[str]:
+        return await self.get(session_id).submit(message)
+
+    async def close(self, session_id: Optional[str] = None):
+        """Cierra la bandeja de `session_id`, o todas si no se indica."""
+        session_ids = [session_id] if session_id is not None else list(self._inboxes)
+        for key in session_ids:
+            inbox = self._inboxes.pop(key, None)
+            if inbox is not None:
+                await inbox.close()
@@ -1,15 +1,18 @@
 import datetime
 import uuid
-from typing import Optional, List
+from typing import Literal, Optional, List
 from langchain_core.tools import tool, BaseTool
 from typing import Annotated
 
-from ..orchestrator_state import ClientResult, IdentificationType
+from ..orchestrator_state import CLIENT_RESULT_FIELDS, ClientResult, IdentificationType
 from api.clients.client_client import ClientApiClient
-from api.requests.client_request import ClientRequest, IdentificationType as RequestIdentificationType
+from api.requests.client_request import ClientRequest, ClientPatchRequest, IdentificationType as RequestIdentificationType
 
 api_client = ClientApiClient()
 
+# Datos opcionales del cliente que se pueden borrar; el documento y el correo son obligatorios.
+ClearableClientField = Literal["name", "last_name", "birth_date", "phone_number"]
+
 def client_tool() -> List[BaseTool]:
 
     @tool(description="Consulta un cliente por su número de documento. Retorna None si no existe.")
@@ -17,13 +20,14 @@ def client_tool() -> List[BaseTool]:
         documento: Annotated[str, "El número de documento del cliente."]
     ) -> Optional[ClientResult]:
         """Busca un cliente por su número de documento y retorna una instancia de ClientResult o None si no existe."""
-        clients = await api_client.get_all_clients()
-        for client in clients:
-            if client.documento == documento:
-                return ClientResult(**client.model_dump())
+        client = await api_client.get_client_by_documento(
+            documento, fields=CLIENT_RESULT_FIELDS, include_vehicles=False
+        )
+        if client:
+            return ClientResult(**client.model_dump())
         return None
 
-    @tool(description="Genera un nuevo cliente con todos sus datos.")
+    @tool(description="Registra un cliente con todos sus datos. Si ya existe uno con el mismo documento y el mismo correo o teléfono, actualiza sus datos en lugar de duplicarlo; si el documento está registrado con otro correo y otro teléfono, no modifica nada y retorna None.")
     async def insert_client(
         name: Annotated[str, "El nombre de pila del usuario."],
         last_name: Annotated[str, "El apellido del usuario."],
@@ -32,8 +36,8 @@ def client_tool() -> List[BaseTool]:
         documento_type: Annotated[IdentificationType, "El tipo de documento (DNI, CUIT o CUIL)."],
         email: Annotated[str, "El correo electrónico del usuario."],
         phone_number: Annotated[str, "El número de teléfono del usuario."]
-    ) -> ClientResult:
-        """Genera internamente un cliente y lo guarda en la base de datos en memoria."""
+    ) -> Optional[ClientResult]:
+        """Registra el cliente a través de la API con un upsert por documento; None si sus datos de contacto no coinciden."""
         client_data = ClientRequest(
             name=name,
             last_name=last_name,
@@ -43,10 +47,12 @@ def client_tool() -> List[BaseTool]:
             email=email,
             phone_number=phone_number
         )
-        created_client = await api_client.create_client(client_data)
+        created_client = await api_client.upsert_client(client_data)
+        if created_client is None:
+            return None
         return ClientResult(**created_client.model_dump())
 
-    @tool(description="Actualiza los datos de un cliente existente.")
+    @tool(description="Actualiza los datos de un cliente existente. Solo se modifican los campos indicados; para borrar un dato opcional, indícalo en `clear_fields`.")
     async def update_client(
         client_id: Annotated[uuid.UUID, "El ID del cliente a actualizar."],
         name: Annotated[Optional[str], "El nombre de pila del usuario."] = None,
@@ -55,33 +61,28 @@ def client_tool() -> List[BaseTool]:
         documento: Annotated[Optional[str], "El número de documento del usuario."] = None,
         documento_type: Annotated[Optional[IdentificationType], "El tipo de documento (DNI, CUIT o CUIL)."] = None,
         email: Annotated[Optional[str], "El correo electrónico del usuario."] = None,
-        phone_number: Annotated[Optional[str], "El número de teléfono del usuario."] = None
+        phone_number: Annotated[Optional[str], "El número de teléfono del usuario."] = None,
+        clear_fields: Annotated[
+            Optional[List[ClearableClientField]], "Campos que el usuario pidió borrar (nombre, apellido, fecha de nacimiento o teléfono)."
+        ] = None
     ) -> ClientResult:
-        """Actualiza internamente los datos de un cliente."""
-        client_to_update = await api_client.get_client(client_id)
-        if not client_to_update:
-            raise ValueError(f"No se encontró un cliente con el ID {client_id}")
-
-        update_data = client_to_update.model_dump()
-        if name:
-            update_data['name'] = name
-        if last_name:
-            update_data['last_name'] = last_name
-        if birth_date:
-            update_data['birth_date'] = birth_date
-        if documento:
-            update_data['documento'] = documento
-        if documento_type:
-            update_data['documento_type'] = RequestIdentificationType(documento_type.value)
-        if email:
-            update_data['email'] = email
-        if phone_number:
-            update_data['phone_number'] = phone_number
-        
-        client_request = ClientRequest(**update_data)
-        updated_client = await api_client.update_client(client_id, client_request)
+        """Actualiza internamente solo los datos indicados de un cliente y borra los de `clear_fields`."""
+        values = {
+            "name": name,
+            "last_name": last_name,
+            "birth_date": birth_date,
+            "documento": documento,
+            "documento_type": documento_type,
+            "email": email,
+            "phone_number": phone_number,
+        }
+        # Un argumento omitido llega en None: solo se envía en null si se pidió borrarlo.
+        changes = {key: value for key, value in values.items() if value is not None}
+        changes.update({field: None for field in clear_fields or []})
+        client_patch = ClientPatchRequest(**changes)
+        updated_client = await api_client.update_client(client_id, client_patch)
         if not updated_client:
-            raise ValueError(f"No se pudo actualizar el cliente con el ID {client_id}")
+            raise ValueError(f"No se encontró un cliente con el ID {client_id}")
         return ClientResult(**updated_client.model_dump())
 
     return [query_client, insert_client, update_client]
\ No newline at end of file
@@ -1,18 +1,40 @@
 import uuid
-from typing import List, Dict
+from typing import List, Dict, Optional
 from langchain_core.tools import tool, BaseTool
 from typing import Annotated
 from pydantic import BaseModel
 
 from api.clients.eligibility_client import EligibilityApiClient
+from api.responses.eligibility_response import EligibilityResponse
 
 class EligibilityResult(BaseModel):
     is_eligible: bool
     message: str
     checked_criteria: Dict[str, str]
+    client_id: Optional[uuid.UUID] = None
+    vehicle_id: Optional[uuid.UUID] = None
 
 api_client = EligibilityApiClient()
 
+def to_eligibility_result(
+    eligibility_response: EligibilityResponse, client_id: uuid.UUID, vehicle_id: uuid.UUID
+) -> EligibilityResult:
+    """Convierte la respuesta de la API, separando los motivos con formato 'criterio: detalle'."""
+    checked_criteria = {}
+    if eligibility_response.reasons:
+        for reason in eligibility_response.reasons:
+            if ':' in reason:
+                key, value = reason.split(':', 1)
+                checked_criteria[key.strip()] = value.strip()
+
+    return EligibilityResult(
+        is_eligible=eligibility_response.is_eligible,
+        message=eligibility_response.message,
+        checked_criteria=checked_criteria,
+        client_id=client_id,
+        vehicle_id=vehicle_id,
+    )
+
 def eligibility_tool() -> List[BaseTool]:
     """
     Retorna la lista de herramientas para la evaluación de elegibilidad.
@@ -27,19 +49,7 @@ def eligibility_tool() -> List[BaseTool]:
         """
         try:
             eligibility_response = await api_client.check_eligibility(client_id, vehicle_id)
-            
-            checked_criteria = {}
-            if eligibility_response.reasons:
-                for reason in eligibility_response.reasons:
-                    if ':' in reason:
-                        key, value = reason.split(':', 1)
-                        checked_criteria[key.strip()] = value.strip()
-
-            return EligibilityResult(
-                is_eligible=eligibility_response.is_eligible,
-                message=eligibility_response.message,
-                checked_criteria=checked_criteria
-            )
+            return to_eligibility_result(eligibility_response, client_id, vehicle_id)
         except Exception as e:
             return EligibilityResult(
                 is_eligible=False,
@@ -0,0 +1,63 @@
+from contextvars import ContextVar
+from typing import Annotated, List, Optional
+from langchain_core.tools import tool, BaseTool
+from pydantic import BaseModel, ValidationError
+
+from ..orchestrator_state import ClientResult, VehicleResult
+from .eligibility_tool import EligibilityResult, to_eligibility_result
+from api.clients.intake_client import IntakeApiClient
+from api.requests.client_request import ClientRequest
+from api.requests.intake_request import IntakeRequest, IntakeVehicleRequest
+
+api_client = IntakeApiClient()
+
+# Cliente ya confirmado del turno en curso. Lo fija el nodo antes de invocar al agente, para que
+# la herramienta no dependa de que el LLM repita todos sus datos.
+confirmed_client: ContextVar[Optional[ClientResult]] = ContextVar("confirmed_client", default=None)
+
+class IntakeResult(BaseModel):
+    client: ClientResult
+    vehicle: VehicleResult
+    eligibility: EligibilityResult
+
+def build_intake_request(client: Optional[ClientResult], vehicle: Optional[VehicleResult]) -> Optional[IntakeRequest]:
+    """Arma la admisión si el cliente y el vehículo tienen todos sus datos; si no, devuelve None."""
+    if not client or not vehicle:
+        return None
+    try:
+        return IntakeRequest(
+            client=ClientRequest(**client.model_dump(exclude={"id"})),
+            vehicle=IntakeVehicleRequest(**vehicle.model_dump(exclude={"id"})),
+        )
+    except ValidationError:
+        return None
+
+async def run_intake(intake_data: IntakeRequest) -> IntakeResult:
+    """Registra cliente y vehículo y evalúa la elegibilidad en una sola llamada a la API."""
+    response = await api_client.intake(intake_data)
+    return IntakeResult(
+        client=ClientResult(id=response.client_id, **intake_data.client.model_dump()),
+        vehicle=VehicleResult(id=response.vehicle_id, **intake_data.vehicle.model_dump()),
+        eligibility=to_eligibility_result(response.eligibility, response.client_id, response.vehicle_id),
+    )
+
+def intake_tool() -> List[BaseTool]:
+    """
+    Retorna la herramienta que cierra la admisión una vez confirmados todos los datos.
+    """
+    @tool(description="Registra el vehículo confirmado junto con los datos del cliente y evalúa su elegibilidad en una sola operación. Si la patente ya existe, actualiza ese vehículo en lugar de duplicarlo.")
+    async def register_intake(
+        license_plate: Annotated[str, "La patente del vehículo."],
+        brand: Annotated[str, "La marca del vehículo."],
+        model: Annotated[str, "El modelo del vehículo."],
+        year: Annotated[int, "El año de fabricación del vehículo."],
+        mileage: Annotated[int, "El kilometraje del vehículo."]
+    ) -> IntakeResult:
+        """Registra cliente y vehículo a través de POST /api/intake."""
+        vehicle = VehicleResult(license_plate=license_plate, brand=brand, model=model, year=year, mileage=mileage)
+        intake_data = build_intake_request(confirmed_client.get(), vehicle)
+        if intake_data is None:
+            raise ValueError("Faltan datos del cliente para registrar la admisión; usa `insert_vehicle`.")
+        return await run_intake(intake_data)
+
+    return [register_intake]
@@ -0,0 +1,126 @@
+import asyncio
+import inspect
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+from api.clients.resilience import deadline_scope
+from logger import logger
+
+# Tiempo máximo de un turno completo; 0 lo deja sin límite.
+TURN_BUDGET_SECONDS = float(os.getenv("TURN_BUDGET_SECONDS", "15"))
+# Por debajo de este margen la respuesta final no se reformula con el LLM: se arma con una plantilla.
+TURN_REPHRASE_MIN_SECONDS = float(os.getenv("TURN_REPHRASE_MIN_SECONDS", "2"))
+
+BUDGET_KEY = "turn_budget"
+
+
+class TurnBudgetExceeded(TimeoutError):
+    """Se agotó el presupuesto del turno durante una llamada."""
+
+
+class TurnBudget:
+    """
+    Presupuesto de tiempo de un turno. Viaja en `config["configurable"]["turn_budget"]` hasta cada
+    nodo, llamada al LLM y cliente de API, y registra cuánto tardó cada nodo y cuál lo agotó.
+    """
+    def __init__(self, deadline: float):
+        self.started_at = time.monotonic()
+        self.deadline = deadline
+        self.node_seconds: Dict[str, float] = {}
+        self.exhausted_by: Optional[str] = None
+        self.degraded: List[str] = []
+        # Primer nodo tras el cual ya no alcanzaba para reformular la respuesta.
+        self._short_after: Optional[str] = None
+
+    @classmethod
+    def from_seconds(cls, seconds: float) -> "TurnBudget":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def record(self, node: str, seconds: float):
+        self.node_seconds[node] = self.node_seconds.get(node, 0.0) + seconds
+        remaining = self.remaining()
+        if self._short_after is None and remaining < TURN_REPHRASE_MIN_SECONDS:
+            self._short_after = node
+        if self.exhausted_by is None and remaining <= 0:
+            self.exhausted_by = node
+            logger.warning(f"---PRESUPUESTO: El nodo '{node}' agotó el presupuesto del turno---")
+
+    def degrade(self, node: str):
+        """
+        `node` respondió de forma simplificada por falta de presupuesto. Si el plazo no llegó a
+        vencer, se atribuye el agotamiento al nodo que dejó el turno sin margen.
+        """
+        self.degraded.append(node)
+        if self.exhausted_by is None:
+            self.exhausted_by = self._short_after or node
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "elapsed_s": round(time.monotonic() - self.started_at, 4),
+            "remaining_s": round(self.remaining(), 4),
+            "exhausted_by": self.exhausted_by,
+            "degraded": list(self.degraded),
+            "node_seconds": {node: round(seconds, 4) for node, seconds in self.node_seconds.items()},
+        }
+
+
+def budget_from_config(config: Optional[RunnableConfig]) -> Optional[TurnBudget]:
+    if not config:
+        return None
+    return config.get("configurable", {}).get(BUDGET_KEY)
+
+
+def current_budget() -> Optional[TurnBudget]:
+    """Presupuesto del turno en curso, tomado de la configuración del grafo activa."""
+    return budget_from_config(ensure_config())
+
+
+def budgeted(node: str, func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    Envuelve un nodo del grafo: mide su duración en el presupuesto del turno y limita las llamadas
+    a la API que haga al plazo del turno.
+    """
+    node = getattr(node, "value", node)
+
+    async def wrapper(state: Any, config: RunnableConfig) -> Any:
+        budget = budget_from_config(config)
+        if budget is None:
+            result = func(state)
+            return await result if inspect.isawaitable(result) else result
+
+        start = time.monotonic()
+        try:
+            with deadline_scope(budget.deadline):
+                result = func(state)
+                return await result if inspect.isawaitable(result) else result
+        finally:
+            budget.record(node, time.monotonic() - start)
+
+    return wrapper
+
+
+async def within_budget(awaitable: Awaitable[Any]) -> Any:
+    """Espera `awaitable` como máximo hasta el plazo del turno; si no llega, `TurnBudgetExceeded`."""
+    budget = current_budget()
+    if budget is None:
+        return await awaitable
+    remaining = budget.remaining()
+    if remaining <= 0:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise TurnBudgetExceeded("Sin presupuesto para la llamada.")
+    timeout = asyncio.timeout(remaining)
+    try:
+        async with timeout:
+            return await awaitable
+    except TimeoutError as e:
+        if not timeout.expired():
+            raise
+        raise TurnBudgetExceeded(f"La llamada superó los {remaining:.2f}s que quedaban del turno.") from e
@@ -10,8 +10,16 @@ from workflow.orchestrator_state import (
     ClientResult,
 )
 from logger import logger
+from workflow.turn_budget import within_budget
 from workflow.tools.client_tool import client_tool
 
+# `insert_client` no reemplaza un cliente registrado con otro correo y otro teléfono: se vuelven a
+# pedir los datos de contacto para confirmar que el usuario es el titular del documento.
+IDENTITY_CONFLICT_MESSAGE = (
+    "Ese documento ya está registrado con otros datos de contacto, así que no modificamos el registro. "
+    "Para continuar, indícanos el correo electrónico o el teléfono con el que te registraste."
+)
+
 class AgentResponse(BaseModel):
     """Define la respuesta del agente de confirmación."""
     base_message: str = Field(description="El mensaje para enviar al usuario.")
@@ -28,7 +36,8 @@ def create_client_confirmation_agent(llm: BaseChatModel) -> AgentExecutor:
              "1. Si el usuario confirma (responde 'sí', 'correcto', etc.), procede a registrar su información usando las herramientas definidas en el contexto.\n"
              "2. Si el usuario niega (responde 'no', 'incorrecto', etc.), responde con un mensaje amigable pidiéndole que ingrese los datos de nuevo y establece `clear_data` a True.\n"
              "3. Si la respuesta no es clara, pide una aclaración.\n\n"
-             "4. Si el usuario confirma, llamar a la tool correspondiente para insertar o actualizar los datos.\n"
+             "4. Si el usuario confirma, llama directamente a `insert_client` con los datos pendientes, sin consultarlo antes: si el documento ya está registrado con el mismo correo o teléfono (por ejemplo, si los datos incluyen un `id`), actualiza ese cliente en lugar de duplicarlo.\n"
+             "5. Si `insert_client` retorna None, el documento está registrado con otros datos de contacto: no llames a `update_client` ni reintentes; el sistema le pedirá al usuario su correo o teléfono registrado.\n"
              "Datos pendientes de confirmación:\n{confirmation_data}"
             ),
             ("user", "{message}"),
@@ -54,10 +63,10 @@ async def client_confirmation_node(state: OrchestratorState, agent: AgentExecuto
 
     try:
         confirmation_data_str = "\n".join([f"- {k}: {v}" for k, v in confirmation_request.items()])
-        response = await agent.ainvoke({
+        response = await within_budget(agent.ainvoke({
             "message": message,
             "confirmation_data": confirmation_data_str
-        })
+        }))
         
         output = response.get("output", "")
         intermediate_steps = response.get("intermediate_steps", [])
@@ -66,11 +75,19 @@ async def client_confirmation_node(state: OrchestratorState, agent: AgentExecuto
 
         if intermediate_steps:
             logger.debug("---WORKER: Herramientas ejecutadas. Actualizando estado.---")
-            for step in intermediate_steps:
-                tool_output = step[1]
+            identity_conflict = False
+            for action, tool_output in intermediate_steps:
                 if isinstance(tool_output, ClientResult):
                     state_update["client"] = tool_output
-            state_update["base_message"] = [output or "Tus datos han sido registrados."]
+                elif action.tool == "insert_client" and tool_output is None:
+                    identity_conflict = True
+            if identity_conflict and "client" not in state_update:
+                logger.warning("---WORKER: Documento registrado con otros datos de contacto. Se piden de nuevo.---")
+                pending = state.get("client") or ClientResult()
+                state_update["client"] = pending.model_copy(update={"id": None, "email": None, "phone_number": None})
+                state_update["base_message"] = [IDENTITY_CONFLICT_MESSAGE]
+            else:
+                state_update["base_message"] = [output or "Tus datos han sido registrados."]
         else:
             try:
                 parsed_response = AgentResponse.parse_raw(output)
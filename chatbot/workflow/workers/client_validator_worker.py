@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field, field_validator
 
 from workflow.orchestrator_state import IdentificationType, NextNode, OrchestratorState, ClientResult
 from logger import logger
+from workflow.turn_budget import within_budget
 
 class ParsedClientData(BaseModel):
     """Esquema para los datos del cliente extraídos."""
@@ -89,7 +90,7 @@ def create_client_validator_agent(
     agent = prompt | structured_llm
     return agent
 
-def client_validator_node(
+async def client_validator_node(
     state: OrchestratorState,
     agent: RunnableSerializable
 ) -> dict:
@@ -131,12 +132,12 @@ def client_validator_node(
     missing_fields_list = [f"- {FIELD_CONFIG['descriptions'][f]}" for f in ordered_missing_fields]
 
     try:
-        validation_result = agent.invoke({
+        validation_result = await within_budget(agent.ainvoke({
             "message": message,
             "intent_description": intent_description,
             "current_data": str(current_data),
             "missing_fields_list": "\n".join(missing_fields_list) or "Ninguno"
-        })
+        }))
 
         extracted_data = validation_result.parsed_data.dict(exclude_unset=True)
         state_update: Dict[str, Any] = {}
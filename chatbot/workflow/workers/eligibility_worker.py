@@ -5,7 +5,11 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 from workflow.orchestrator_state import OrchestratorState, NextNode
 from logger import logger
-from workflow.tools.eligibility_tool import eligibility_tool, EligibilityResult
+from workflow.turn_budget import within_budget
+from workflow.tools.eligibility_tool import eligibility_tool, EligibilityResult, to_eligibility_result
+from api.clients.eligibility_client import EligibilityApiClient
+
+eligibility_api = EligibilityApiClient()
 
 def create_eligibility_agent(llm: BaseChatModel) -> AgentExecutor:
     """
@@ -34,7 +38,12 @@ def create_eligibility_agent(llm: BaseChatModel) -> AgentExecutor:
 
 async def eligibility_check_node(state: OrchestratorState, agent: AgentExecutor) -> dict:
     """
-    Invoca al agente de elegibilidad y actualiza el estado con el resultado.
+    Evalúa la elegibilidad y actualiza el estado con el resultado.
+
+    Este nodo no escribe: los registros los guarda la confirmación del vehículo. Si esa confirmación
+    ya evaluó a este cliente y vehículo, se reutiliza el resultado; si no, se consulta el endpoint de
+    solo lectura de elegibilidad con sus ids. El agente con la herramienta `check_eligibility` queda
+    como respaldo si la llamada directa falla.
     """
     logger.debug("---WORKER: Evaluación de Elegibilidad---")
 
@@ -47,12 +56,25 @@ async def eligibility_check_node(state: OrchestratorState, agent: AgentExecutor)
             "next_node": NextNode.FALLBACK
         }
 
+    previous = state.get("eligibility_result")
+    if previous and previous.get("client_id") == client.id and previous.get("vehicle_id") == vehicle.id:
+        logger.debug("---WORKER: Elegibilidad ya evaluada en la admisión, se reutiliza---")
+        return {"base_message": [previous["message"]]}
+
+    try:
+        eligibility = await within_budget(eligibility_api.check_eligibility(client.id, vehicle.id))
+        result = to_eligibility_result(eligibility, client.id, vehicle.id)
+        logger.debug(f"---WORKER: Resultado de Elegibilidad -> {result.checked_criteria} ---")
+        return {"base_message": [result.message], "eligibility_result": result.model_dump()}
+    except Exception as e:
+        logger.warning(f"---WORKER: La consulta de elegibilidad falló ({e}); se evalúa con el agente---")
+
     try:
-        response = await agent.ainvoke({
+        response = await within_budget(agent.ainvoke({
             "client_id": str(client.id),
             "vehicle_id": str(vehicle.id),
             "input": "Realizar evaluación de elegibilidad." # Input fijo, ya que no depende del usuario
-        })
+        }))
         
         output = response.get("output", "")
         intermediate_steps = response.get("intermediate_steps", [])
@@ -64,6 +86,7 @@ async def eligibility_check_node(state: OrchestratorState, agent: AgentExecutor)
             if isinstance(tool_output, EligibilityResult):
                 logger.debug(f"---WORKER: Resultado de Elegibilidad -> {tool_output.checked_criteria} ---")
                 state_update["base_message"] = [tool_output.message]
+                state_update["eligibility_result"] = tool_output.model_dump()
             else:
                  state_update["base_message"] = [str(tool_output)]
         else:
@@ -1,12 +1,19 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, HumanMessage
 from langchain_core.runnables import RunnableSerializable
 
-from workflow.orchestrator_state import OrchestratorState
+from workflow.orchestrator_state import NextNode, OrchestratorState
+from workflow.turn_budget import TURN_REPHRASE_MIN_SECONDS, TurnBudgetExceeded, current_budget, within_budget
 from logger import logger
 
+# Instrucciones internas que no pueden mostrarse tal cual cuando se responde sin el LLM.
+TEMPLATE_TEXTS = {
+    "Generar saludo de bienvenida": "¡Hola! Soy el asistente virtual de Vehicle Intake.",
+}
+DEFAULT_TEMPLATE = "Disculpa la demora. ¿Podrías repetir tu último mensaje?"
+
 def create_response_generator_agent(
     llm: BaseChatModel,
 ) -> RunnableSerializable[Dict[str, Any], BaseMessage]:
@@ -45,12 +52,27 @@ def create_response_generator_agent(
     agent = prompt | llm
     return agent
 
-def response_generator_node(
+def template_response(base_message: List[str], name: Optional[str]) -> AIMessage:
+    """
+    Respuesta sin reformular: las instrucciones internas ya son, en su mayoría, preguntas o avisos
+    dirigidos al usuario. Se usa cuando no queda presupuesto para llamar al LLM.
+    """
+    parts = [TEMPLATE_TEXTS.get(instruction, instruction) for instruction in base_message]
+    if not parts:
+        parts = [DEFAULT_TEMPLATE]
+    elif name and base_message[0] in TEMPLATE_TEXTS:
+        parts[0] = parts[0].replace("¡Hola!", f"¡Hola, {name}!")
+    return AIMessage(content="\n\n".join(parts))
+
+async def response_generator_node(
     state: OrchestratorState,
     agent: RunnableSerializable[Dict[str, Any], BaseMessage],
 ) -> dict:
     """
     Ejecuta el agente generador de respuestas y actualiza el estado.
+
+    Si al turno le quedan menos de `TURN_REPHRASE_MIN_SECONDS`, o el LLM no responde a tiempo,
+    devuelve las instrucciones internas como plantilla en lugar de reformularlas.
     """
     logger.debug("---WORKER: Generando Respuesta Final (con Contexto)---")
     
@@ -67,10 +89,21 @@ def response_generator_node(
         f"- El nombre del cliente es: {name}" if name else "ninguno"
     )
 
-    response = agent.invoke({
-        "message": message,
-        "name_client_data": name_client_data,
-        "base_message": instruccion_interna_str
-    })
+    budget = current_budget()
+    if budget is not None and budget.remaining() < TURN_REPHRASE_MIN_SECONDS:
+        logger.warning("---WORKER: Presupuesto insuficiente, se responde con plantilla---")
+        budget.degrade(NextNode.GENERATE_RESPONSE.value)
+        return {"messages": [template_response(base_message or [], name)]}
+
+    try:
+        response = await within_budget(agent.ainvoke({
+            "message": message,
+            "name_client_data": name_client_data,
+            "base_message": instruccion_interna_str
+        }))
+    except TurnBudgetExceeded:
+        logger.warning("---WORKER: El LLM no respondió a tiempo, se responde con plantilla---")
+        budget.degrade(NextNode.GENERATE_RESPONSE.value)
+        response = template_response(base_message or [], name)
     
     return {"messages": [response]}
\ No newline at end of file
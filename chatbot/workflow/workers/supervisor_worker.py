@@ -1,10 +1,20 @@
+import asyncio
 from typing import List, Literal
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from langchain_core.runnables import RunnableSerializable
 from workflow.orchestrator_state import NextNode, OrchestratorState, ClientResult, VehicleResult
+from workflow.record_lookup import (
+    message_text,
+    find_license_plates,
+    lookup_client,
+    lookup_vehicle,
+    prefill_client,
+    prefill_vehicle,
+)
 from logger import logger
+from workflow.turn_budget import within_budget
 from langchain_core.messages import SystemMessage
 
 class SupervisorResponse(BaseModel):
@@ -35,6 +45,10 @@ class SupervisorResponse(BaseModel):
             f"{NextNode.FALLBACK.value}"
         )
     )
+    includes_vehicle_data: bool = Field(
+        default=False,
+        description="True si el mensaje incluye datos del vehículo (patente, marca, modelo, año o kilometraje)."
+    )
     extracted_data: List[str] = Field(
         default_factory=list,
         description=(
@@ -60,7 +74,8 @@ def create_supervisor_agent(
         "**Tu Tarea**:\n"
         "1.  Describe la `intent_description` de forma específica.\n"
         "2.  Extrae los datos crudos en `extracted_data`.\n"
-        "3.  Elige el `next_node` más apropiado de las opciones.\n\n"
+        "3.  Elige el `next_node` más apropiado de las opciones.\n"
+        "4.  Indica en `includes_vehicle_data` si el mensaje contiene datos del vehículo.\n\n"
         "**Contexto Clave:**\n"
         "- Flujo Actual: {flow_context}.\n"
         "- Última Pregunta al Usuario: {last_question}.\n\n"
@@ -102,12 +117,16 @@ def is_vehicle_complete(vehicle: VehicleResult | None) -> bool:
     
     return all(getattr(vehicle, field) is not None for field in required_fields)
 
-def supervisor_node(
+async def supervisor_node(
     state: OrchestratorState,
     agent: RunnableSerializable
 ) -> dict:
     """
     Nodo que ejecuta el supervisor y actualiza el estado.
+
+    Mientras el supervisor decide, busca en paralelo si el documento o la patente
+    mencionados ya están registrados. Si existen, precarga el registro y pasa
+    directamente a pedir su confirmación.
     """
     logger.debug("---SUPERVISOR---")
     
@@ -154,13 +173,20 @@ def supervisor_node(
         + (f" El siguiente paso sugerido es '{determined_next_node.value}'." if determined_next_node else "")
     )
 
+    # Búsqueda anticipada de registros existentes, concurrente con la llamada al LLM.
+    lookup_task: asyncio.Task | None = None
+    if determined_next_node == NextNode.COLLECT_CLIENT_DATA:
+        lookup_task = asyncio.create_task(lookup_client(message_text(message), client_data))
+    elif determined_next_node == NextNode.COLLECT_VEHICLE_DATA and client_data and client_data.id:
+        lookup_task = asyncio.create_task(lookup_vehicle(message_text(message), client_data.id))
+
     try:
-        parsed_response = agent.invoke({
+        parsed_response = await within_budget(agent.ainvoke({
             "message": message,
             "routing_rules_prompt": routing_rules_prompt,
             "last_question": last_question_str,
             "flow_context": flow_context_with_suggestion
-        })
+        }))
 
         if not parsed_response:
             raise ValueError("No se pudo obtener una respuesta estructurada del supervisor.")
@@ -176,18 +202,41 @@ def supervisor_node(
                 logger.warning(f"---SUPERVISOR: Valor de next_node inválido '{next_node_str}', usando fallback. ---")
                 determined_next_node = NextNode.FALLBACK
 
+        # Mensajes densos: si mientras se recolecta el cliente llegan también datos del vehículo,
+        # ambos se extraen en paralelo en este mismo turno.
+        extract_vehicle_data = determined_next_node == NextNode.COLLECT_CLIENT_DATA and (
+            parsed_response.includes_vehicle_data or bool(find_license_plates(message_text(message)))
+        )
+
         update_dict = {
             "next_node": determined_next_node,
             "intent_description": parsed_response.intent_description,
             "raw_extracted_data": parsed_response.extracted_data,
+            "extract_vehicle_data": extract_vehicle_data,
             "base_message": [] 
         }
 
         if state.get("is_first_run", True):
             update_dict["base_message"] = ["Generar saludo de bienvenida"]
             update_dict["is_first_run"] = False
+
+        existing_record = await lookup_task if lookup_task else None
+        if existing_record is not None:
+            logger.debug("---SUPERVISOR: Registro existente encontrado. Saltando a la confirmación.---")
+            prefill = (
+                prefill_client(existing_record)
+                if isinstance(existing_record, ClientResult)
+                else prefill_vehicle(existing_record)
+            )
+            greeting = update_dict["base_message"]
+            update_dict.update(prefill)
+            update_dict["base_message"] = greeting + prefill["base_message"]
+            update_dict["next_node"] = NextNode.GENERATE_RESPONSE
+            update_dict["extract_vehicle_data"] = False
         
         return update_dict
     except Exception as e:
+        if lookup_task:
+            lookup_task.cancel()
         logger.error(f"Error al estructurar la salida del supervisor: {e}", exc_info=True)
         return {"next_node": NextNode.FALLBACK}
\ No newline at end of file
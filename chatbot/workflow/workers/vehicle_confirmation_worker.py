@@ -10,7 +10,9 @@ from workflow.orchestrator_state import (
     VehicleResult,
 )
 from logger import logger
+from workflow.turn_budget import within_budget
 from workflow.tools.vehicle_tool import vehicle_tool
+from workflow.tools.intake_tool import IntakeResult, confirmed_client, intake_tool
 
 class AgentResponse(BaseModel):
     """Define la respuesta del agente de confirmación."""
@@ -19,7 +21,7 @@ class AgentResponse(BaseModel):
 
 def create_vehicle_confirmation_agent(llm: BaseChatModel) -> AgentExecutor:
     """Crea un agente que procesa los datos del vehículo utilizando herramientas."""
-    tools = vehicle_tool()
+    tools = vehicle_tool() + intake_tool()
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -27,7 +29,8 @@ def create_vehicle_confirmation_agent(llm: BaseChatModel) -> AgentExecutor:
              "Tu primera tarea es analizar la respuesta del usuario a una solicitud de confirmación de datos del vehículo.\n"
              "1. Si el usuario confirma (responde 'sí', 'correcto', etc.), procede a registrar la información del vehículo usando las herramientas definidas. Necesitarás el 'client_id' del contexto para ello.\n"
              "2. Si el usuario niega (responde 'no', 'incorrecto', etc.), responde con un mensaje amigable pidiéndole que ingrese los datos de nuevo y establece `clear_data` a True.\n"
-             "3. Si la respuesta no es clara, pide una aclaración.\n\n"
+             "3. Si la respuesta no es clara, pide una aclaración.\n"
+             "4. Para registrar llama directamente a `register_intake`, sin consultarlo antes: registra el vehículo junto con el cliente y evalúa la elegibilidad en una sola operación. Si la patente ya está registrada (por ejemplo, si los datos incluyen un `id`), actualiza ese vehículo en lugar de duplicarlo.\n\n"
              "ID del Cliente para asociar el vehículo: {client_id}\n"
              "Datos pendientes de confirmación:\n{confirmation_data}"
             ),
@@ -62,11 +65,15 @@ async def vehicle_confirmation_node(state: OrchestratorState, agent: AgentExecut
 
     try:
         confirmation_data_str = "\n".join([f"- {k}: {v}" for k, v in confirmation_request.items()])
-        response = await agent.ainvoke({
-            "message": message,
-            "client_id": client.id,
-            "confirmation_data": confirmation_data_str
-        })
+        token = confirmed_client.set(client)
+        try:
+            response = await within_budget(agent.ainvoke({
+                "message": message,
+                "client_id": client.id,
+                "confirmation_data": confirmation_data_str
+            }))
+        finally:
+            confirmed_client.reset(token)
         
         output = response.get("output", "")
         intermediate_steps = response.get("intermediate_steps", [])
@@ -79,6 +86,11 @@ async def vehicle_confirmation_node(state: OrchestratorState, agent: AgentExecut
                 tool_output = step[1]
                 if isinstance(tool_output, VehicleResult):
                     state_update["vehicle"] = tool_output
+                elif isinstance(tool_output, IntakeResult):
+                    # La admisión ya dejó evaluada la elegibilidad: el worker de elegibilidad la reutiliza.
+                    state_update["client"] = tool_output.client
+                    state_update["vehicle"] = tool_output.vehicle
+                    state_update["eligibility_result"] = tool_output.eligibility.model_dump()
             state_update["base_message"] = [output or "Los datos de tu vehículo han sido registrados."]
         else:
             try:
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from workflow.orchestrator_state import NextNode, OrchestratorState, VehicleResult
 from logger import logger
+from workflow.turn_budget import within_budget
 
 class ParsedVehicleData(BaseModel):
     """Esquema para los datos del vehículo extraídos."""
@@ -39,6 +40,24 @@ FIELD_CONFIG = {
     ]
 }
 
+def has_all_vehicle_fields(vehicle: VehicleResult | None) -> bool:
+    """Verifica si el vehículo tiene todos los datos a recolectar (sin contar su ID)."""
+    if not vehicle:
+        return False
+    return all(getattr(vehicle, field, None) is not None for field in FIELD_CONFIG["descriptions"].keys())
+
+def build_vehicle_confirmation(vehicle: VehicleResult) -> tuple[Dict[str, str], str]:
+    """Construye la solicitud de confirmación y el mensaje para el usuario con los datos del vehículo."""
+    confirmation_request = {
+        key: str(value) for key, value in vehicle.model_dump().items() if value is not None and key != 'id'
+    }
+    confirmation_message_parts = [
+        f"{FIELD_CONFIG['descriptions'][key]}: {value}"
+        for key, value in confirmation_request.items()
+    ]
+    confirmation_message = "Por favor, confirma si los siguientes datos del vehículo son correctos:\n" + "\n".join(confirmation_message_parts) + "\n\nResponde 'sí' para confirmar o 'no' para corregir."
+    return confirmation_request, confirmation_message
+
 def create_vehicle_validator_agent(
     llm: BaseChatModel,
 ) -> RunnableSerializable:
@@ -68,7 +87,7 @@ def create_vehicle_validator_agent(
     agent = prompt | structured_llm
     return agent
 
-def vehicle_validator_node(
+async def vehicle_validator_node(
     state: OrchestratorState,
     agent: RunnableSerializable
 ) -> dict:
@@ -101,12 +120,12 @@ def vehicle_validator_node(
             missing_fields_list.append(f"- {description}")
 
     try:
-        validation_result = agent.invoke({
+        validation_result = await within_budget(agent.ainvoke({
             "message": message,
             "intent_description": intent_description,
             "current_data": str(current_data),
             "missing_fields_list": "\n".join(missing_fields_list) or "Ninguno"
-        })
+        }))
 
         extracted_data = validation_result.parsed_data.model_dump(exclude_unset=True)
         state_update: Dict[str, Any] = {}
@@ -116,22 +135,9 @@ def vehicle_validator_node(
             updated_vehicle_data = vehicle_data.copy(update=extracted_data)
             state_update["vehicle"] = updated_vehicle_data
         
-        all_fields_present_after_extraction = True
-        for field in FIELD_CONFIG["descriptions"].keys():
-            if getattr(updated_vehicle_data, field, None) is None:
-                all_fields_present_after_extraction = False
-                break
-        
-        if all_fields_present_after_extraction:
+        if has_all_vehicle_fields(updated_vehicle_data):
             logger.debug("---WORKER: Todos los datos del vehículo recopilados. Preparando confirmación.---")
-            confirmation_request = {
-                key: str(value) for key, value in updated_vehicle_data.model_dump().items() if value is not None and key != 'id'
-            }
-            confirmation_message_parts = [
-                f"{FIELD_CONFIG['descriptions'][key]}: {value}"
-                for key, value in confirmation_request.items()
-            ]
-            confirmation_message = "Por favor, confirma si los siguientes datos del vehículo son correctos:\n" + "\n".join(confirmation_message_parts) + "\n\nResponde 'sí' para confirmar o 'no' para corregir."
+            confirmation_request, confirmation_message = build_vehicle_confirmation(updated_vehicle_data)
 
             state_update["confirmation_request"] = confirmation_request
             state_update["base_message"] = base_message + [confirmation_message]
@@ -150,4 +156,69 @@ def vehicle_validator_node(
     if "base_message" in state_update and state_update["base_message"]:
         logger.debug(f"---WORKER: Mensaje Base de Vehículo Generado -> \"{state_update['base_message']}\" ---")
 
-    return state_update
\ No newline at end of file
+    return state_update
+
+def create_vehicle_extractor_agent(
+    llm: BaseChatModel,
+) -> RunnableSerializable:
+    """
+    Crea un agente que solo extrae los datos del vehículo de un mensaje que también trae datos del cliente.
+    """
+    system_prompt_template = (
+        "Tu tarea es extraer únicamente los datos del vehículo del 'Mensaje del usuario'.\n"
+        "El mensaje puede contener también datos personales del cliente (nombre, documento, email, teléfono, fecha de nacimiento): ignóralos.\n"
+        "Deja vacíos los campos del vehículo que no aparezcan en el mensaje."
+    )
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            SystemMessage(content=system_prompt_template),
+            ("user", "Datos actuales del vehículo: {current_data}"),
+            ("user", "Mensaje del usuario: {message}"),
+        ]
+    )
+
+    structured_llm = llm.with_structured_output(ParsedVehicleData)
+    agent = prompt | structured_llm
+    return agent
+
+async def vehicle_extraction_node(
+    state: OrchestratorState,
+    agent: RunnableSerializable
+) -> dict:
+    """
+    Extrae los datos del vehículo en paralelo a la recolección del cliente.
+
+    Solo actualiza `vehicle`; el mensaje y el siguiente paso los define la rama del cliente.
+    """
+    logger.debug("---WORKER: Extrayendo Datos del Vehículo en Paralelo---")
+
+    vehicle_data = state.get("vehicle") or VehicleResult()
+
+    try:
+        parsed_data = await within_budget(agent.ainvoke({
+            "message": state.get("message", ""),
+            "current_data": str(vehicle_data.model_dump()),
+        }))
+        extracted_data = parsed_data.model_dump(exclude_none=True)
+    except Exception as e:
+        logger.error(f"Error en la extracción paralela del vehículo: {e}", exc_info=True)
+        return {}
+
+    if not extracted_data:
+        return {}
+
+    logger.debug(f"---WORKER: Datos de Vehículo Extraídos en Paralelo -> {extracted_data} ---")
+    return {"vehicle": vehicle_data.model_copy(update=extracted_data)}
+
+def vehicle_confirmation_request_node(state: OrchestratorState) -> dict:
+    """
+    Pide la confirmación del vehículo en el mismo turno en que se registra el cliente,
+    cuando sus datos ya fueron extraídos de un mensaje anterior.
+    """
+    logger.debug("---WORKER: Solicitando Confirmación del Vehículo Pre-extraído---")
+    confirmation_request, confirmation_message = build_vehicle_confirmation(state["vehicle"])
+    return {
+        "confirmation_request": confirmation_request,
+        "base_message": (state.get("base_message") or []) + [confirmation_message],
+    }